@@ -18,12 +18,15 @@ Key dynamics:
 package main
 
 import (
+	"bufio"
 	"encoding/json"
 	"flag"
 	"fmt"
+	"io"
 	"math"
 	"math/rand"
 	"os"
+	"path/filepath"
 	"runtime"
 	"sync"
 	"time"
@@ -256,6 +259,30 @@ func RunBifurcationAnalysis(params SimParams, initialRates []float64, nReplicati
 	}
 }
 
+// NDJSONHeader is the first line of newline-delimited output
+type NDJSONHeader struct {
+	ThetaCrit float64   `json:"theta_crit"`
+	NResults  int       `json:"n_results"`
+	Params    SimParams `json:"params"`
+}
+
+// WriteNDJSON writes a header line followed by one result per line, so
+// readers can parse the output incrementally instead of loading it whole
+func WriteNDJSON(w io.Writer, results BifurcationOutput, params SimParams) error {
+	bw := bufio.NewWriter(w)
+	enc := json.NewEncoder(bw)
+	header := NDJSONHeader{ThetaCrit: results.ThetaCrit, NResults: len(results.Results), Params: params}
+	if err := enc.Encode(header); err != nil {
+		return err
+	}
+	for _, r := range results.Results {
+		if err := enc.Encode(r); err != nil {
+			return err
+		}
+	}
+	return bw.Flush()
+}
+
 func main() {
 	// Command line flags
 	nAgents := flag.Int("n", 1000, "Number of agents")
@@ -264,6 +291,7 @@ func main() {
 	nRates := flag.Int("rates", 17, "Number of initial rates to test")
 	workers := flag.Int("workers", 0, "Number of parallel workers (0 = auto)")
 	output := flag.String("output", "", "Output file path (empty = stdout)")
+	format := flag.String("format", "", "Output format: json or ndjson (default: from -output extension, else json)")
 
 	// Model parameters
 	coopCost := flag.Float64("cost", 1.0, "Cooperation cost")
@@ -315,6 +343,37 @@ func main() {
 	fmt.Fprintf(os.Stderr, "Critical threshold theta_crit = %.3f\n", results.ThetaCrit)
 
 	// Output results
+	outFormat := *format
+	if outFormat == "" {
+		switch filepath.Ext(*output) {
+		case ".ndjson", ".jsonl":
+			outFormat = "ndjson"
+		default:
+			outFormat = "json"
+		}
+	}
+
+	if outFormat == "ndjson" {
+		out := os.Stdout
+		if *output != "" {
+			f, err := os.Create(*output)
+			if err != nil {
+				fmt.Fprintf(os.Stderr, "Error writing file: %v\n", err)
+				os.Exit(1)
+			}
+			defer f.Close()
+			out = f
+		}
+		if err := WriteNDJSON(out, results, params); err != nil {
+			fmt.Fprintf(os.Stderr, "Error encoding NDJSON: %v\n", err)
+			os.Exit(1)
+		}
+		if *output != "" {
+			fmt.Fprintf(os.Stderr, "Results written to %s\n", *output)
+		}
+		return
+	}
+
 	jsonData, err := json.MarshalIndent(results, "", "  ")
 	if err != nil {
 		fmt.Fprintf(os.Stderr, "Error encoding JSON: %v\n", err)
@@ -10,15 +10,28 @@ Key dynamics:
 - Cooperation is rational when: M_i > c - β*k/n
 - Critical mass θ_crit determines stability
 - Network effects can reinforce cooperation above threshold
+
+By default the population is fully mixed: every agent sees the population
+cooperation rate. With a network (lattice, Watts-Strogatz, Barabasi-Albert,
+stochastic block model or any networkx graph, see abm/networks.py) agents
+see the cooperation rate of their neighbours instead, computed for all of
+them with one sparse matrix-vector product per step. The "array" engine
+runs the same rules as vector operations for populations of 10^6 agents.
 """
 
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
 import numpy as np
+import pandas as pd
 from mesa import Agent, Model
 from mesa.datacollection import DataCollector
-from typing import Optional
-from concurrent.futures import ProcessPoolExecutor
-import os
-import yaml
+
+from .events import EventLog, EventType
+from .interventions import run_schedule
+from .networks import compile_network
+from .profiling import StepProfiler, format_profile, write_profile
 
 
 class Citizen(Agent):
@@ -29,10 +42,13 @@ class Citizen(Agent):
         motivation: Intrinsic motivation M_i to cooperate
         cooperating: Current cooperation status
         transformed: Whether agent has undergone value transformation
+        index: Position of the agent in the model's event log
     """
 
-    def __init__(self, model: "CooperationModel", motivation: float, transformed: bool = False):
+    def __init__(self, model: "CooperationModel", motivation: float,
+                 transformed: bool = False, index: int = 0):
         super().__init__(model)
+        self.index = index
         self.base_motivation = motivation
         self.motivation = motivation
         self.cooperating = False
@@ -47,10 +63,8 @@ class Citizen(Agent):
 
         Where k = current number of cooperators
         """
-        # Get current cooperation level
-        n = len(self.model.agents)
-        k = sum(1 for a in self.model.agents if a.cooperating)
-        cooperation_rate = k / n if n > 0 else 0
+        # Get current cooperation level (of the neighbours on a network)
+        cooperation_rate = self.model._observed_rate(self)
 
         # Calculate threshold for cooperation
         # From Theorem 4.2: cooperate if M_i > c - β*θ
@@ -65,7 +79,10 @@ class Citizen(Agent):
 
         # Decision with some noise (bounded rationality)
         noise = np.random.normal(0, self.model.decision_noise)
-        self.cooperating = (effective_motivation + noise) > threshold
+        cooperating = (effective_motivation + noise) > threshold
+        if cooperating != self.cooperating:
+            self.model._record_switch(self, cooperating)
+        self.cooperating = cooperating
 
         # Update motivation based on experience
         if self.model.motivation_dynamics:
@@ -114,9 +131,20 @@ class CooperationModel(Model):
         reinforcement_rate: Rate of positive reinforcement
         discouragement_rate: Rate of discouragement
         decision_noise: Noise in decision making
+        network: Interaction network (topology name, CSRGraph or networkx
+            graph); None for a fully mixed population
+        network_params: Topology parameters, e.g. {"k": 8, "p": 0.1}
+            (see abm/networks.py); "seed" defaults to one drawn from seed
         seed: Random seed
+
+    On a network agent i is node i, so transformed agents occupy nodes
+    0..n_transformed-1. Agents see their neighbours' choices as they were at
+    the start of the step; agents without neighbours see the population rate.
     """
 
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("shock", "defect")
+
     def __init__(
         self,
         n_agents: int = 1000,
@@ -133,6 +161,8 @@ class CooperationModel(Model):
         reinforcement_rate: float = 0.02,
         discouragement_rate: float = 0.01,
         decision_noise: float = 0.1,
+        network=None,
+        network_params: Optional[dict] = None,
         seed: Optional[int] = None
     ):
         super().__init__(seed=seed)
@@ -172,11 +202,30 @@ class CooperationModel(Model):
                 motivation = base_motivation
                 transformed = False
 
-            agent = Citizen(self, motivation, transformed)
+            agent = Citizen(self, motivation, transformed, i)
 
             # Set initial cooperation status
             agent.cooperating = np.random.random() < initial_cooperation
 
+        # Agents in node order (no agents are added or removed)
+        self.citizens = list(self.agents)
+
+        # Cooperate/defect switches; the running cooperator count replaces
+        # rescanning all agents on every decision
+        self.events = EventLog()
+        self.n_cooperating = sum(1 for a in self.agents if a.cooperating)
+
+        # Interaction network; the graph seed is kept in network_params so a
+        # restored snapshot (abm/snapshot.py) rebuilds the same graph
+        self.network = network
+        self.network_params = dict(network_params or {})
+        self.graph = None
+        if network is not None:
+            if isinstance(network, str):
+                self.network_params.setdefault("seed", int(self.rng.integers(2 ** 31)))
+            self.graph = compile_network(network, n_agents, **self.network_params)
+        self.local_rate = None
+
         # Data collection
         self.datacollector = DataCollector(
             model_reporters={
@@ -193,11 +242,61 @@ class CooperationModel(Model):
             }
         )
 
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of a running model (e.g. at an intervention).
+
+        theta_crit follows cooperation_cost, benefit_multiplier and
+        motivation_mean; the population size cannot change.
+        """
+        for name, value in params.items():
+            if (name in ("n_agents", "theta_crit", "network", "network_params", "graph")
+                    or name.startswith("_") or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+        self.theta_crit = self.cooperation_cost / (self.benefit_multiplier
+                                                   + self.motivation_mean)
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Multiply the motivation of a random fraction of agents by factor."""
+        for agent in self.random.sample(self.citizens, round(fraction * self.n_agents)):
+            agent.motivation *= factor
+
+    def defect(self, fraction: float = 1.0) -> None:
+        """Switch a random fraction of the cooperators to defecting."""
+        cooperators = [a for a in self.citizens if a.cooperating]
+        n_defecting = round(fraction * len(cooperators))
+        for agent in self.random.sample(cooperators, n_defecting):
+            self._record_switch(agent, False)
+            agent.cooperating = False
+
     def _cooperation_rate(self) -> float:
         """Current proportion of cooperators."""
         if self.n_agents == 0:
             return 0.0
-        return sum(1 for a in self.agents if a.cooperating) / self.n_agents
+        return self.n_cooperating / self.n_agents
+
+    def _observed_rate(self, agent: Citizen) -> float:
+        """Cooperation rate an agent responds to (its neighbours' on a network)."""
+        if self.graph is None:
+            return self._cooperation_rate()
+        return self.local_rate[agent.index]
+
+    def _update_local_rates(self) -> None:
+        """Neighbour cooperation rates of all agents (one sparse mat-vec)."""
+        cooperating = np.fromiter((a.cooperating for a in self.citizens), dtype=float,
+                                  count=self.n_agents)
+        self.local_rate = self.graph.neighbour_mean(cooperating,
+                                                    isolated=self._cooperation_rate())
+
+    def _record_switch(self, agent: Citizen, cooperating: bool) -> None:
+        """Log a cooperate/defect switch and update the cooperator count."""
+        if cooperating:
+            self.n_cooperating += 1
+            self.events.record(agent.index, EventType.COOPERATED)
+        else:
+            self.n_cooperating -= 1
+            self.events.record(agent.index, EventType.DEFECTED)
 
     def _mean_motivation(self) -> float:
         """Average motivation across agents."""
@@ -208,6 +307,9 @@ class CooperationModel(Model):
     def step(self):
         """Advance model by one step."""
         self.datacollector.collect(self)
+        self.events.begin_step(self.steps)
+        if self.graph is not None:
+            self._update_local_rates()
         self.agents.shuffle_do("step")
 
     def run(self, steps: int = 100) -> None:
@@ -216,19 +318,376 @@ class CooperationModel(Model):
             self.step()
 
 
+def _quantile_nodes(mean: float, std: float, n_bins: int) -> np.ndarray:
+    """Equal-probability nodes of normal(mean, std): midpoints of n_bins quantiles."""
+    from scipy.special import ndtri
+
+    return mean + std * ndtri((np.arange(n_bins) + 0.5) / n_bins)
+
+
+class CooperationMeanFieldModel(Model):
+    """
+    Mean-field ODE engine for the cooperation threshold model.
+
+    The motivation distribution is discretized into n_bins equal-probability
+    nodes of max(0, normal(motivation_mean, motivation_std)), plus a shifted
+    copy for the transformed fraction. Each node holds the fraction x of its
+    agents currently cooperating and their motivation m. With decision noise
+    sigma the probability that a node's agents choose to cooperate is
+
+        P(coop) = Phi((m + (network_strength + beta) * r - c) / sigma)
+
+    where r is the population cooperation rate. Agents re-decide at rate 1
+    (the random sequential activation of the agent engine in continuous
+    time), so dx/dt = P(coop) - x, and m follows the expected per-step
+    change of Citizen._update_motivation over cooperators and defectors.
+    The system is integrated with scipy's solve_ivp and sampled at integer
+    steps.
+
+    The engine is deterministic and its cost does not depend on n_agents,
+    which only sets the transformed fraction as in CooperationModel. It
+    describes an infinite population with the same fixed points as the
+    agent model, so finite-size fluctuations (and noise-driven switches
+    between equilibria) are absent.
+
+    Takes the same parameters as CooperationModel, plus:
+        n_bins: Motivation nodes per group
+    """
+
+    def __init__(
+        self,
+        n_agents: int = 1000,
+        cooperation_cost: float = 1.0,
+        benefit_multiplier: float = 2.0,
+        motivation_mean: float = 0.5,
+        motivation_std: float = 0.3,
+        initial_cooperation: float = 0.5,
+        transformed_fraction: float = 0.0,
+        transformation_boost: float = 1.0,
+        network_effects: bool = True,
+        network_strength: float = 0.5,
+        motivation_dynamics: bool = True,
+        reinforcement_rate: float = 0.02,
+        discouragement_rate: float = 0.01,
+        decision_noise: float = 0.1,
+        n_bins: int = 64,
+        seed: Optional[int] = None
+    ):
+        super().__init__(seed=seed)
+
+        self.n_agents = n_agents
+        self.cooperation_cost = cooperation_cost
+        self.benefit_multiplier = benefit_multiplier
+        self.motivation_mean = motivation_mean
+        self.motivation_std = motivation_std
+        self.network_effects = network_effects
+        self.network_strength = network_strength
+        self.motivation_dynamics = motivation_dynamics
+        self.reinforcement_rate = reinforcement_rate
+        self.discouragement_rate = discouragement_rate
+        self.decision_noise = decision_noise
+
+        self.theta_crit = cooperation_cost / (benefit_multiplier + motivation_mean)
+
+        # Node motivations and population weights; the transformed group is
+        # the same distribution shifted by the boost
+        nodes = np.maximum(0.0,
+                           _quantile_nodes(motivation_mean, motivation_std, n_bins))
+        f = int(n_agents * transformed_fraction) / n_agents if n_agents else 0.0
+        base = np.concatenate([nodes, nodes + transformation_boost])
+        weights = np.concatenate([np.full(n_bins, (1 - f) / n_bins),
+                                  np.full(n_bins, f / n_bins)])
+        keep = weights > 0
+        self.base_motivation = base[keep]
+        self.weights = weights[keep]
+        self.n_bins = len(self.weights)
+
+        # State: cooperating fraction of each node, then node motivations
+        self.y = np.concatenate([np.full(self.n_bins, float(initial_cooperation)),
+                                 self.base_motivation])
+        self._pending = iter(())
+
+        self.datacollector = DataCollector(
+            model_reporters={
+                "Cooperation_Rate": lambda m: self._cooperation_rate(),
+                "Mean_Motivation": lambda m: self._mean_motivation(),
+                "Theta_Crit": lambda m: m.theta_crit,
+                "Above_Threshold": lambda m: self._cooperation_rate() > m.theta_crit,
+                "Std_Motivation": lambda m: self._std_motivation(),
+            }
+        )
+
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of a running model (e.g. at an intervention).
+
+        The motivation nodes (n_agents, n_bins) are fixed; theta_crit
+        follows as in CooperationModel.
+        """
+        for name, value in params.items():
+            if (name in ("n_agents", "n_bins", "theta_crit") or name.startswith("_")
+                    or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+        self.theta_crit = self.cooperation_cost / (self.benefit_multiplier
+                                                   + self.motivation_mean)
+        self._pending = iter(())
+
+    def _rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        from scipy.special import ndtr
+
+        x, m = y[:self.n_bins], y[self.n_bins:]
+        r = self.weights @ x
+        social = self.network_strength if self.network_effects else 0.0
+        z = m + (social + self.benefit_multiplier) * r - self.cooperation_cost
+        if self.decision_noise > 0:
+            p_coop = ndtr(z / self.decision_noise)
+        else:
+            p_coop = (z > 0).astype(float)
+
+        dm = np.zeros(self.n_bins)
+        if self.motivation_dynamics:
+            b = self.base_motivation
+            if r > 0.5:
+                cooperate = np.minimum(m * self.reinforcement_rate, 2 * b - m)
+            else:
+                cooperate = -self.discouragement_rate * m
+            dm = x * cooperate + (1 - x) * 0.01 * (b - m)
+        return np.concatenate([p_coop - x, dm])
+
+    def _integrate(self, steps: int) -> np.ndarray:
+        """States after each of the next steps, shape (steps, state size)."""
+        from scipy.integrate import solve_ivp
+
+        t0 = float(self.steps)
+        sol = solve_ivp(self._rhs, (t0, t0 + steps), self.y,
+                        t_eval=t0 + np.arange(1, steps + 1), max_step=1.0,
+                        rtol=1e-6, atol=1e-9)
+        return sol.y.T
+
+    def _cooperation_rate(self) -> float:
+        """Current proportion of cooperators."""
+        return float(self.weights @ self.y[:self.n_bins])
+
+    def _mean_motivation(self) -> float:
+        """Average motivation across the population."""
+        return float(self.weights @ self.y[self.n_bins:])
+
+    def _std_motivation(self) -> float:
+        """Standard deviation of motivation across nodes."""
+        m = self.y[self.n_bins:]
+        return float(np.sqrt(max(self.weights @ m ** 2 - (self.weights @ m) ** 2, 0.0)))
+
+    def step(self):
+        """Advance model by one step."""
+        self.datacollector.collect(self)
+        y = next(self._pending, None)
+        self.y = self._integrate(1)[0] if y is None else y
+
+    def run(self, steps: int = 100) -> None:
+        """Run model for specified number of steps (one ODE solve for all of them)."""
+        self._pending = iter(self._integrate(steps))
+        for _ in range(steps):
+            self.step()
+
+
+class CooperationArrayModel(Model):
+    """
+    Vectorized engine for the cooperation threshold model.
+
+    Agent state (motivation, base motivation, cooperating, transformed) is
+    held in NumPy arrays and the decision and motivation rules of Citizen
+    are applied to all agents at once. All agents decide against the
+    cooperation rates at the start of the step (synchronous update), which
+    on a network are the neighbour rates of one sparse mat-vec, so a step
+    of 10^6 agents takes milliseconds. Initial motivations and decision
+    noise come from the same distributions as in CooperationModel, drawn
+    as vectors.
+
+    Takes the same parameters as CooperationModel.
+    """
+
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("shock", "defect")
+
+    def __init__(
+        self,
+        n_agents: int = 1000,
+        cooperation_cost: float = 1.0,
+        benefit_multiplier: float = 2.0,
+        motivation_mean: float = 0.5,
+        motivation_std: float = 0.3,
+        initial_cooperation: float = 0.5,
+        transformed_fraction: float = 0.0,
+        transformation_boost: float = 1.0,
+        network_effects: bool = True,
+        network_strength: float = 0.5,
+        motivation_dynamics: bool = True,
+        reinforcement_rate: float = 0.02,
+        discouragement_rate: float = 0.01,
+        decision_noise: float = 0.1,
+        network=None,
+        network_params: Optional[dict] = None,
+        seed: Optional[int] = None
+    ):
+        super().__init__(seed=seed)
+
+        if seed is not None:
+            np.random.seed(seed)
+
+        self.n_agents = n_agents
+        self.cooperation_cost = cooperation_cost
+        self.benefit_multiplier = benefit_multiplier
+        self.motivation_mean = motivation_mean
+        self.motivation_std = motivation_std
+        self.network_effects = network_effects
+        self.network_strength = network_strength
+        self.motivation_dynamics = motivation_dynamics
+        self.reinforcement_rate = reinforcement_rate
+        self.discouragement_rate = discouragement_rate
+        self.decision_noise = decision_noise
+
+        self.theta_crit = cooperation_cost / (benefit_multiplier + motivation_mean)
+
+        n_transformed = int(n_agents * transformed_fraction)
+        self.transformed = np.arange(n_agents) < n_transformed
+        self.base_motivation = (
+            np.maximum(0.0, np.random.normal(motivation_mean, motivation_std, n_agents))
+            + np.where(self.transformed, transformation_boost, 0.0)
+        )
+        self.motivation = self.base_motivation.copy()
+        self.cooperating = np.random.random(n_agents) < initial_cooperation
+        self.n_cooperating = int(np.count_nonzero(self.cooperating))
+
+        self.events = EventLog()
+
+        # Interaction network (see CooperationModel)
+        self.network = network
+        self.network_params = dict(network_params or {})
+        self.graph = None
+        if network is not None:
+            if isinstance(network, str):
+                self.network_params.setdefault("seed", int(self.rng.integers(2 ** 31)))
+            self.graph = compile_network(network, n_agents, **self.network_params)
+
+        self.datacollector = DataCollector(
+            model_reporters={
+                "Cooperation_Rate": lambda m: self._cooperation_rate(),
+                "Mean_Motivation": lambda m: self._mean_motivation(),
+                "Theta_Crit": lambda m: m.theta_crit,
+                "Above_Threshold": lambda m: self._cooperation_rate() > m.theta_crit,
+                "Std_Motivation": lambda m: float(np.std(m.motivation)),
+            }
+        )
+
+    def set_params(self, **params) -> None:
+        """Change parameters of a running model (see CooperationModel.set_params)."""
+        for name, value in params.items():
+            if (name in ("n_agents", "theta_crit", "network", "network_params", "graph")
+                    or name.startswith("_") or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+        self.theta_crit = self.cooperation_cost / (self.benefit_multiplier
+                                                   + self.motivation_mean)
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Vectorized CooperationModel.shock."""
+        hit = np.random.choice(self.n_agents, round(fraction * self.n_agents),
+                               replace=False)
+        self.motivation[hit] *= factor
+
+    def defect(self, fraction: float = 1.0) -> None:
+        """Vectorized CooperationModel.defect."""
+        cooperators = np.flatnonzero(self.cooperating)
+        switched = np.random.choice(cooperators, round(fraction * len(cooperators)),
+                                    replace=False)
+        self.cooperating[switched] = False
+        self.n_cooperating -= len(switched)
+        self.events.record_many(switched, EventType.DEFECTED)
+
+    def _cooperation_rate(self) -> float:
+        """Current proportion of cooperators."""
+        if self.n_agents == 0:
+            return 0.0
+        return self.n_cooperating / self.n_agents
+
+    def _mean_motivation(self) -> float:
+        """Average motivation across agents."""
+        if self.n_agents == 0:
+            return 0.0
+        return float(np.mean(self.motivation))
+
+    def step(self):
+        """Advance model by one step."""
+        self.datacollector.collect(self)
+        self.events.begin_step(self.steps)
+
+        rate = self._cooperation_rate()
+        if self.graph is None:
+            observed = rate
+        else:
+            observed = self.graph.neighbour_mean(self.cooperating, isolated=rate)
+
+        # Vectorized Citizen.step
+        threshold = self.cooperation_cost - self.benefit_multiplier * observed
+        effective = self.motivation
+        if self.network_effects:
+            effective = effective + self.network_strength * observed
+        noise = np.random.normal(0, self.decision_noise, self.n_agents)
+        cooperating = effective + noise > threshold
+
+        switched = cooperating != self.cooperating
+        self.events.record_many(np.flatnonzero(switched & cooperating),
+                                EventType.COOPERATED)
+        self.events.record_many(np.flatnonzero(switched & ~cooperating),
+                                EventType.DEFECTED)
+        self.cooperating = cooperating
+        self.n_cooperating = int(np.count_nonzero(cooperating))
+
+        # Vectorized Citizen._update_motivation
+        if self.motivation_dynamics:
+            m, b = self.motivation, self.base_motivation
+            if_cooperating = np.where(
+                observed > 0.5,
+                np.minimum(m * (1 + self.reinforcement_rate), b * 2),
+                m * (1 - self.discouragement_rate),
+            )
+            self.motivation = np.where(cooperating, if_cooperating, m * 0.99 + b * 0.01)
+
+    def run(self, steps: int = 100) -> None:
+        """Run model for specified number of steps."""
+        for _ in range(steps):
+            self.step()
+
+
+# Simulation engines selectable from run_experiment
+ENGINES = {
+    "agent": CooperationModel,
+    "meanfield": CooperationMeanFieldModel,
+    "array": CooperationArrayModel,
+}
+
+
 def run_experiment(config_path: str = None, **kwargs) -> dict:
     """
     Run a cooperation threshold experiment.
 
     Args:
         config_path: Path to YAML config file
-        **kwargs: Override config parameters
+        **kwargs: Override config parameters (profile=True adds a per-phase
+            step profile under "profile", see abm/profiling.py; engine
+            selects "agent" (default), "meanfield" (the ODE surrogate
+            CooperationMeanFieldModel) or "array" (the vectorized
+            CooperationArrayModel); agent_data is empty for the latter two;
+            schedule lists mid-run interventions, see abm/interventions.py)
 
     Returns:
         Dictionary with model results
     """
     # Load config if provided
     if config_path:
+        import yaml  # only needed for config files
+
         with open(config_path) as f:
             config = yaml.safe_load(f)
     else:
@@ -240,24 +699,45 @@ def run_experiment(config_path: str = None, **kwargs) -> dict:
     # Set defaults
     n_steps = config.pop("n_steps", 100)
 
+    engine = config.pop("engine", "agent")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    profile = config.pop("profile", False)
+    schedule = config.pop("schedule", None)
+
     # Create and run model
-    model = CooperationModel(**config)
-    model.run(n_steps)
+    model = ENGINES[engine](**config)
+    if profile:
+        profiler = StepProfiler()
+        with profiler.instrument(model):
+            run_schedule(model, n_steps, schedule)
+    else:
+        run_schedule(model, n_steps, schedule)
 
     # Get results
     model_data = model.datacollector.get_model_vars_dataframe()
-    agent_data = model.datacollector.get_agent_vars_dataframe()
+    if model.datacollector.agent_reporters:
+        agent_data = model.datacollector.get_agent_vars_dataframe()
+    else:
+        agent_data = pd.DataFrame()
 
-    return {
+    results = {
         "model_data": model_data,
         "agent_data": agent_data,
         "final_cooperation_rate": model._cooperation_rate(),
         "final_mean_motivation": model._mean_motivation(),
         "theta_crit": model.theta_crit,
         "stable": model._cooperation_rate() > model.theta_crit,
+        "engine": engine,
         "config": config,
     }
 
+    if profile:
+        results["profile"] = profiler.to_dict()
+
+    return results
+
 
 def _run_single_bifurcation(args: tuple) -> dict:
     """
@@ -291,6 +771,7 @@ def run_bifurcation_analysis(
     n_replications: int = 5,
     n_steps: int = 100,
     n_workers: int = None,
+    executor: Executor = None,
     **model_params
 ) -> dict:
     """
@@ -304,6 +785,8 @@ def run_bifurcation_analysis(
         n_replications: Replications per initial rate
         n_steps: Steps per run
         n_workers: Number of parallel workers (default: CPU count)
+        executor: Existing pool to run on (e.g. one shared across a batch);
+            n_workers is ignored when given
         **model_params: Parameters for CooperationModel
 
     Returns:
@@ -323,7 +806,9 @@ def run_bifurcation_analysis(
     ]
 
     # Run in parallel
-    if n_workers > 1 and len(jobs) > 1:
+    if executor is not None:
+        results = list(executor.map(_run_single_bifurcation, jobs))
+    elif n_workers > 1 and len(jobs) > 1:
         with ProcessPoolExecutor(max_workers=n_workers) as executor:
             results = list(executor.map(_run_single_bifurcation, jobs))
     else:
@@ -338,7 +823,6 @@ def run_bifurcation_analysis(
 
 if __name__ == "__main__":
     import argparse
-    import matplotlib.pyplot as plt
 
     parser = argparse.ArgumentParser(description="Run cooperation threshold ABM")
     parser.add_argument("--config", type=str, help="Path to config file")
@@ -349,6 +833,14 @@ if __name__ == "__main__":
     parser.add_argument("--bifurcation", action="store_true", help="Run bifurcation analysis")
     parser.add_argument("--workers", type=int, default=None, help="Number of parallel workers (default: CPU count)")
     parser.add_argument("--reps", type=int, default=5, help="Number of replications per initial rate")
+    parser.add_argument("--engine", type=str, default="agent", choices=sorted(ENGINES),
+                        help="Simulation engine (agent, mean-field ODE or vectorized "
+                             "array)")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="Skip figures (no matplotlib import)")
+    parser.add_argument("--profile", type=str, default=None,
+                        help="Write a per-phase step profile (.json, or collapsed "
+                             "stacks for flame graphs)")
 
     args = parser.parse_args()
 
@@ -364,34 +856,15 @@ if __name__ == "__main__":
         )
 
         # Plot bifurcation diagram
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        initial_rates = [r["initial_rate"] for r in bifurc["results"]]
-        final_rates = [r["final_rate"] for r in bifurc["results"]]
+        if not args.no_plot:
+            from .plotting import plot_bifurcation
 
-        ax.scatter(initial_rates, final_rates, alpha=0.5, s=20)
-        ax.plot([0, 1], [0, 1], 'k--', alpha=0.3, label="No change")
+            plot_bifurcation(
+                bifurc,
+                f"{args.output}/bifurcation_analysis.png" if args.output else None
+            )
 
-        # Mark critical threshold
-        theta_crit = bifurc["theta_crit"]
-        ax.axvline(x=theta_crit, color='r', linestyle='--',
-                   label=f"θ_crit = {theta_crit:.2f}")
-        ax.axhline(y=theta_crit, color='r', linestyle='--', alpha=0.5)
-
-        ax.set_xlabel("Initial Cooperation Rate", fontsize=12)
-        ax.set_ylabel("Final Cooperation Rate", fontsize=12)
-        ax.set_title("Bifurcation Analysis: Critical Mass Threshold", fontsize=14)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-
-        plt.tight_layout()
-
-        if args.output:
-            plt.savefig(f"{args.output}/bifurcation_analysis.png", dpi=150)
-        else:
-            plt.show()
-
-        print(f"Critical threshold θ_crit = {theta_crit:.3f}")
+        print(f"Critical threshold θ_crit = {bifurc['theta_crit']:.3f}")
 
     else:
         # Run single experiment
@@ -399,60 +872,25 @@ if __name__ == "__main__":
             config_path=args.config,
             n_agents=args.agents,
             n_steps=args.steps,
-            seed=args.seed
+            seed=args.seed,
+            engine=args.engine,
+            profile=args.profile is not None
         )
 
         print(f"Final cooperation rate: {results['final_cooperation_rate']:.2%}")
         print(f"Critical threshold θ_crit: {results['theta_crit']:.3f}")
         print(f"Stable cooperation: {results['stable']}")
 
+        if args.profile:
+            print(format_profile(results["profile"]))
+            write_profile(results["profile"], args.profile)
+            print(f"Profile saved to {args.profile}")
+
         # Plot results
-        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-
-        # Cooperation rate over time
-        ax = axes[0, 0]
-        ax.plot(results["model_data"]["Cooperation_Rate"])
-        ax.axhline(y=results["theta_crit"], color='r', linestyle='--',
-                   label=f"θ_crit = {results['theta_crit']:.2f}")
-        ax.set_xlabel("Step")
-        ax.set_ylabel("Cooperation Rate")
-        ax.set_title("Cooperation Rate Over Time")
-        ax.legend()
-
-        # Mean motivation over time
-        ax = axes[0, 1]
-        ax.plot(results["model_data"]["Mean_Motivation"])
-        ax.set_xlabel("Step")
-        ax.set_ylabel("Mean Motivation")
-        ax.set_title("Mean Motivation Over Time")
-
-        # Final motivation distribution
-        ax = axes[1, 0]
-        final_step = results["agent_data"].index.get_level_values(0).max()
-        final_motivations = results["agent_data"].loc[final_step, "Motivation"]
-        ax.hist(final_motivations, bins=30, edgecolor='black', alpha=0.7)
-        ax.axvline(x=results["config"].get("cooperation_cost", 1.0), color='r',
-                   linestyle='--', label=f"Cost c = {results['config'].get('cooperation_cost', 1.0)}")
-        ax.set_xlabel("Motivation")
-        ax.set_ylabel("Count")
-        ax.set_title("Final Motivation Distribution")
-        ax.legend()
-
-        # Cooperation status by motivation
-        ax = axes[1, 1]
-        final_coop = results["agent_data"].loc[final_step, "Cooperating"]
-        cooperators = final_motivations[final_coop == True]
-        defectors = final_motivations[final_coop == False]
-        ax.hist([cooperators, defectors], bins=20, label=["Cooperators", "Defectors"],
-                edgecolor='black', alpha=0.7)
-        ax.set_xlabel("Motivation")
-        ax.set_ylabel("Count")
-        ax.set_title("Motivation by Cooperation Status")
-        ax.legend()
-
-        plt.tight_layout()
-
-        if args.output:
-            plt.savefig(f"{args.output}/cooperation_threshold.png", dpi=150)
-        else:
-            plt.show()
+        if not args.no_plot:
+            from .plotting import plot_cooperation_dynamics
+
+            plot_cooperation_dynamics(
+                results,
+                f"{args.output}/cooperation_threshold.png" if args.output else None
+            )
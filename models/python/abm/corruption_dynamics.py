@@ -12,11 +12,57 @@ Key dynamics:
 - Corruption occurs when: U_e > cost_detection * P_detection + M_integrity
 """
 
+from typing import Optional
+
 import numpy as np
+import pandas as pd
 from mesa import Agent, Model
 from mesa.datacollection import DataCollector
-from typing import Optional
-import yaml
+
+from .events import EventLog, EventType
+from .interventions import run_schedule
+from .profiling import StepProfiler, format_profile, write_profile
+
+# Oversight tiers of each structure: (rank bound, oversight level), in rank
+# order. Enforcer i belongs to the first tier with i / n_enforcers < bound.
+OVERSIGHT_TIERS = {
+    "flat": [(1.0, 0.8)],
+    # Top 10% have minimal oversight, bottom 50% have maximum
+    "hierarchical": [(0.1, 0.1), (0.3, 0.4), (0.5, 0.6), (1.0, 0.9)],
+    "none": [(1.0, 0.0)],
+}
+
+
+def _rank_count(bound: float, n: int) -> int:
+    """Number of ranks i in 0..n-1 with i / n < bound, without enumerating them."""
+    count = min(n, int(np.ceil(bound * n)))
+    while count > 0 and not (count - 1) / n < bound:
+        count -= 1
+    while count < n and count / n < bound:
+        count += 1
+    return count
+
+
+def oversight_tiers(structure: str, n_enforcers: int) -> tuple:
+    """
+    Oversight levels of a structure and the number of enforcers in each tier.
+
+    Returns:
+        (levels, counts) arrays in rank order; counts sum to n_enforcers
+    """
+    if structure not in OVERSIGHT_TIERS:
+        raise ValueError(f"Unknown oversight structure: {structure}")
+    bounds, levels = zip(*OVERSIGHT_TIERS[structure])
+    cumulative = [_rank_count(b, n_enforcers) for b in bounds[:-1]] + [n_enforcers]
+    counts = np.diff(np.concatenate([[0], cumulative]))
+    return np.array(levels, dtype=float), counts.astype(np.int64)
+
+
+def _quantile_nodes(mean: float, std: float, n_bins: int) -> np.ndarray:
+    """Equal-probability nodes of normal(mean, std): midpoints of n_bins quantiles."""
+    from scipy.special import ndtri
+
+    return mean + std * ndtri((np.arange(n_bins) + 0.5) / n_bins)
 
 
 class Enforcer(Agent):
@@ -28,11 +74,13 @@ class Enforcer(Agent):
         corrupted: Whether agent has engaged in corruption
         extraction_events: Number of times agent has extracted
         oversight_level: How much oversight this agent receives (0-1)
+        index: Position of the agent in the model's event log
     """
 
     def __init__(self, model: "CorruptionModel",
-                 integrity: float, oversight_level: float):
+                 integrity: float, oversight_level: float, index: int = 0):
         super().__init__(model)
+        self.index = index
         self.integrity = integrity
         self.corrupted = False
         self.extraction_events = 0
@@ -62,8 +110,11 @@ class Enforcer(Agent):
 
         # Decision: extract if benefit exceeds expected cost + integrity
         if extraction_opportunity > expected_cost + self.integrity:
+            if not self.corrupted:
+                self.model.events.record(self.index, EventType.CORRUPTED)
             self.corrupted = True
             self.extraction_events += 1
+            self.model.events.record(self.index, EventType.EXTRACTION)
 
             # Corruption can reduce integrity over time (moral decay)
             if self.model.integrity_decay:
@@ -76,7 +127,7 @@ class Enforcer(Agent):
             # Stayed honest this step - potential integrity reinforcement
             if self.model.integrity_reinforcement:
                 # Get current corruption rate
-                corruption_rate = sum(1 for a in self.model.agents if a.corrupted) / len(self.model.agents)
+                corruption_rate = self.model._corruption_rate()
 
                 # Reputation boost for staying honest in corrupt environment
                 if corruption_rate > 0.3:
@@ -89,7 +140,7 @@ class Enforcer(Agent):
     def _spread_corruption(self):
         """Corruption observability reduces others' integrity."""
         # Get nearby agents (in network or random sample)
-        all_agents = list(self.model.agents)
+        all_agents = self.model.enforcers
         sample_size = min(5, len(all_agents) - 1)
         if sample_size > 0:
             others = self.model.random.sample(all_agents, sample_size)
@@ -120,6 +171,9 @@ class CorruptionModel(Model):
         seed: Random seed for reproducibility
     """
 
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("purge", "shock")
+
     def __init__(
         self,
         n_enforcers: int = 100,
@@ -166,16 +220,23 @@ class CorruptionModel(Model):
             # Draw integrity from truncated normal (must be positive)
             integrity = max(0.1, np.random.normal(integrity_mean, integrity_std))
 
-            agent = Enforcer(self, integrity, oversight_levels[i])
+            agent = Enforcer(self, integrity, oversight_levels[i], i)
             # Agent is automatically added to model.agents
 
+        # Fixed agent list for contagion sampling (no agents are added or removed)
+        self.enforcers = list(self.agents)
+
+        # Transition and extraction events; rates are derived from its counters
+        self.events = EventLog()
+
         # Data collection
         self.datacollector = DataCollector(
             model_reporters={
                 "Corruption_Rate": lambda m: self._corruption_rate(),
                 "Mean_Integrity": lambda m: self._mean_integrity(),
                 "Total_Extractions": lambda m: self._total_extractions(),
-                "Corrupted_Agents": lambda m: sum(1 for a in m.agents if a.corrupted),
+                "Corrupted_Agents": lambda m: self._n_corrupted(),
+                "Extraction_Rate": lambda m: self._extraction_rate(),
             },
             agent_reporters={
                 "Integrity": "integrity",
@@ -186,35 +247,50 @@ class CorruptionModel(Model):
 
     def _get_oversight_levels(self) -> list[float]:
         """
-        Assign oversight levels based on structure.
+        Assign oversight levels based on structure (see OVERSIGHT_TIERS).
 
         - flat: Everyone has same oversight
         - hierarchical: Top levels have less oversight (infinite regress problem)
         - none: No oversight (P_detection = 0)
         """
-        if self.oversight_structure == "flat":
-            return [0.8] * self.n_enforcers
-
-        elif self.oversight_structure == "hierarchical":
-            # Top 10% have minimal oversight, bottom 50% have maximum
-            levels = []
-            for i in range(self.n_enforcers):
-                rank = i / self.n_enforcers
-                if rank < 0.1:  # Top 10% - minimal oversight
-                    levels.append(0.1)
-                elif rank < 0.3:  # Next 20%
-                    levels.append(0.4)
-                elif rank < 0.5:  # Middle
-                    levels.append(0.6)
-                else:  # Bottom 50% - maximum oversight
-                    levels.append(0.9)
-            return levels
-
-        elif self.oversight_structure == "none":
-            return [0.0] * self.n_enforcers
+        levels, counts = oversight_tiers(self.oversight_structure, self.n_enforcers)
+        return np.repeat(levels, counts).tolist()
 
-        else:
-            raise ValueError(f"Unknown oversight structure: {self.oversight_structure}")
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of a running model (e.g. at an intervention).
+
+        Changing oversight_structure reassigns every enforcer's oversight
+        level; the population size cannot change.
+        """
+        for name, value in params.items():
+            if name == "n_enforcers" or name.startswith("_") or not hasattr(self, name):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+        if "oversight_structure" in params:
+            for agent, level in zip(self.enforcers, self._get_oversight_levels()):
+                agent.oversight_level = level
+
+    def purge(self, fraction: float = 1.0) -> None:
+        """
+        Replace a random fraction of the corrupted enforcers with new recruits.
+
+        Recruits take over the post (and its oversight level) with an
+        integrity drawn from the initial distribution.
+        """
+        corrupted = [a for a in self.enforcers if a.corrupted]
+        for agent in self.random.sample(corrupted, round(fraction * len(corrupted))):
+            integrity = np.random.normal(self.integrity_mean, self.integrity_std)
+            agent.integrity = max(0.1, integrity)
+            agent.corrupted = False
+            agent.extraction_events = 0
+            self.events.record(agent.index, EventType.PURGED)
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Multiply the integrity of a random fraction of enforcers by factor."""
+        for agent in self.random.sample(self.enforcers,
+                                        round(fraction * self.n_enforcers)):
+            agent.integrity *= factor
 
     def get_extraction_opportunity(self, agent: Enforcer) -> float:
         """
@@ -229,11 +305,16 @@ class CorruptionModel(Model):
 
         return max(0, base * power_multiplier)
 
+    def _n_corrupted(self) -> int:
+        """Number of corrupted agents (corruption is permanent until a purge)."""
+        events = self.events
+        return events.total(EventType.CORRUPTED) - events.total(EventType.PURGED)
+
     def _corruption_rate(self) -> float:
         """Proportion of agents who have corrupted."""
         if self.n_enforcers == 0:
             return 0.0
-        return sum(1 for a in self.agents if a.corrupted) / self.n_enforcers
+        return self._n_corrupted() / self.n_enforcers
 
     def _mean_integrity(self) -> float:
         """Average integrity across all agents."""
@@ -243,11 +324,18 @@ class CorruptionModel(Model):
 
     def _total_extractions(self) -> int:
         """Total extraction events across all agents."""
-        return sum(a.extraction_events for a in self.agents)
+        return self.events.total(EventType.EXTRACTION)
+
+    def _extraction_rate(self) -> float:
+        """Extractions per enforcer in the most recent step."""
+        if self.n_enforcers == 0:
+            return 0.0
+        return self.events.step_count(EventType.EXTRACTION) / self.n_enforcers
 
     def step(self):
         """Advance model by one step."""
         self.datacollector.collect(self)
+        self.events.begin_step(self.steps)
         # In Mesa 3.x, agents are activated via the agents attribute
         self.agents.shuffle_do("step")
 
@@ -257,19 +345,520 @@ class CorruptionModel(Model):
             self.step()
 
 
+class CorruptionMeanFieldModel(Model):
+    """
+    Mean-field ODE engine for the corruption model.
+
+    Each oversight tier's integrity distribution max(0.1, normal(
+    integrity_mean, integrity_std)) is discretized into n_bins
+    equal-probability nodes. A node tracks the mass of its agents that never
+    extracted (honest, with integrity a, lowered by contagion) and the mass
+    and integrity mass of those that did (corrupted, mean integrity g,
+    lowered by decay on every extraction).
+
+    An agent with integrity I and oversight o extracts in a step when
+    U = max(0, Z * (2 - o)), Z ~ normal(extraction_mean, extraction_std),
+    exceeds detection_cost * base_detection_prob * o + I, which has
+    probability
+
+        q(I, o) = 1 - Phi(((detection_cost * p * o + I) / (2 - o) - mu_e) / sigma_e)
+
+    Honest mass turns corrupt at rate q(a), extractions multiply integrity
+    by (1 - integrity_decay_rate), every extraction costs 5 random agents
+    a factor (1 - contagion_rate) (so honest integrity decays at rate
+    5 * contagion_rate * extractions per enforcer), and agents that had an
+    opportunity but did not extract gain the reinforcement boost while the
+    corruption rate exceeds 0.3. The expected per-step changes are
+    integrated with scipy's solve_ivp and sampled at integer steps.
+
+    The engine is deterministic and its cost does not depend on
+    n_enforcers, which only sets the tier sizes (and scales the count
+    reporters). Corrupted agents of a node are summarized by their mean
+    integrity (a moment closure), which ignores that the high-integrity
+    ones extract less often, so late in a run Mean_Integrity comes out
+    below the agent engine's. Finite-size fluctuations are absent.
+
+    Takes the same parameters as CorruptionModel, plus:
+        n_bins: Integrity nodes per oversight tier
+    """
+
+    def __init__(
+        self,
+        n_enforcers: int = 100,
+        integrity_mean: float = 5.0,
+        integrity_std: float = 2.0,
+        extraction_mean: float = 3.0,
+        extraction_std: float = 1.5,
+        base_detection_prob: float = 0.3,
+        detection_cost: float = 10.0,
+        oversight_structure: str = "hierarchical",
+        integrity_decay: bool = True,
+        integrity_decay_rate: float = 0.05,
+        corruption_contagion: bool = True,
+        contagion_rate: float = 0.02,
+        integrity_reinforcement: bool = False,
+        reinforcement_rate: float = 0.02,
+        n_bins: int = 64,
+        seed: Optional[int] = None
+    ):
+        super().__init__(seed=seed)
+
+        self.n_enforcers = n_enforcers
+        self.integrity_mean = integrity_mean
+        self.integrity_std = integrity_std
+        self.extraction_mean = extraction_mean
+        self.extraction_std = extraction_std
+        self.base_detection_prob = base_detection_prob
+        self.detection_cost = detection_cost
+        self.oversight_structure = oversight_structure
+        self.integrity_decay = integrity_decay
+        self.integrity_decay_rate = integrity_decay_rate
+        self.corruption_contagion = corruption_contagion
+        self.contagion_rate = contagion_rate
+        self.integrity_reinforcement = integrity_reinforcement
+        self.reinforcement_rate = reinforcement_rate
+
+        # Nodes: every integrity quantile in every non-empty tier
+        levels, counts = oversight_tiers(oversight_structure, n_enforcers)
+        keep = counts > 0
+        levels, shares = levels[keep], counts[keep] / max(n_enforcers, 1)
+        nodes = np.maximum(0.1, _quantile_nodes(integrity_mean, integrity_std, n_bins))
+        self.oversight = np.repeat(levels, n_bins)
+        self.weights = np.repeat(shares / n_bins, n_bins)
+        self.initial_integrity = np.tile(nodes, len(levels))
+        self.n_bins = len(self.weights)
+
+        # Per node: honest mass, honest integrity, corrupted mass, corrupted
+        # integrity mass; then cumulative extractions per enforcer
+        self.y = np.concatenate([self.weights, self.initial_integrity,
+                                 np.zeros(2 * self.n_bins), [0.0]])
+        self._extractions_before = 0.0
+        self._pending = iter(())
+
+        self.datacollector = DataCollector(
+            model_reporters={
+                "Corruption_Rate": lambda m: self._corruption_rate(),
+                "Mean_Integrity": lambda m: self._mean_integrity(),
+                "Total_Extractions": lambda m: self._total_extractions(),
+                "Corrupted_Agents": lambda m: self._n_corrupted(),
+                "Extraction_Rate": lambda m: self._extraction_rate(),
+            }
+        )
+
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of a running model (e.g. at an intervention).
+
+        The node layout (n_enforcers, oversight_structure, n_bins) is fixed.
+        """
+        for name, value in params.items():
+            if (name in ("n_enforcers", "oversight_structure", "n_bins")
+                    or name.startswith("_") or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+        self._pending = iter(())
+
+    def _extraction_prob(self, integrity: np.ndarray) -> np.ndarray:
+        """Per-step probability that agents with this integrity extract."""
+        from scipy.special import ndtr
+
+        o = self.oversight
+        expected_penalty = self.detection_cost * self.base_detection_prob * o
+        threshold = (expected_penalty + integrity) / (2 - o)
+        if self.extraction_std <= 0:
+            return (self.extraction_mean > threshold).astype(float)
+        return ndtr((self.extraction_mean - threshold) / self.extraction_std)
+
+    def _reinforcement(self, integrity: np.ndarray, q: np.ndarray,
+                       rate: float) -> np.ndarray:
+        """Expected per-step integrity change from reinforcement."""
+        from scipy.special import ndtr
+
+        if not self.integrity_reinforcement or rate <= 0.3:
+            return np.zeros_like(integrity)
+        if self.extraction_std > 0:
+            opportunity = ndtr(self.extraction_mean / self.extraction_std)
+        else:
+            opportunity = float(self.extraction_mean > 0)
+        boost = np.minimum(integrity * self.reinforcement_rate * rate,
+                           2 * self.integrity_mean - integrity)
+        return np.maximum(opportunity - q, 0.0) * boost
+
+    def _rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        k = self.n_bins
+        h, a, c, mass = y[:k], y[k:2 * k], y[2 * k:3 * k], y[3 * k:4 * k]
+        g = np.divide(mass, c, out=np.zeros(k), where=c > 1e-12)
+        rate = c.sum()
+
+        q_honest = self._extraction_prob(a)
+        q_corrupt = self._extraction_prob(g)
+        newly_corrupt = h * q_honest
+        extractions = newly_corrupt.sum() + (c * q_corrupt).sum()
+
+        decay = self.integrity_decay_rate if self.integrity_decay else 0.0
+        contagion = (5 * self.contagion_rate * extractions
+                     if self.corruption_contagion else 0.0)
+
+        da = -contagion * a + self._reinforcement(a, q_honest, rate)
+        d_mass = (newly_corrupt * a * (1 - decay) - decay * q_corrupt * mass
+                  + c * self._reinforcement(g, q_corrupt, rate))
+        return np.concatenate([-newly_corrupt, da, newly_corrupt, d_mass,
+                               [extractions]])
+
+    def _integrate(self, steps: int) -> np.ndarray:
+        """States after each of the next steps, shape (steps, state size)."""
+        from scipy.integrate import solve_ivp
+
+        t0 = float(self.steps)
+        sol = solve_ivp(self._rhs, (t0, t0 + steps), self.y,
+                        t_eval=t0 + np.arange(1, steps + 1), max_step=1.0,
+                        rtol=1e-6, atol=1e-9)
+        return sol.y.T
+
+    def _n_corrupted(self) -> float:
+        """Expected number of agents who have corrupted."""
+        return self._corruption_rate() * self.n_enforcers
+
+    def _corruption_rate(self) -> float:
+        """Proportion of agents who have corrupted."""
+        k = self.n_bins
+        return float(self.y[2 * k:3 * k].sum())
+
+    def _mean_integrity(self) -> float:
+        """Average integrity across all agents."""
+        k = self.n_bins
+        return float(self.y[:k] @ self.y[k:2 * k] + self.y[3 * k:4 * k].sum())
+
+    def _total_extractions(self) -> float:
+        """Expected extraction events across all agents."""
+        return float(self.y[-1]) * self.n_enforcers
+
+    def _extraction_rate(self) -> float:
+        """Extractions per enforcer in the most recent step."""
+        return float(self.y[-1]) - self._extractions_before
+
+    def step(self):
+        """Advance model by one step."""
+        self.datacollector.collect(self)
+        self._extractions_before = float(self.y[-1])
+        y = next(self._pending, None)
+        self.y = self._integrate(1)[0] if y is None else y
+
+    def run(self, steps: int = 100) -> None:
+        """Run model for specified number of steps (one ODE solve for all of them)."""
+        self._pending = iter(self._integrate(steps))
+        for _ in range(steps):
+            self.step()
+
+
+class CorruptionHistogramModel(Model):
+    """
+    Population-density engine for the corruption model.
+
+    Enforcers differ only by integrity, corrupted flag and oversight tier,
+    so each tier is held as two integrity histograms (honest and corrupted
+    counts) over a fixed log-spaced grid of n_bins integrity values. Every
+    integrity change in Enforcer.step is multiplicative, so a step moves
+    bin counts instead of agents:
+
+    - extractions: Binomial(count, q) per bin, where q is the per-step
+      extraction probability of the bin's integrity and tier (see
+      CorruptionMeanFieldModel); honest extractors turn corrupt and all
+      extractors' integrity decays by (1 - integrity_decay_rate)
+    - reinforcement (corruption rate above 0.3): non-extractors who had an
+      opportunity are drawn binomially and boosted
+    - contagion: every extraction hits 5 random agents, so honest agents
+      are split multinomially by their Poisson(5 * extractions / n) hits
+      and lose a factor (1 - contagion_rate) per hit
+
+    A count moved to an integrity between two grid values is split between
+    them binomially with the probability that keeps its expected integrity,
+    so mean integrity is unbiased up to the grid range. Cost per step
+    scales with tiers * bins, not with n_enforcers, so institutions of 10^8
+    enforcers step in milliseconds.
+
+    Unlike the agent engine, decisions within a step are made against the
+    state at its start (synchronous update), and contagion only reaches
+    agents still honest at its end.
+
+    Takes the same parameters as CorruptionModel, plus:
+        n_bins: Integrity grid size
+        min_integrity: Lowest grid value; decayed integrity below it is
+            held there (it is effectively zero for every decision)
+    """
+
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("purge", "shock")
+
+    def __init__(
+        self,
+        n_enforcers: int = 100,
+        integrity_mean: float = 5.0,
+        integrity_std: float = 2.0,
+        extraction_mean: float = 3.0,
+        extraction_std: float = 1.5,
+        base_detection_prob: float = 0.3,
+        detection_cost: float = 10.0,
+        oversight_structure: str = "hierarchical",
+        integrity_decay: bool = True,
+        integrity_decay_rate: float = 0.05,
+        corruption_contagion: bool = True,
+        contagion_rate: float = 0.02,
+        integrity_reinforcement: bool = False,
+        reinforcement_rate: float = 0.02,
+        n_bins: int = 400,
+        min_integrity: float = 1e-3,
+        seed: Optional[int] = None
+    ):
+        from scipy.special import ndtr
+
+        super().__init__(seed=seed)
+
+        self.n_enforcers = n_enforcers
+        self.integrity_mean = integrity_mean
+        self.integrity_std = integrity_std
+        self.extraction_mean = extraction_mean
+        self.extraction_std = extraction_std
+        self.base_detection_prob = base_detection_prob
+        self.detection_cost = detection_cost
+        self.oversight_structure = oversight_structure
+        self.integrity_decay = integrity_decay
+        self.integrity_decay_rate = integrity_decay_rate
+        self.corruption_contagion = corruption_contagion
+        self.contagion_rate = contagion_rate
+        self.integrity_reinforcement = integrity_reinforcement
+        self.reinforcement_rate = reinforcement_rate
+
+        levels, counts = oversight_tiers(oversight_structure, n_enforcers)
+        self.oversight = levels[:, None]
+
+        # Log-spaced integrity grid covering the initial distribution and the
+        # reinforcement cap
+        top = max(2 * integrity_mean, integrity_mean + 6 * integrity_std, 0.1)
+        self.values = np.geomspace(min_integrity, top, n_bins)
+        self._log_spacing = np.log(self.values[1] / self.values[0])
+
+        # Initial histograms: max(0.1, normal) mass between grid midpoints
+        edges = np.concatenate([[-np.inf], np.sqrt(self.values[1:] * self.values[:-1]),
+                                [np.inf]])
+        edges = np.maximum(edges, 0.1)
+        edges[0] = -np.inf
+        if integrity_std > 0:
+            cdf = ndtr((edges - integrity_mean) / integrity_std)
+        else:
+            cdf = (edges >= max(0.1, integrity_mean)).astype(float)
+        probs = np.clip(np.diff(cdf), 0.0, None)
+        self._initial_probs = probs / probs.sum()
+        self.honest = np.stack([self.rng.multinomial(n, self._initial_probs)
+                                for n in counts])
+        self.corrupt = np.zeros_like(self.honest)
+
+        self._decision_probabilities()
+
+        self.total_extractions = 0
+        self.step_extractions = 0
+
+        self.datacollector = DataCollector(
+            model_reporters={
+                "Corruption_Rate": lambda m: self._corruption_rate(),
+                "Mean_Integrity": lambda m: self._mean_integrity(),
+                "Total_Extractions": lambda m: self._total_extractions(),
+                "Corrupted_Agents": lambda m: self._n_corrupted(),
+                "Extraction_Rate": lambda m: self._extraction_rate(),
+            }
+        )
+
+    def _decision_probabilities(self) -> None:
+        """
+        Per-step extraction probability q of every (tier, bin), and the
+        probability p_boost that a non-extractor had an opportunity (U > 0).
+        """
+        from scipy.special import ndtr
+
+        o = self.oversight
+        expected_penalty = self.detection_cost * self.base_detection_prob * o
+        threshold = (expected_penalty + self.values) / (2 - o)
+        if self.extraction_std > 0:
+            self.q = ndtr((self.extraction_mean - threshold) / self.extraction_std)
+            opportunity = ndtr(self.extraction_mean / self.extraction_std)
+        else:
+            self.q = (self.extraction_mean > threshold).astype(float)
+            opportunity = float(self.extraction_mean > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.p_boost = np.clip(np.where(self.q < 1,
+                                            (opportunity - self.q) / (1 - self.q),
+                                            0.0), 0, 1)
+
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of a running model (e.g. at an intervention).
+
+        The tiers and the grid (n_enforcers, oversight_structure, n_bins,
+        min_integrity) are fixed.
+        """
+        for name, value in params.items():
+            if (name in ("n_enforcers", "oversight_structure", "n_bins",
+                         "min_integrity")
+                    or name.startswith("_") or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+        self._decision_probabilities()
+
+    def purge(self, fraction: float = 1.0) -> None:
+        """
+        Replace a random fraction of the corrupted with recruits from the
+        initial integrity distribution.
+        """
+        purged = self.rng.binomial(self.corrupt, fraction)
+        self.corrupt = self.corrupt - purged
+        self.honest = self.honest + np.stack(
+            [self.rng.multinomial(n, self._initial_probs) for n in purged.sum(axis=1)]
+        )
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Multiply the integrity of a random fraction of enforcers by factor."""
+        for name in ("honest", "corrupt"):
+            counts = getattr(self, name)
+            hit = self.rng.binomial(counts, fraction)
+            setattr(self, name, counts - hit + self._move(hit, self.values * factor))
+
+    def _move(self, counts: np.ndarray, integrity: np.ndarray) -> np.ndarray:
+        """
+        Histogram after moving each bin's count to a new integrity.
+
+        Args:
+            counts: Counts per (tier, bin)
+            integrity: New integrity per (tier, bin), broadcastable to counts
+
+        Returns:
+            Counts per (tier, bin) on the grid
+        """
+        values = self.values
+        v = np.broadcast_to(np.clip(integrity, values[0], values[-1]), counts.shape)
+        lo = np.minimum((np.log(v / values[0]) / self._log_spacing).astype(np.int64),
+                        len(values) - 2)
+        p_up = np.clip((v - values[lo]) / (values[lo + 1] - values[lo]), 0.0, 1.0)
+        up = self.rng.binomial(counts, p_up)
+
+        n_tiers, n_bins = counts.shape
+        index = lo + n_bins * np.arange(n_tiers)[:, None]
+        moved = np.bincount(index.ravel(), weights=(counts - up).ravel(),
+                            minlength=counts.size)
+        moved += np.bincount((index + 1).ravel(), weights=up.ravel(),
+                             minlength=counts.size)
+        return np.rint(moved).astype(np.int64).reshape(counts.shape)
+
+    def _boost(self, counts: np.ndarray, rate: float) -> np.ndarray:
+        """Reinforce the non-extractors who had an opportunity."""
+        boosted = self.rng.binomial(counts, self.p_boost)
+        target = np.minimum(self.values * (1 + self.reinforcement_rate * rate),
+                            2 * self.integrity_mean)
+        return counts - boosted + self._move(boosted, target)
+
+    def _contagion(self, counts: np.ndarray, extractions: int) -> np.ndarray:
+        """Split honest counts by Poisson contagion hits and apply them."""
+        from scipy.stats import poisson
+
+        hits_mean = min(5, self.n_enforcers - 1) * extractions / self.n_enforcers
+        k_max = int(np.ceil(hits_mean + 10 * np.sqrt(hits_mean) + 10))
+        pvals = poisson.pmf(np.arange(k_max), hits_mean)
+        pvals[-1] += max(0.0, 1 - pvals.sum())
+        split = self.rng.multinomial(counts, pvals / pvals.sum())
+
+        result = split[..., 0].copy()
+        for k in range(1, k_max):
+            if split[..., k].any():
+                result += self._move(split[..., k],
+                                     self.values * (1 - self.contagion_rate) ** k)
+        return result
+
+    def _n_corrupted(self) -> int:
+        """Number of agents who have corrupted."""
+        return int(self.corrupt.sum())
+
+    def _corruption_rate(self) -> float:
+        """Proportion of agents who have corrupted."""
+        if self.n_enforcers == 0:
+            return 0.0
+        return self._n_corrupted() / self.n_enforcers
+
+    def _mean_integrity(self) -> float:
+        """Average integrity across all agents."""
+        if self.n_enforcers == 0:
+            return 0.0
+        total = (self.honest + self.corrupt).sum(axis=0) @ self.values
+        return float(total) / self.n_enforcers
+
+    def _total_extractions(self) -> int:
+        """Total extraction events across all agents."""
+        return self.total_extractions
+
+    def _extraction_rate(self) -> float:
+        """Extractions per enforcer in the most recent step."""
+        if self.n_enforcers == 0:
+            return 0.0
+        return self.step_extractions / self.n_enforcers
+
+    def step(self):
+        """Advance model by one step."""
+        self.datacollector.collect(self)
+        rate = self._corruption_rate()
+
+        extract_honest = self.rng.binomial(self.honest, self.q)
+        extract_corrupt = self.rng.binomial(self.corrupt, self.q)
+        honest = self.honest - extract_honest
+        corrupt = self.corrupt - extract_corrupt
+
+        if self.integrity_reinforcement and rate > 0.3:
+            honest = self._boost(honest, rate)
+            corrupt = self._boost(corrupt, rate)
+
+        extractors = extract_honest + extract_corrupt
+        if self.integrity_decay:
+            extractors = self._move(extractors,
+                                    self.values * (1 - self.integrity_decay_rate))
+        self.corrupt = corrupt + extractors
+
+        self.step_extractions = int(extract_honest.sum() + extract_corrupt.sum())
+        self.total_extractions += self.step_extractions
+        if self.corruption_contagion and self.step_extractions > 0:
+            honest = self._contagion(honest, self.step_extractions)
+        self.honest = honest
+
+    def run(self, steps: int = 100) -> None:
+        """Run model for specified number of steps."""
+        for _ in range(steps):
+            self.step()
+
+
+# Simulation engines selectable from run_experiment
+ENGINES = {
+    "agent": CorruptionModel,
+    "meanfield": CorruptionMeanFieldModel,
+    "histogram": CorruptionHistogramModel,
+}
+
+
 def run_experiment(config_path: str = None, **kwargs) -> dict:
     """
     Run a corruption dynamics experiment.
 
     Args:
         config_path: Path to YAML config file
-        **kwargs: Override config parameters
+        **kwargs: Override config parameters (profile=True adds a per-phase
+            step profile under "profile", see abm/profiling.py; engine
+            selects "agent" (default), "meanfield" (the ODE surrogate
+            CorruptionMeanFieldModel) or "histogram" (the binned
+            CorruptionHistogramModel); agent_data is empty for the latter two;
+            schedule lists mid-run interventions, see abm/interventions.py)
 
     Returns:
         Dictionary with model results
     """
     # Load config if provided
     if config_path:
+        import yaml  # only needed for config files
+
         with open(config_path) as f:
             config = yaml.safe_load(f)
     else:
@@ -281,27 +870,47 @@ def run_experiment(config_path: str = None, **kwargs) -> dict:
     # Set defaults
     n_steps = config.pop("n_steps", 200)
 
+    engine = config.pop("engine", "agent")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    profile = config.pop("profile", False)
+    schedule = config.pop("schedule", None)
+
     # Create and run model
-    model = CorruptionModel(**config)
-    model.run(n_steps)
+    model = ENGINES[engine](**config)
+    if profile:
+        profiler = StepProfiler()
+        with profiler.instrument(model):
+            run_schedule(model, n_steps, schedule)
+    else:
+        run_schedule(model, n_steps, schedule)
 
     # Get results
     model_data = model.datacollector.get_model_vars_dataframe()
-    agent_data = model.datacollector.get_agent_vars_dataframe()
+    if model.datacollector.agent_reporters:
+        agent_data = model.datacollector.get_agent_vars_dataframe()
+    else:
+        agent_data = pd.DataFrame()
 
-    return {
+    results = {
         "model_data": model_data,
         "agent_data": agent_data,
         "final_corruption_rate": model._corruption_rate(),
         "final_mean_integrity": model._mean_integrity(),
         "total_extractions": model._total_extractions(),
+        "engine": engine,
         "config": config,
     }
 
+    if profile:
+        results["profile"] = profiler.to_dict()
+
+    return results
+
 
 if __name__ == "__main__":
     import argparse
-    import matplotlib.pyplot as plt
 
     parser = argparse.ArgumentParser(description="Run corruption dynamics ABM")
     parser.add_argument("--config", type=str, help="Path to config file")
@@ -309,6 +918,14 @@ if __name__ == "__main__":
     parser.add_argument("--enforcers", type=int, default=100, help="Number of enforcers")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
     parser.add_argument("--output", type=str, help="Output directory for figures")
+    parser.add_argument("--engine", type=str, default="agent", choices=sorted(ENGINES),
+                        help="Simulation engine (agent, mean-field ODE or binned "
+                             "histogram)")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="Skip figures (no matplotlib import)")
+    parser.add_argument("--profile", type=str, default=None,
+                        help="Write a per-phase step profile (.json, or collapsed "
+                             "stacks for flame graphs)")
 
     args = parser.parse_args()
 
@@ -317,49 +934,25 @@ if __name__ == "__main__":
         config_path=args.config,
         n_enforcers=args.enforcers,
         n_steps=args.steps,
-        seed=args.seed
+        seed=args.seed,
+        engine=args.engine,
+        profile=args.profile is not None
     )
 
     print(f"Final corruption rate: {results['final_corruption_rate']:.2%}")
     print(f"Final mean integrity: {results['final_mean_integrity']:.2f}")
-    print(f"Total extractions: {results['total_extractions']}")
+    print(f"Total extractions: {results['total_extractions']:.0f}")
+
+    if args.profile:
+        print(format_profile(results["profile"]))
+        write_profile(results["profile"], args.profile)
+        print(f"Profile saved to {args.profile}")
 
     # Plot results
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-
-    # Corruption rate over time
-    ax = axes[0, 0]
-    ax.plot(results["model_data"]["Corruption_Rate"])
-    ax.set_xlabel("Step")
-    ax.set_ylabel("Corruption Rate")
-    ax.set_title("Corruption Rate Over Time")
-    ax.axhline(y=0.5, color='r', linestyle='--', alpha=0.5, label="50% threshold")
-    ax.legend()
-
-    # Mean integrity over time
-    ax = axes[0, 1]
-    ax.plot(results["model_data"]["Mean_Integrity"])
-    ax.set_xlabel("Step")
-    ax.set_ylabel("Mean Integrity")
-    ax.set_title("Mean Integrity Over Time")
-
-    # Total extractions over time
-    ax = axes[1, 0]
-    ax.plot(results["model_data"]["Total_Extractions"])
-    ax.set_xlabel("Step")
-    ax.set_ylabel("Cumulative Extractions")
-    ax.set_title("Total Extraction Events")
-
-    # Number of corrupted agents
-    ax = axes[1, 1]
-    ax.plot(results["model_data"]["Corrupted_Agents"])
-    ax.set_xlabel("Step")
-    ax.set_ylabel("Number Corrupted")
-    ax.set_title("Corrupted Agents Over Time")
-
-    plt.tight_layout()
-
-    if args.output:
-        plt.savefig(f"{args.output}/corruption_dynamics.png", dpi=150)
-    else:
-        plt.show()
+    if not args.no_plot:
+        from .plotting import plot_corruption_dynamics
+
+        plot_corruption_dynamics(
+            results,
+            f"{args.output}/corruption_dynamics.png" if args.output else None
+        )
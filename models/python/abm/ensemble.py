@@ -0,0 +1,350 @@
+"""
+Replicate Ensembles with Streaming Per-Step Statistics
+
+Runs R replicates of one model configuration and summarizes the model
+reporters at every step by their mean, variance and quantiles across
+replicates, without keeping the trajectories:
+
+- means and variances are Welford running moments (batches of replicates
+  are folded in with Chan's pairwise update)
+- quantiles use the P^2 algorithm (Jain & Chlamtac, 1985), five markers
+  per quantile and cell, updated for all (step, reporter) cells at once
+
+Replicates of the agent-style models run in a process pool (or an existing
+executor), and each finished trajectory is folded into the statistics as
+it arrives, so memory stays at the accumulators plus the trajectories in
+flight. The motivation model simulates all replicates as one vectorized
+batch. Draw the result with abm.plotting.plot_ensemble (mean line with
+quantile ribbons or a +/- k std band).
+
+Usage:
+    result = run_ensemble("corruption", n_replicates=100, n_steps=200, n_workers=8)
+    result.mean["Corruption_Rate"], result.quantile(0.9)["Corruption_Rate"]
+"""
+
+import importlib
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Models runnable as ensembles: abm module with a run_experiment(seed=..., n_steps=...)
+ENSEMBLE_MODELS = {
+    "corruption": "corruption_dynamics",
+    "cooperation": "cooperation_threshold",
+    "polycentric": "polycentric_governance",
+    "motivation": "motivation_foundations",
+}
+
+# Default quantiles: the ribbons of abm.plotting.RIBBON_QUANTILES and the median
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+class StreamingStats:
+    """
+    Running mean, variance and P^2 quantile estimates for arrays of one shape.
+
+    Every update adds one observation per cell (one replicate's values).
+
+    Attributes:
+        count: Observations so far
+        quantiles: Quantile levels tracked
+    """
+
+    def __init__(self, shape: tuple, quantiles: Sequence[float] = DEFAULT_QUANTILES):
+        self.shape = tuple(shape)
+        self.quantiles = tuple(quantiles)
+        self.count = 0
+        self._mean = np.zeros(self.shape)
+        self._m2 = np.zeros(self.shape)
+
+        cells = (1,) * len(self.shape)
+        p = np.asarray(self.quantiles, dtype=float).reshape((-1,) + cells)
+        self._increments = np.stack([np.zeros_like(p), p / 2, p, (1 + p) / 2,
+                                     np.ones_like(p)], axis=1)
+        # Marker heights and positions (1-based), per quantile and cell
+        self._heights = np.zeros((len(self.quantiles), 5) + self.shape)
+        self._positions = np.zeros((len(self.quantiles), 5) + self.shape)
+        self._desired = None
+        self._first = []
+
+    def update(self, x: np.ndarray) -> None:
+        """Add one observation per cell."""
+        x = np.asarray(x, dtype=float).reshape(self.shape)
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (x - self._mean)
+        self._update_quantiles(x)
+
+    def update_batch(self, xs: np.ndarray) -> None:
+        """Add a batch of observations, shape (batch, *shape)."""
+        xs = np.asarray(xs, dtype=float).reshape((-1,) + self.shape)
+        if len(xs) == 0:
+            return
+        n_a, n_b = self.count, len(xs)
+        mean_b = xs.mean(axis=0)
+        m2_b = ((xs - mean_b) ** 2).sum(axis=0)
+        delta = mean_b - self._mean
+        self.count = n_a + n_b
+        self._mean = self._mean + delta * n_b / self.count
+        self._m2 = self._m2 + m2_b + delta ** 2 * n_a * n_b / self.count
+        for x in xs:
+            self._update_quantiles(x)
+
+    def _update_quantiles(self, x: np.ndarray) -> None:
+        """One P^2 step for every quantile and cell."""
+        if self._desired is None:
+            self._first.append(x)
+            if len(self._first) == 5:
+                self._heights[:] = np.sort(np.stack(self._first), axis=0)
+                cells = (1,) * len(self.shape)
+                self._positions[:] = np.arange(1, 6).reshape((1, 5) + cells)
+                self._desired = 1 + 4 * self._increments * np.ones_like(self._positions)
+                self._first = []
+            return
+
+        q, n = self._heights, self._positions
+        q[:, 0] = np.minimum(q[:, 0], x)
+        q[:, 4] = np.maximum(q[:, 4], x)
+        # Markers above the new observation move one position up
+        n += x < q
+        n[:, 4] += x >= q[:, 4]
+        n[:, 0] = 1
+        self._desired = self._desired + self._increments
+
+        for i in (1, 2, 3):
+            d = self._desired[:, i] - n[:, i]
+            move = (((d >= 1) & (n[:, i + 1] - n[:, i] > 1))
+                    | ((d <= -1) & (n[:, i - 1] - n[:, i] < -1)))
+            if not move.any():
+                continue
+            s = np.sign(d)
+            n_lo, n_i, n_hi = n[:, i - 1], n[:, i], n[:, i + 1]
+            q_lo, q_i, q_hi = q[:, i - 1], q[:, i], q[:, i + 1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                parabolic = q_i + s / (n_hi - n_lo) * (
+                    (n_i - n_lo + s) * (q_hi - q_i) / (n_hi - n_i)
+                    + (n_hi - n_i - s) * (q_i - q_lo) / (n_i - n_lo)
+                )
+                linear = q_i + s * np.where(s > 0, (q_hi - q_i) / (n_hi - n_i),
+                                            (q_lo - q_i) / (n_lo - n_i))
+            new = np.where((q_lo < parabolic) & (parabolic < q_hi), parabolic, linear)
+            q[:, i] = np.where(move, new, q_i)
+            n[:, i] = np.where(move, n_i + s, n_i)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Running mean per cell."""
+        return self._mean.copy()
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance (ddof=1); NaN with fewer than two observations."""
+        if self.count < 2:
+            return np.full(self.shape, np.nan)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation per cell."""
+        return np.sqrt(self.variance)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Estimate of a tracked quantile (exact with fewer than five observations)."""
+        if q not in self.quantiles:
+            raise ValueError(f"Quantile {q} not tracked (tracked: {self.quantiles})")
+        if self._first:
+            return np.quantile(np.stack(self._first), q, axis=0)
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        return self._heights[self.quantiles.index(q), 2].copy()
+
+
+@dataclass
+class EnsembleResult:
+    """
+    Per-step statistics of a replicate ensemble.
+
+    Attributes:
+        model: Model name (a key of ENSEMBLE_MODELS)
+        columns: Reporter names
+        n_replicates: Replicates folded in
+        stats: StreamingStats over (step, reporter)
+        finals: StreamingStats over the final_* outputs, in final_keys order
+        final_keys: Names of the final_* outputs
+        config: Model configuration (without seed)
+    """
+    model: str
+    columns: List[str]
+    n_replicates: int
+    stats: StreamingStats
+    finals: StreamingStats
+    final_keys: List[str]
+    config: Dict = field(default_factory=dict)
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, columns=self.columns)
+
+    @property
+    def mean(self) -> pd.DataFrame:
+        """Mean of every reporter per step."""
+        return self._frame(self.stats.mean)
+
+    @property
+    def std(self) -> pd.DataFrame:
+        """Standard deviation across replicates of every reporter per step."""
+        return self._frame(self.stats.std)
+
+    def quantile(self, q: float) -> pd.DataFrame:
+        """Quantile across replicates of every reporter per step."""
+        return self._frame(self.stats.quantile(q))
+
+    def final_summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean and std across replicates of each final_* output."""
+        mean, std = self.finals.mean, self.finals.std
+        return {key: {"mean": float(mean[i]), "std": float(std[i])}
+                for i, key in enumerate(self.final_keys)}
+
+
+def _run_replicate(args: tuple) -> tuple:
+    """
+    Worker: run one replicate.
+
+    Returns:
+        (reporter names, reporter values (steps, reporters), final_* outputs)
+    """
+    module_name, config, seed = args
+    # Relative to this package, so it resolves as abm.* or python.abm.*
+    module = importlib.import_module(f".{module_name}", __package__)
+    results = module.run_experiment(seed=seed, **config)
+    model_data = results["model_data"]
+    finals = {k: float(v) for k, v in results.items() if k.startswith("final_")}
+    return list(model_data.columns), model_data.to_numpy(dtype=float), finals
+
+
+def _motivation_batch(config: dict, n_replicates: int, seed: int) -> tuple:
+    """All motivation replicates as one vectorized batch, in _run_replicate's layout."""
+    from .motivation_foundations import run_experiment
+
+    results = run_experiment(n_replications=n_replicates, seed=seed, **config)
+    values = np.stack([results["cooperation_rates"].T, results["mean_motivations"].T],
+                      axis=-1)
+    finals = {"final_cooperation_rate": results["final_cooperation_rate"]}
+    return ["Cooperation_Rate", "Mean_Motivation"], values, finals
+
+
+def run_ensemble(
+    model: str,
+    n_replicates: int = 50,
+    seed: int = 0,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    n_workers: Optional[int] = None,
+    executor: Executor = None,
+    **config
+) -> EnsembleResult:
+    """
+    Run replicates of one configuration and stream their per-step statistics.
+
+    Args:
+        model: One of ENSEMBLE_MODELS
+        n_replicates: Number of replicates R; replicate i uses seed + i
+        seed: Base seed
+        quantiles: Quantile levels to track per step
+        n_workers: Number of parallel workers (ignored for "motivation",
+            which is vectorized)
+        executor: Existing pool to run on; n_workers is ignored when given
+        **config: run_experiment parameters (n_steps, engine, ...)
+
+    Returns:
+        EnsembleResult
+    """
+    if model not in ENSEMBLE_MODELS:
+        raise ValueError(f"Unknown ensemble model: {model}")
+
+    if model == "motivation":
+        columns, values, finals = _motivation_batch(config, n_replicates, seed)
+        final_keys = list(finals)
+        stats = StreamingStats(values.shape[1:], quantiles)
+        stats.update_batch(values)
+        final_stats = StreamingStats((len(final_keys),), quantiles)
+        final_stats.update_batch(np.column_stack([finals[k] for k in final_keys]))
+        return EnsembleResult(model, columns, n_replicates, stats, final_stats,
+                              final_keys, config)
+
+    jobs = [(ENSEMBLE_MODELS[model], config, seed + i) for i in range(n_replicates)]
+
+    state = {}
+
+    def fold(outputs):
+        for columns, values, finals in outputs:
+            if not state:
+                state["columns"] = columns
+                state["final_keys"] = list(finals)
+                state["stats"] = StreamingStats(values.shape, quantiles)
+                state["finals"] = StreamingStats((len(finals),), quantiles)
+            state["stats"].update(values)
+            state["finals"].update([finals[k] for k in state["final_keys"]])
+
+    if executor is not None:
+        fold(executor.map(_run_replicate, jobs))
+    elif n_workers is not None and n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            fold(pool.map(_run_replicate, jobs))
+    else:
+        fold(_run_replicate(job) for job in jobs)
+
+    return EnsembleResult(model, state["columns"], n_replicates, state["stats"],
+                          state["finals"], state["final_keys"], config)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Run a replicate ensemble of an ABM")
+    parser.add_argument("model", choices=list(ENSEMBLE_MODELS))
+    parser.add_argument("--reps", type=int, default=50, help="Number of replicates")
+    parser.add_argument("--steps", type=int, default=None, help="Number of steps")
+    parser.add_argument("--seed", type=int, default=0, help="Base random seed")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers")
+    parser.add_argument("--set", type=str, nargs="*", default=[], metavar="KEY=VALUE",
+                        help="Model parameters, e.g. --set n_enforcers=500 "
+                             "engine=histogram")
+    parser.add_argument("--band", type=str, default="quantile",
+                        choices=["quantile", "std"],
+                        help="Band drawn around the mean")
+    parser.add_argument("--output", type=str, help="Output directory for figures")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="Skip figures (no matplotlib import)")
+
+    args = parser.parse_args()
+
+    config = {}
+    for item in args.set:
+        key, value = item.split("=", 1)
+        try:
+            config[key] = json.loads(value)
+        except ValueError:
+            config[key] = value
+    if args.steps is not None:
+        config["n_steps"] = args.steps
+
+    result = run_ensemble(args.model, n_replicates=args.reps, seed=args.seed,
+                          n_workers=args.workers, **config)
+
+    for key, summary in result.final_summary().items():
+        print(f"{key}: {summary['mean']:.4f} ± {summary['std']:.4f} "
+              f"over {result.n_replicates} replicates")
+
+    if not args.no_plot:
+        from .plotting import plot_ensemble
+
+        plot_ensemble(
+            result,
+            f"{args.output}/{args.model}_ensemble.png" if args.output else None,
+            band=args.band
+        )
@@ -0,0 +1,154 @@
+"""
+Agent Event Log
+
+Preallocated struct-of-arrays ring buffer recording agent state transitions
+(step, agent index, event type), plus running per-type counters.
+
+The counters let models report rates such as corruption, reform and
+extraction per step in O(1) instead of rescanning every agent, and the
+buffer keeps the most recent events for later analysis. When more events
+are recorded than the buffer holds, the oldest are overwritten; the
+counters always cover the full run.
+"""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class EventType(IntEnum):
+    """Agent events recorded by the models."""
+    CORRUPTED = 0     # honest -> corrupt
+    REFORMED = 1      # corrupt -> honest
+    EXTRACTION = 2    # one extraction event
+    COOPERATED = 3    # defecting -> cooperating
+    DEFECTED = 4      # cooperating -> defecting
+    PURGED = 5        # corrupt agent replaced by a new recruit (interventions)
+
+
+N_EVENT_TYPES = len(EventType)
+
+
+class EventLog:
+    """
+    Ring buffer of agent events with per-step and cumulative counts.
+
+    Models call begin_step() before agents act, then record() (or
+    record_many() for array engines) for each transition. Reporters read
+    step_count() for events of the step in progress or just finished and
+    total() for cumulative counts.
+
+    Args:
+        capacity: Number of most recent events retained
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self.capacity = capacity
+        self.steps = np.zeros(capacity, dtype=np.int32)
+        self.agents = np.zeros(capacity, dtype=np.int32)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.n_recorded = 0
+        self.step = 0
+        self._step_counts = [0] * N_EVENT_TYPES
+        self._totals = [0] * N_EVENT_TYPES
+        self._history = []
+
+    def begin_step(self, step: int) -> None:
+        """Start recording events for a new step."""
+        self._history.append(self._step_counts)
+        self._step_counts = [0] * N_EVENT_TYPES
+        self.step = step
+
+    def record(self, agent_index: int, event_type: EventType) -> None:
+        """Record one event for an agent in the current step."""
+        i = self.n_recorded % self.capacity
+        self.steps[i] = self.step
+        self.agents[i] = agent_index
+        self.types[i] = event_type
+        self.n_recorded += 1
+        self._step_counts[event_type] += 1
+        self._totals[event_type] += 1
+
+    def record_many(self, agent_indices: np.ndarray, event_type: EventType) -> None:
+        """Record the same event for many agents in the current step."""
+        n = len(agent_indices)
+        if n == 0:
+            return
+        if n > self.capacity:
+            agent_indices = agent_indices[-self.capacity:]
+        positions = (self.n_recorded + n - len(agent_indices)
+                     + np.arange(len(agent_indices))) % self.capacity
+        self.steps[positions] = self.step
+        self.agents[positions] = agent_indices
+        self.types[positions] = event_type
+        self.n_recorded += n
+        self._step_counts[event_type] += n
+        self._totals[event_type] += n
+
+    def get_state(self) -> dict:
+        """Counters and retained events, for snapshots (see abm/snapshot.py)."""
+        retained = self.events()
+        return {
+            "capacity": self.capacity,
+            "n_recorded": self.n_recorded,
+            "step": self.step,
+            "step_counts": list(self._step_counts),
+            "totals": list(self._totals),
+            "history": [list(row) for row in self._history],
+            "steps": retained["step"],
+            "agents": retained["agent"],
+            "types": retained["event_type"],
+        }
+
+    def set_state(self, state: dict) -> None:
+        """Restore a get_state() result."""
+        self.__init__(int(state["capacity"]))
+        self.n_recorded = int(state["n_recorded"])
+        self.step = int(state["step"])
+        self._step_counts = [int(c) for c in state["step_counts"]]
+        self._totals = [int(c) for c in state["totals"]]
+        self._history = [[int(c) for c in row] for row in state["history"]]
+        n = len(state["steps"])
+        positions = (self.n_recorded - n + np.arange(n)) % self.capacity
+        self.steps[positions] = state["steps"]
+        self.agents[positions] = state["agents"]
+        self.types[positions] = state["types"]
+
+    def step_count(self, event_type: EventType) -> int:
+        """Events of this type recorded since the last begin_step()."""
+        return self._step_counts[event_type]
+
+    def total(self, event_type: EventType) -> int:
+        """Events of this type recorded over the whole run."""
+        return self._totals[event_type]
+
+    @property
+    def dropped(self) -> int:
+        """Number of events overwritten because the buffer was full."""
+        return max(0, self.n_recorded - self.capacity)
+
+    def events(self) -> dict:
+        """
+        Retained events in chronological order.
+
+        Returns:
+            Dict of equal-length arrays "step", "agent" and "event_type"
+        """
+        n = min(self.n_recorded, self.capacity)
+        start = self.n_recorded - n
+        order = (start + np.arange(n)) % self.capacity
+        return {
+            "step": self.steps[order],
+            "agent": self.agents[order],
+            "event_type": self.types[order],
+        }
+
+    def counts_per_step(self) -> np.ndarray:
+        """
+        Event counts per step (rows) and event type (columns) for the full run.
+
+        Row 0 holds events recorded before the first begin_step(), row i
+        the events of the i-th step.
+        """
+        rows = self._history + [self._step_counts]
+        return np.array(rows, dtype=np.int64).reshape(-1, N_EVENT_TYPES)
@@ -0,0 +1,177 @@
+"""
+Intervention Schedules
+
+A schedule declares policy changes by step, so time-varying interventions
+(detection ramps, periodic purges, shocks) need no model subclass: pass
+schedule=[...] to any run_experiment, or list it under "schedule" in a
+YAML config. Entries:
+
+    {"step": 50, "set": {"base_detection_prob": 0.6}}
+    {"step": 20, "until": 80, "ramp": {"base_detection_prob": 0.9}}
+    {"step": 100, "every": 50, "event": "purge", "fraction": 0.5}
+    {"step": 60, "event": "shock", "factor": 0.7}
+
+"step" counts completed steps: an entry at step s applies after s steps
+and before step s + 1, so row s of model_data is the first to show it.
+"every" repeats an entry up to "until" (exclusive) or the end of the run.
+A ramp moves a parameter linearly from its value at "step" to the target
+at "until". Parameter changes go through the model's set_params(); an
+event calls the model method of that name, which must be listed in the
+model's EVENTS, with the entry's other keys as arguments.
+
+run_schedule() runs the model in chunks between scheduled steps, so the
+step loop itself is untouched and steps without an intervention cost
+nothing extra. The batched MotivationModel applies every change to all of
+its replicates in one array operation, so its ensembles stay vectorized.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field, is_dataclass
+from typing import Dict, List, Optional, Sequence
+
+# Keys of an entry that are not event arguments
+_TIMING_KEYS = ("step", "every", "until")
+_ACTION_KEYS = ("set", "ramp", "event")
+
+
+@dataclass
+class Action:
+    """
+    One scheduled intervention at one step.
+
+    Attributes:
+        step: Completed steps after which it applies
+        params: Parameter values to set
+        event: Name of the model event to apply
+        arguments: Event arguments
+        ramps: Ramped parameters (name -> (start step, end step, target))
+    """
+    step: int
+    params: Dict = field(default_factory=dict)
+    event: Optional[str] = None
+    arguments: Dict = field(default_factory=dict)
+    ramps: Dict = field(default_factory=dict)
+
+
+def _current_value(model, name: str):
+    """Current value of a model parameter (batched models keep them in model.params)."""
+    params = getattr(model, "params", None)
+    source = params if is_dataclass(params) else model
+    if name.startswith("_") or not hasattr(source, name):
+        raise ValueError(f"Cannot change parameter: {name}")
+    return getattr(source, name)
+
+
+def _entry_steps(entry: dict, end: int) -> range:
+    """Steps at which an entry applies."""
+    start = int(entry["step"])
+    until = int(entry.get("until", end))
+    if "every" in entry:
+        every = int(entry["every"])
+        if every <= 0:
+            raise ValueError(f"every must be positive: {entry}")
+        return range(start, min(until, end), every)
+    return range(start, start + 1)
+
+
+def compile_schedule(schedule: Sequence[dict], model,
+                     end: int) -> Dict[int, List[Action]]:
+    """
+    Check a schedule against a model and expand it into actions by step.
+
+    Args:
+        schedule: Schedule entries (see module docstring)
+        model: Model the schedule will run on
+        end: Step at which the run ends; repeats and ramps stop there
+
+    Returns:
+        Dict mapping step to its actions, in schedule order
+    """
+    actions = defaultdict(list)
+    for entry in schedule:
+        if "step" not in entry:
+            raise ValueError(f"Schedule entry without a step: {entry}")
+        kinds = [key for key in _ACTION_KEYS if key in entry]
+        if len(kinds) != 1:
+            raise ValueError(f"Schedule entry needs exactly one of {_ACTION_KEYS}: "
+                             f"{entry}")
+        kind = kinds[0]
+        extra = set(entry) - set(_TIMING_KEYS) - {kind}
+
+        if kind == "event":
+            name = entry["event"]
+            if name not in getattr(model, "EVENTS", ()):
+                raise ValueError(f"{type(model).__name__} has no event: {name}")
+            arguments = {key: entry[key] for key in extra}
+            for step in _entry_steps(entry, end):
+                actions[step].append(Action(step, event=name, arguments=arguments))
+            continue
+
+        if extra:
+            raise ValueError(f"Unknown schedule keys {sorted(extra)}: {entry}")
+        if not hasattr(model, "set_params"):
+            raise ValueError(f"{type(model).__name__} does not support parameter "
+                             "changes")
+        for name in entry[kind]:
+            _current_value(model, name)
+
+        if kind == "set":
+            for step in _entry_steps(entry, end):
+                actions[step].append(Action(step, params=dict(entry["set"])))
+        else:
+            if "until" not in entry or "every" in entry:
+                raise ValueError(f"A ramp needs until (and no every): {entry}")
+            start, until = int(entry["step"]), int(entry["until"])
+            ramps = {name: (start, until, target)
+                     for name, target in entry["ramp"].items()}
+            for step in range(start, min(until + 1, end)):
+                actions[step].append(Action(step, ramps=ramps))
+    return dict(actions)
+
+
+def apply_actions(model, actions: List[Action], ramp_starts: dict) -> None:
+    """
+    Apply one step's actions to a model.
+
+    ramp_starts holds each ramp's starting value, read from the model at
+    the ramp's first step and shared by its later steps.
+    """
+    for action in actions:
+        if action.event is not None:
+            getattr(model, action.event)(**action.arguments)
+            continue
+        params = dict(action.params)
+        for name, (start, until, target) in action.ramps.items():
+            key = (name, start, until)
+            if key not in ramp_starts:
+                ramp_starts[key] = _current_value(model, name)
+            initial = ramp_starts[key]
+            elapsed, duration = action.step - start, max(until - start, 1)
+            params[name] = initial + (target - initial) * elapsed / duration
+        model.set_params(**params)
+
+
+def run_schedule(model, n_steps: int,
+                 schedule: Optional[Sequence[dict]] = None) -> None:
+    """
+    Run a model for n_steps, applying a schedule on the way.
+
+    Steps are counted from the model's current step count, so a schedule
+    can continue a restored snapshot (abm/snapshot.py). Without a schedule
+    this is model.run(n_steps).
+    """
+    if not schedule:
+        model.run(n_steps)
+        return
+
+    current = model.steps
+    end = current + n_steps
+    actions = compile_schedule(schedule, model, end)
+    ramp_starts = {}
+    for step in sorted(s for s in actions if current <= s < end):
+        if step > current:
+            model.run(step - current)
+            current = step
+        apply_actions(model, actions[step], ramp_starts)
+    if end > current:
+        model.run(end - current)
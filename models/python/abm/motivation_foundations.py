@@ -0,0 +1,459 @@
+"""
+Motivation Foundations Model (Array Implementation)
+
+Python port of the Go motivation model in models/go/motivation/. Tests the
+hypothesis that sustainable cooperation requires soteriological foundations
+rather than purely institutional cultivation of motivation.
+
+Two motivation sources:
+1. Institutional M_i: Derived from collective-choice, reputation, social pressure
+   - Decays when institution degrades (corruption spreads)
+   - Degraded by scale beyond the Dunbar-like optimal group size
+2. Soteriological M_i: Derived from transcendent values
+   - Independent of institutional state and scale
+   - May increase under adversity (martyrdom/witness effect)
+
+All replications are simulated together: agent state is held in
+(replications x agents) arrays and every step is a batch of vector
+operations, mirroring the Go Simulate loop (which already updates agents
+against the cooperation rate at the start of the step). Intervention
+schedules (abm/interventions.py) change parameters or apply shocks to
+every replication at once.
+"""
+
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .interventions import run_schedule
+
+
+@dataclass
+class MotivationParams:
+    """Simulation parameters (field names match the Go SimParams JSON)."""
+    n_agents: int = 1000
+    n_steps: int = 500
+
+    # Motivation parameters
+    base_motivation_mean: float = 0.3
+    base_motivation_std: float = 0.15
+
+    # Institutional motivation
+    institutional_boost_max: float = 0.8
+    institutional_decay_rate: float = 0.05    # -inst-decay
+    institutional_growth_rate: float = 0.02   # -inst-growth
+    corruption_threshold: float = 0.5         # -corrupt-threshold
+
+    # Soteriological motivation
+    soteriological_fraction: float = 0.0      # -soterio-frac
+    soteriological_core_mean: float = 0.8     # -soterio-mean
+    soteriological_core_std: float = 0.2
+    adversity_boost_rate: float = 0.5
+    max_adversity_boost: float = 0.3
+
+    # Cooperation dynamics
+    cooperation_cost: float = 1.0             # -cost
+    benefit_multiplier: float = 2.0           # -benefit
+    network_strength: float = 0.3             # -network
+    decision_noise: float = 0.1
+
+    # Critical threshold
+    theta_crit: float = 0.4
+
+    # Exogenous shocks
+    shock_probability: float = 0.0            # -shock-prob
+    shock_magnitude: float = 0.5              # -shock-mag
+
+    # Scale effects (Dunbar to intergalactic)
+    optimal_scale: float = 150.0              # -optimal-scale
+    scale_decay_rate: float = 1.0             # -scale-decay
+    enable_scale_effects: bool = False        # -scale-effects
+
+
+def scale_effect_multiplier(n: int, optimal_scale: float, decay_rate: float) -> float:
+    """
+    How much institutional mechanisms are degraded by scale.
+
+    Geometric mean of monitoring effectiveness, reputation reliability over
+    gossip chains, social pressure and free-rider detection, raised to the
+    decay rate. Returns 1.0 up to the optimal scale.
+    """
+    if n <= optimal_scale:
+        return 1.0
+
+    ratio = optimal_scale / n
+
+    monitoring_eff = ratio
+    chain_length = np.log(n / optimal_scale) / np.log(2)  # binary tree approximation
+    reputation_reliability = 0.9 ** chain_length
+    social_pressure = ratio
+    detection_prob = ratio
+
+    combined = (
+        monitoring_eff * reputation_reliability * social_pressure * detection_prob
+    ) ** 0.25
+
+    return combined ** decay_rate
+
+
+class MotivationModel:
+    """
+    Batched model of institutional vs soteriological motivation.
+
+    Args:
+        params: Simulation parameters
+        n_replications: Number of independent replications run together
+        seed: Random seed
+    """
+
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("shock",)
+
+    def __init__(
+        self,
+        params: MotivationParams = None,
+        n_replications: int = 1,
+        seed: Optional[int] = None
+    ):
+        self.params = params or MotivationParams()
+        self.n_replications = n_replications
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+
+        p = self.params
+        shape = (n_replications, p.n_agents)
+
+        self._scale_parameters()
+
+        # Agents [0, n_soteriological) have a soteriological foundation
+        n_soteriological = int(p.n_agents * p.soteriological_fraction)
+        self.soteriological = np.zeros(p.n_agents, dtype=bool)
+        self.soteriological[:n_soteriological] = True
+        institutional = ~self.soteriological
+
+        self.base_motivation = np.maximum(
+            0.1, self.rng.normal(p.base_motivation_mean, p.base_motivation_std, shape)
+        )
+        self.soteriological_core = np.where(
+            self.soteriological,
+            np.maximum(
+                0.1,
+                self.rng.normal(p.soteriological_core_mean, p.soteriological_core_std,
+                                shape)
+            ),
+            0.0
+        )
+        # Institutional agents start with half of the (scale-degraded) boost
+        self.institutional_boost = np.where(
+            institutional, np.full(shape, self.effective_boost_max * 0.5), 0.0
+        )
+        self.effective_motivation = (
+            self.base_motivation + self.soteriological_core + self.institutional_boost
+        )
+        # Soteriological agents start cooperating, institutional ones at random
+        self.cooperating = self.soteriological | (self.rng.random(shape) < 0.5)
+
+        self.cooperation_rates = []
+        self.mean_motivations = []
+        self.collapse_step = np.full(n_replications, p.n_steps)
+
+    def _scale_parameters(self) -> None:
+        """Scale effect on institutional mechanisms and the parameters it degrades."""
+        p = self.params
+        self.scale_mult = 1.0
+        if p.enable_scale_effects:
+            self.scale_mult = scale_effect_multiplier(
+                p.n_agents, p.optimal_scale, p.scale_decay_rate
+            )
+
+        self.effective_boost_max = p.institutional_boost_max * self.scale_mult
+        self.effective_network_strength = p.network_strength * self.scale_mult
+        self.effective_growth_rate = p.institutional_growth_rate * self.scale_mult
+
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of all replications (e.g. at an intervention).
+
+        The population (n_agents, soteriological_fraction) and the run
+        length are fixed.
+        """
+        known = {f.name for f in fields(MotivationParams)}
+        fixed = ("n_agents", "n_steps", "soteriological_fraction")
+        for name in params:
+            if name in fixed or name not in known:
+                raise ValueError(f"Cannot change parameter: {name}")
+        self.params = replace(self.params, **params)
+        self._scale_parameters()
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Multiply the institutional boost of a random fraction of agents by factor."""
+        hit = self.rng.random(self.institutional_boost.shape) < fraction
+        self.institutional_boost[hit] *= factor
+
+    def step(self):
+        """Advance all replications by one step."""
+        p = self.params
+        institutional = ~self.soteriological
+
+        theta = self.cooperating.mean(axis=1)
+        self.cooperation_rates.append(theta)
+        self.mean_motivations.append(self.effective_motivation.mean(axis=1))
+
+        # Institutional health = cooperation rate (simplified)
+        health = theta[:, None]
+
+        # Check for collapse
+        collapsed = (theta < p.theta_crit) & (self.collapse_step == p.n_steps)
+        self.collapse_step[collapsed] = self.steps
+
+        # Exogenous shock hits institutional agents of affected replications.
+        # The Go model also forces defection with probability shock_magnitude
+        # here, but the decision below overwrites cooperation in the same
+        # step, so only the loss of institutional boost carries forward.
+        if p.shock_probability > 0:
+            shocked = self.rng.random(self.n_replications) < p.shock_probability
+            self.institutional_boost[shocked[:, None] & institutional] *= (
+                1 - p.shock_magnitude
+            )
+
+        degrading = health < p.corruption_threshold
+
+        # Institutional motivation depends on institutional health
+        self.institutional_boost = np.where(
+            institutional & degrading,
+            self.institutional_boost * (1 - p.institutional_decay_rate),
+            np.where(
+                institutional,
+                np.minimum(
+                    self.effective_boost_max,
+                    self.institutional_boost * (1 + self.effective_growth_rate)
+                ),
+                0.0
+            )
+        )
+
+        # Soteriological motivation strengthens under adversity (up to a point)
+        adversity_boost = np.where(
+            self.soteriological & degrading,
+            np.minimum(
+                p.adversity_boost_rate * (p.corruption_threshold - health),
+                p.max_adversity_boost
+            ),
+            0.0
+        )
+
+        self.effective_motivation = (
+            self.base_motivation
+            + self.institutional_boost
+            + self.soteriological_core
+            + adversity_boost
+        )
+
+        # Cooperate if M_i + network_effect + noise > c - beta*theta
+        threshold = p.cooperation_cost - p.benefit_multiplier * health
+        # Network effects degraded by scale for institutional agents only
+        network_strength = np.where(
+            self.soteriological, p.network_strength, self.effective_network_strength
+        )
+        noise = self.rng.normal(0, p.decision_noise, self.cooperating.shape)
+        self.cooperating = (
+            self.effective_motivation + network_strength * health + noise > threshold
+        )
+
+        self.steps += 1
+
+    def run(self, steps: int = None) -> None:
+        """Run model for specified steps (default: params.n_steps)."""
+        if steps is None:
+            steps = self.params.n_steps
+        for _ in range(steps):
+            self.step()
+
+
+def simulate(
+    params: MotivationParams = None,
+    n_replications: int = 50,
+    seed: Optional[int] = None,
+    schedule: Optional[Sequence[dict]] = None
+) -> dict:
+    """
+    Run all replications of a configuration as one batched simulation.
+
+    schedule lists interventions (see abm/interventions.py), applied to all
+    replications at once.
+
+    Returns:
+        Dictionary with per-replication final cooperation rates, stability
+        flags and collapse steps, cooperation rate time series
+        (steps x replications) and summary statistics.
+    """
+    model = MotivationModel(params, n_replications=n_replications, seed=seed)
+    run_schedule(model, model.params.n_steps, schedule)
+
+    p = model.params
+    rates = np.array(model.cooperation_rates)
+
+    # Stable if above threshold for the last 10% of steps
+    stable_window = p.n_steps // 10
+    stable = np.all(rates[p.n_steps - stable_window:] >= p.theta_crit, axis=0)
+
+    results = {
+        "final_cooperation_rate": rates[-1],
+        "stable_cooperation": stable,
+        "collapse_step": model.collapse_step,
+        "cooperation_rates": rates,
+        "mean_motivations": np.array(model.mean_motivations),
+        "scale_multiplier": model.scale_mult,
+        "params": asdict(p),
+    }
+    results["stats"] = compute_statistics(results)
+    return results
+
+
+def compute_statistics(results: dict) -> dict:
+    """Summary statistics over replications (as in the Go output)."""
+    final = np.asarray(results["final_cooperation_rate"], dtype=float)
+    if final.size == 0:
+        return {"mean_coop_rate": 0.0, "std_coop_rate": 0.0,
+                "stable_rate": 0.0, "mean_collapse_cycle": 0.0}
+
+    return {
+        "mean_coop_rate": float(np.mean(final)),
+        "std_coop_rate": float(np.std(final)),
+        "stable_rate": float(np.mean(results["stable_cooperation"])),
+        "mean_collapse_cycle": float(np.mean(results["collapse_step"])),
+    }
+
+
+def run_experiment(
+    config_path: str = None,
+    n_replications: int = 50,
+    seed: Optional[int] = None,
+    **kwargs
+) -> dict:
+    """
+    Run a motivation foundations experiment.
+
+    Args:
+        config_path: Path to YAML config file
+        n_replications: Replications simulated as one batch
+        seed: Random seed
+        **kwargs: MotivationParams fields, and schedule (interventions, see
+            abm/interventions.py)
+
+    Returns:
+        Dictionary with simulate() results plus 'config'
+    """
+    if config_path:
+        import yaml  # only needed for config files
+
+        with open(config_path) as f:
+            config = yaml.safe_load(f)
+    else:
+        config = {}
+
+    config.update(kwargs)
+    schedule = config.pop("schedule", None)
+
+    known = {f.name for f in fields(MotivationParams)}
+    unknown = set(config) - known
+    if unknown:
+        raise ValueError(f"Unknown motivation parameters: {sorted(unknown)}")
+
+    results = simulate(MotivationParams(**config), n_replications=n_replications,
+                       seed=seed, schedule=schedule)
+    results["config"] = config
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Run motivation foundations model (array port of Go motivation)"
+    )
+    parser.add_argument("-n", "--agents", type=int, default=1000,
+                        help="Number of agents")
+    parser.add_argument("--steps", type=int, default=500,
+                        help="Number of steps (time horizon)")
+    parser.add_argument("--reps", type=int, default=50, help="Number of replications")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--soterio-frac", type=float, default=0.0,
+                        help="Fraction with soteriological foundation")
+    parser.add_argument("--soterio-mean", type=float, default=0.8,
+                        help="Mean soteriological core motivation")
+    parser.add_argument("--inst-decay", type=float, default=0.05,
+                        help="Institutional boost decay rate")
+    parser.add_argument("--inst-growth", type=float, default=0.02,
+                        help="Institutional boost growth rate")
+    parser.add_argument("--corrupt-threshold", type=float, default=0.5,
+                        help="Corruption threshold for decay")
+    parser.add_argument("--shock-prob", type=float, default=0.0,
+                        help="Probability of shock each step")
+    parser.add_argument("--shock-mag", type=float, default=0.5,
+                        help="Shock magnitude (fraction of institutional boost lost)")
+    parser.add_argument("--cost", type=float, default=1.0, help="Cooperation cost")
+    parser.add_argument("--benefit", type=float, default=2.0,
+                        help="Benefit multiplier from cooperation")
+    parser.add_argument("--network", type=float, default=0.3, help="Network strength")
+    parser.add_argument("--scale-effects", action="store_true",
+                        help="Enable scale-dependent degradation")
+    parser.add_argument("--optimal-scale", type=float, default=150.0,
+                        help="Dunbar-like optimal group size")
+    parser.add_argument("--scale-decay", type=float, default=1.0,
+                        help="Scale degradation rate")
+    parser.add_argument("--json", type=str, help="Output JSON file path")
+
+    args = parser.parse_args()
+
+    params = MotivationParams(
+        n_agents=args.agents,
+        n_steps=args.steps,
+        institutional_decay_rate=args.inst_decay,
+        institutional_growth_rate=args.inst_growth,
+        corruption_threshold=args.corrupt_threshold,
+        soteriological_fraction=args.soterio_frac,
+        soteriological_core_mean=args.soterio_mean,
+        cooperation_cost=args.cost,
+        benefit_multiplier=args.benefit,
+        network_strength=args.network,
+        shock_probability=args.shock_prob,
+        shock_magnitude=args.shock_mag,
+        enable_scale_effects=args.scale_effects,
+        optimal_scale=args.optimal_scale,
+        scale_decay_rate=args.scale_decay,
+    )
+
+    print(f"Running {args.reps} replications (batched)...")
+    print(f"Agents: {params.n_agents}, Steps: {params.n_steps}")
+    print(f"Soteriological fraction: {params.soteriological_fraction:.0%}")
+    print(f"Institutional decay: {params.institutional_decay_rate:.0%}, "
+          f"growth: {params.institutional_growth_rate:.0%}")
+    if params.shock_probability > 0:
+        print(f"Shock probability: {params.shock_probability:.1%}, "
+              f"magnitude: {params.shock_magnitude:.0%}")
+    if params.enable_scale_effects:
+        mult = scale_effect_multiplier(params.n_agents, params.optimal_scale,
+                                       params.scale_decay_rate)
+        print(f"Scale effects enabled: optimal={params.optimal_scale:.0f}, "
+              f"decay={params.scale_decay_rate:.1f}, multiplier={mult:.3f}")
+
+    start = time.perf_counter()
+    results = simulate(params, n_replications=args.reps, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    s = results["stats"]
+    print(f"\nCompleted in {elapsed:.2f}s")
+    print("\n=== Results ===")
+    print(f"Final cooperation rate: {s['mean_coop_rate']:.1%} "
+          f"(std: {s['std_coop_rate']:.1%})")
+    print(f"Stable cooperation rate: {s['stable_rate']:.1%}")
+    print(f"Mean cycles to collapse: {s['mean_collapse_cycle']:.0f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"params": results["params"], "stats": s}, f, indent=2)
+        print(f"Statistics written to {args.json}")
@@ -0,0 +1,388 @@
+"""
+Scale-Dependent Polycentric Governance Model (Array Implementation)
+
+Python port of the Go Ostrom model in models/go/ostrom/, including its
+scale-dependent degradation effects. Participant state for all replications
+is held in (replications x participants) NumPy arrays, so a single step of a
+million-participant population is a handful of vector operations.
+
+Scale effects modeled (as in the Go implementation):
+1. Peer monitoring effectiveness decreases with group size
+2. Social pressure diffuses with group size
+3. Collective-choice stakes diffuse with group size
+
+Each effect is a multiplier exp(-decay * (size - optimal) / optimal) applied
+once a group grows beyond the optimal (Dunbar-ish) size.
+
+The Go model activates participants one at a time in random order, so each
+sees the group corruption rate left by those before it. Here all
+participants decide against the group rates at the start of the step
+(synchronous update), which is what makes the model vectorizable.
+"""
+
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class OstromScaleParams:
+    """Simulation parameters (field names match the Go SimParams JSON)."""
+    n_participants: int = 100
+    n_groups: int = 5
+    n_steps: int = 200
+
+    # Ostrom principles toggles
+    ostrom_monitoring: bool = True
+    graduated_sanctions: bool = True
+    collective_choice: bool = True
+
+    # Scale effect parameters
+    scale_effects: bool = True
+    monitoring_decay_rate: float = 0.5
+    social_pressure_decay: float = 0.3
+    optimal_group_size: float = 20.0
+
+    # Base parameters
+    base_detection_prob: float = 0.2
+    vigilance_factor: float = 0.4
+    sanction_base: float = 0.5
+    social_pressure_factor: float = 0.3
+    corruption_gain: float = 2.0
+    stake_factor: float = 0.2
+    integrity_weight: float = 0.1
+    integrity_mean: float = 5.0
+    integrity_std: float = 1.0
+    integrity_decay_rate: float = 0.05
+    integrity_recovery_rate: float = 0.1
+
+
+def scale_effect_multiplier(
+    group_size: np.ndarray,
+    optimal_size: float,
+    decay_rate: float
+) -> np.ndarray:
+    """
+    Degradation multiplier based on group size.
+
+    Returns 1.0 up to the optimal size, decaying exponentially beyond it.
+    """
+    excess = np.maximum(0.0, np.asarray(group_size, dtype=float) - optimal_size)
+    return np.exp(-decay_rate * excess / optimal_size)
+
+
+class OstromScaleModel:
+    """
+    Batched array model of polycentric governance with scale effects.
+
+    State arrays have shape (n_replications, n_participants). Groups are
+    numbered per replication, so group corruption rates for every group of
+    every replication come from one np.bincount per step.
+
+    Args:
+        params: Simulation parameters
+        n_replications: Number of independent replications run together
+        seed: Random seed
+    """
+
+    def __init__(
+        self,
+        params: OstromScaleParams = None,
+        n_replications: int = 1,
+        seed: Optional[int] = None
+    ):
+        self.params = params or OstromScaleParams()
+        self.n_replications = n_replications
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+
+        p = self.params
+        shape = (n_replications, p.n_participants)
+
+        # Initialize participants
+        self.integrity = np.maximum(
+            0.1, self.rng.normal(p.integrity_mean, p.integrity_std, shape)
+        )
+        self.base_integrity = self.integrity.copy()
+        self.corrupt = np.zeros(shape, dtype=bool)
+        self.sanctions_received = np.zeros(shape, dtype=np.int64)
+
+        # Flat group index across replications: rep * n_groups + group
+        group_id = np.arange(p.n_participants) % p.n_groups
+        self.group_index = (
+            np.arange(n_replications)[:, None] * p.n_groups + group_id[None, :]
+        )
+        n_flat_groups = n_replications * p.n_groups
+        group_sizes = np.bincount(self.group_index.ravel(), minlength=n_flat_groups)
+        self._group_sizes = np.maximum(group_sizes, 1)
+
+        # Scale multipliers depend only on (fixed) group sizes
+        if p.scale_effects:
+            sizes = group_sizes[self.group_index]
+            self.monitoring_mult = scale_effect_multiplier(
+                sizes, p.optimal_group_size, p.monitoring_decay_rate
+            )
+            self.social_mult = scale_effect_multiplier(
+                sizes, p.optimal_group_size, p.social_pressure_decay
+            )
+        else:
+            self.monitoring_mult = np.ones(shape)
+            self.social_mult = np.ones(shape)
+
+        self.corruption_rates = []
+        self.mean_integrities = []
+
+    def _group_corruption_rates(self) -> np.ndarray:
+        """Corruption rate of each participant's group."""
+        corrupt_counts = np.bincount(
+            self.group_index.ravel(),
+            weights=self.corrupt.ravel(),
+            minlength=len(self._group_sizes)
+        )
+        return (corrupt_counts / self._group_sizes)[self.group_index]
+
+    def step(self):
+        """Advance all replications by one step."""
+        p = self.params
+        group_corruption = self._group_corruption_rates()
+        noise = self.rng.normal(0, 0.1, self.corrupt.shape)
+
+        corrupt = self.corrupt.copy()
+        honest = ~corrupt
+
+        # Corrupt participants: consider reform (only with graduated sanctions)
+        if p.graduated_sanctions:
+            social_pressure = (
+                p.social_pressure_factor * (1.0 - group_corruption) * self.social_mult
+            )
+            continued_gain = p.corruption_gain * 0.9 ** self.sanctions_received
+            integrity_recovery = self.base_integrity * 0.1
+            reforms = corrupt & (
+                social_pressure + integrity_recovery > continued_gain + noise
+            )
+            self.corrupt[reforms] = False
+            self.sanctions_received[reforms] = np.maximum(
+                0, self.sanctions_received[reforms] - 1
+            )
+
+        # Integrity decay if still corrupt
+        still_corrupt = corrupt & self.corrupt
+        self.integrity[still_corrupt] *= (1 - p.integrity_decay_rate)
+        self.sanctions_received[still_corrupt] += 1
+
+        # Honest participants: consider corruption
+        if p.ostrom_monitoring:
+            # Peer monitoring, degraded with group size
+            detection_prob = np.minimum(
+                0.95,
+                (p.base_detection_prob + p.vigilance_factor * group_corruption)
+                * self.monitoring_mult
+            )
+        else:
+            # Hierarchical: detection decreases with corruption
+            detection_prob = p.base_detection_prob * (1 - group_corruption)
+
+        if p.graduated_sanctions:
+            expected_penalty = p.sanction_base * (1 + self.sanctions_received)
+        else:
+            expected_penalty = p.sanction_base * 5
+
+        integrity_cost = self.integrity * p.integrity_weight
+
+        if p.collective_choice:
+            stake_cost = p.stake_factor * (1 - group_corruption) * self.social_mult
+        else:
+            stake_cost = 0.0
+
+        expected_cost = detection_prob * expected_penalty + integrity_cost + stake_cost
+        corrupts = honest & (p.corruption_gain + noise > expected_cost)
+        self.corrupt[corrupts] = True
+
+        # Stayed honest - potential integrity recovery
+        if p.graduated_sanctions:
+            stays_honest = honest & ~corrupts
+            recovery = ((self.base_integrity - self.integrity)
+                        * p.integrity_recovery_rate)
+            self.integrity = np.where(
+                stays_honest,
+                np.minimum(self.base_integrity, self.integrity + recovery),
+                self.integrity
+            )
+
+        self.steps += 1
+        self.corruption_rates.append(self.corrupt.mean(axis=1))
+        self.mean_integrities.append(self.integrity.mean(axis=1))
+
+    def run(self, steps: int = None) -> None:
+        """Run model for specified steps (default: params.n_steps)."""
+        if steps is None:
+            steps = self.params.n_steps
+        for _ in range(steps):
+            self.step()
+
+
+def simulate(
+    params: OstromScaleParams = None,
+    n_replications: int = 10,
+    seed: Optional[int] = None
+) -> dict:
+    """
+    Run all replications of a configuration as one batched simulation.
+
+    Returns:
+        Dictionary with per-replication final corruption rates and mean
+        integrities, corruption rate time series (steps x replications)
+        and summary statistics.
+    """
+    model = OstromScaleModel(params, n_replications=n_replications, seed=seed)
+    model.run()
+
+    final_corruption = model.corrupt.mean(axis=1)
+    return {
+        "final_corruption_rate": final_corruption,
+        "final_mean_integrity": model.integrity.mean(axis=1),
+        "corruption_rates": np.array(model.corruption_rates),
+        "stats": compute_statistics(final_corruption),
+        "params": asdict(model.params),
+    }
+
+
+def compute_statistics(final_corruption_rates: np.ndarray) -> dict:
+    """Mean and std of final corruption rates (as in the Go output)."""
+    rates = np.asarray(final_corruption_rates, dtype=float)
+    if rates.size == 0:
+        return {"mean": 0.0, "std": 0.0}
+    return {"mean": float(np.mean(rates)), "std": float(np.std(rates))}
+
+
+def run_scale_sweep(
+    group_counts: list = None,
+    group_size: int = 20,
+    n_replications: int = 30,
+    n_steps: int = 200,
+    seed: Optional[int] = None,
+    **param_overrides
+) -> list:
+    """
+    Polycentric governance at scale (Python counterpart of `make ostrom-scale`).
+
+    Runs N = groups * group_size participants for each group count, keeping
+    group size fixed while the population grows.
+
+    Returns:
+        List of dicts with n_participants, n_groups, group_size and stats
+    """
+    if group_counts is None:
+        group_counts = [50, 20, 10, 5]
+
+    base = replace(OstromScaleParams(n_steps=n_steps), **param_overrides)
+
+    sweep = []
+    for groups in group_counts:
+        params = replace(base, n_participants=groups * group_size, n_groups=groups)
+        results = simulate(params, n_replications=n_replications, seed=seed)
+        sweep.append({
+            "n_participants": params.n_participants,
+            "n_groups": groups,
+            "group_size": group_size,
+            "stats": results["stats"],
+        })
+
+    return sweep
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Run scale-dependent polycentric governance model "
+                    "(array port of Go ostrom)"
+    )
+    parser.add_argument("--participants", "-n", type=int, default=100,
+                        help="Number of participants")
+    parser.add_argument("--groups", type=int, default=5, help="Number of groups")
+    parser.add_argument("--steps", type=int, default=200, help="Number of steps")
+    parser.add_argument("--reps", type=int, default=10, help="Number of replications")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument("--no-ostrom-monitoring", action="store_true",
+                        help="Disable peer monitoring")
+    parser.add_argument("--no-graduated-sanctions", action="store_true",
+                        help="Disable graduated sanctions")
+    parser.add_argument("--no-collective-choice", action="store_true",
+                        help="Disable collective choice")
+    parser.add_argument("--no-scale-effects", action="store_true",
+                        help="Disable scale-dependent degradation")
+    parser.add_argument("--monitoring-decay", type=float, default=0.5,
+                        help="Monitoring decay rate with group size")
+    parser.add_argument("--social-decay", type=float, default=0.3,
+                        help="Social pressure decay rate")
+    parser.add_argument("--optimal-size", type=float, default=20.0,
+                        help="Optimal group size (Dunbar-ish)")
+    parser.add_argument("--scale-sweep", action="store_true",
+                        help="Run the ostrom-scale sweep (50, 20, 10, 5 groups of 20)")
+    parser.add_argument("--json", type=str, help="Output JSON file path")
+
+    args = parser.parse_args()
+
+    params = OstromScaleParams(
+        n_participants=args.participants,
+        n_groups=args.groups,
+        n_steps=args.steps,
+        ostrom_monitoring=not args.no_ostrom_monitoring,
+        graduated_sanctions=not args.no_graduated_sanctions,
+        collective_choice=not args.no_collective_choice,
+        scale_effects=not args.no_scale_effects,
+        monitoring_decay_rate=args.monitoring_decay,
+        social_pressure_decay=args.social_decay,
+        optimal_group_size=args.optimal_size,
+    )
+
+    start = time.perf_counter()
+
+    if args.scale_sweep:
+        print("=== Ostrom Model Scale Testing ===")
+        print("Testing polycentric governance with scale-dependent degradation")
+        output = run_scale_sweep(
+            group_size=20,
+            n_replications=args.reps,
+            n_steps=args.steps,
+            seed=args.seed,
+            scale_effects=params.scale_effects,
+            optimal_group_size=params.optimal_group_size,
+            monitoring_decay_rate=params.monitoring_decay_rate,
+            social_pressure_decay=params.social_pressure_decay,
+        )
+        for row in output:
+            stats = row["stats"]
+            print(f"\nN={row['n_participants']} "
+                  f"({row['n_groups']} groups of {row['group_size']}):")
+            print(f"  Corruption rate: {stats['mean']:.1%} (std: {stats['std']:.1%})")
+    else:
+        group_size = params.n_participants // params.n_groups
+        print(f"Running {args.reps} replications (batched)...")
+        print(f"Participants: {params.n_participants}, Groups: {params.n_groups}, "
+              f"Group size: {group_size}")
+        print(f"Ostrom: monitoring={params.ostrom_monitoring}, "
+              f"sanctions={params.graduated_sanctions}, "
+              f"choice={params.collective_choice}")
+        if params.scale_effects:
+            print(f"Scale effects: optimal_size={params.optimal_group_size:.0f}, "
+                  f"monitoring_decay={params.monitoring_decay_rate:.2f}, "
+                  f"social_decay={params.social_pressure_decay:.2f}")
+
+        results = simulate(params, n_replications=args.reps, seed=args.seed)
+        output = {"params": results["params"], "stats": results["stats"]}
+
+        print("\n=== Results ===")
+        stats = results["stats"]
+        print(f"Corruption rate: {stats['mean']:.1%} (std: {stats['std']:.1%})")
+
+    print(f"\nCompleted in {time.perf_counter() - start:.2f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"Statistics written to {args.json}")
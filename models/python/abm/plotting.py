@@ -0,0 +1,410 @@
+"""
+Plotting for the ABM Command-Line Runs
+
+Figures produced by the abm/* command-line entry points. Kept apart from the
+simulation modules so that importing a model (in sweep workers, benchmarks
+or a CLI run with --no-plot) does not load matplotlib.
+
+Each function saves to output_path when given and shows the figure otherwise.
+
+Bifurcation plots with many runs are drawn as a per-rate density image with
+quantile ribbons (draw_bifurcation_runs) instead of one marker per run, so
+rendering time and file size do not grow with the replicate count.
+Replicate ensembles (abm/ensemble.py) are drawn the same way, as the mean
+per step with quantile ribbons or a standard-deviation band.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Above this many runs, mode="auto" draws a density image instead of a scatter
+DENSITY_THRESHOLD = 5000
+
+# Quantile bands drawn as ribbons in density mode (outer to inner) and the median
+RIBBON_QUANTILES = [(0.1, 0.9), (0.25, 0.75)]
+
+
+def _finish(fig, output_path: str = None):
+    """Save (and close) or show a finished figure."""
+    fig.tight_layout()
+
+    if output_path:
+        fig.savefig(output_path, dpi=150)
+        plt.close(fig)
+    else:
+        plt.show()
+
+
+def plot_corruption_dynamics(results: dict, output_path: str = None):
+    """Four-panel summary of a corruption_dynamics.run_experiment result."""
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+
+    # Corruption rate over time
+    ax = axes[0, 0]
+    ax.plot(results["model_data"]["Corruption_Rate"])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Corruption Rate")
+    ax.set_title("Corruption Rate Over Time")
+    ax.axhline(y=0.5, color='r', linestyle='--', alpha=0.5, label="50% threshold")
+    ax.legend()
+
+    # Mean integrity over time
+    ax = axes[0, 1]
+    ax.plot(results["model_data"]["Mean_Integrity"])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Mean Integrity")
+    ax.set_title("Mean Integrity Over Time")
+
+    # Total extractions over time
+    ax = axes[1, 0]
+    ax.plot(results["model_data"]["Total_Extractions"])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Cumulative Extractions")
+    ax.set_title("Total Extraction Events")
+
+    # Number of corrupted agents
+    ax = axes[1, 1]
+    ax.plot(results["model_data"]["Corrupted_Agents"])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Number Corrupted")
+    ax.set_title("Corrupted Agents Over Time")
+
+    _finish(fig, output_path)
+
+
+def plot_cooperation_dynamics(results: dict, output_path: str = None):
+    """Four-panel summary of a cooperation_threshold.run_experiment result."""
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+
+    # Cooperation rate over time
+    ax = axes[0, 0]
+    ax.plot(results["model_data"]["Cooperation_Rate"])
+    ax.axhline(y=results["theta_crit"], color='r', linestyle='--',
+               label=f"θ_crit = {results['theta_crit']:.2f}")
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Cooperation Rate")
+    ax.set_title("Cooperation Rate Over Time")
+    ax.legend()
+
+    # Mean motivation over time
+    ax = axes[0, 1]
+    ax.plot(results["model_data"]["Mean_Motivation"])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Mean Motivation")
+    ax.set_title("Mean Motivation Over Time")
+
+    # Agent-level panels need agent data (the mean-field engine has none)
+    if results["agent_data"].empty:
+        for ax in axes[1]:
+            ax.axis("off")
+        _finish(fig, output_path)
+        return
+
+    # Final motivation distribution
+    ax = axes[1, 0]
+    final_step = results["agent_data"].index.get_level_values(0).max()
+    final_motivations = results["agent_data"].loc[final_step, "Motivation"]
+    ax.hist(final_motivations, bins=30, edgecolor='black', alpha=0.7)
+    ax.axvline(x=results["config"].get("cooperation_cost", 1.0), color='r',
+               linestyle='--',
+               label=f"Cost c = {results['config'].get('cooperation_cost', 1.0)}")
+    ax.set_xlabel("Motivation")
+    ax.set_ylabel("Count")
+    ax.set_title("Final Motivation Distribution")
+    ax.legend()
+
+    # Cooperation status by motivation
+    ax = axes[1, 1]
+    final_coop = results["agent_data"].loc[final_step, "Cooperating"]
+    cooperators = final_motivations[final_coop == True]
+    defectors = final_motivations[final_coop == False]
+    ax.hist([cooperators, defectors], bins=20, label=["Cooperators", "Defectors"],
+            edgecolor='black', alpha=0.7)
+    ax.set_xlabel("Motivation")
+    ax.set_ylabel("Count")
+    ax.set_title("Motivation by Cooperation Status")
+    ax.legend()
+
+    _finish(fig, output_path)
+
+
+def _rate_edges(values: np.ndarray, max_columns: int = 200) -> np.ndarray:
+    """
+    Bin edges along the initial-rate axis.
+
+    Go and Python sweeps use a small set of discrete initial rates; these
+    get one column each (edges halfway between neighbours). Continuous
+    rates fall back to max_columns uniform bins.
+    """
+    unique = np.unique(values)
+    if len(unique) == 1:
+        return np.array([unique[0] - 0.5 / max_columns, unique[0] + 0.5 / max_columns])
+    if len(unique) <= max_columns:
+        mids = (unique[1:] + unique[:-1]) / 2
+        return np.concatenate([[2 * unique[0] - mids[0]], mids,
+                               [2 * unique[-1] - mids[-1]]])
+    return np.linspace(unique[0], unique[-1], max_columns + 1)
+
+
+def bifurcation_density(initial_rates, final_rates, y_bins: int = 100) -> tuple:
+    """
+    Bin runs into a 2-D histogram normalized per initial-rate column.
+
+    Returns:
+        (x_edges, y_edges, density) where density[i, j] is the fraction of
+        runs in initial-rate column i whose final rate falls in bin j
+    """
+    x = np.asarray(initial_rates, dtype=float)
+    y = np.asarray(final_rates, dtype=float)
+    x_edges = _rate_edges(x)
+    y_edges = np.linspace(0, 1, y_bins + 1)
+
+    counts, _, _ = np.histogram2d(x, np.clip(y, 0, 1), bins=[x_edges, y_edges])
+    totals = counts.sum(axis=1, keepdims=True)
+    density = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+    return x_edges, y_edges, density
+
+
+def bifurcation_quantiles(initial_rates, final_rates, x_edges: np.ndarray,
+                          quantiles: list) -> tuple:
+    """
+    Quantiles of the final rate within each initial-rate column.
+
+    One lexsort by (column, final rate) serves every quantile; empty
+    columns give NaN.
+
+    Returns:
+        (x_centers, values) with values of shape (len(quantiles), n_columns)
+    """
+    x = np.asarray(initial_rates, dtype=float)
+    y = np.asarray(final_rates, dtype=float)
+    n_columns = len(x_edges) - 1
+
+    column = np.clip(np.searchsorted(x_edges, x, side="right") - 1, 0, n_columns - 1)
+    sorted_y = y[np.lexsort((y, column))]
+    counts = np.bincount(column, minlength=n_columns)
+    starts = np.cumsum(counts) - counts
+
+    values = np.full((len(quantiles), n_columns), np.nan)
+    filled = counts > 0
+    for i, q in enumerate(quantiles):
+        pos = starts[filled] + q * (counts[filled] - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.ceil(pos).astype(int)
+        values[i, filled] = sorted_y[lo] + (pos - lo) * (sorted_y[hi] - sorted_y[lo])
+
+    return (x_edges[1:] + x_edges[:-1]) / 2, values
+
+
+def draw_bifurcation_runs(ax, initial_rates, final_rates, mode: str = "auto",
+                          ribbons: bool = None):
+    """
+    Draw (initial rate, final rate) pairs of a bifurcation analysis.
+
+    Args:
+        ax: Matplotlib axes
+        initial_rates: Initial cooperation rate of each run
+        final_rates: Final cooperation rate of each run
+        mode: "scatter" (one marker per run), "density" (per-rate histogram
+            image), "hexbin", or "auto" (density above DENSITY_THRESHOLD runs)
+        ribbons: Draw the median and quantile ribbons (default: on for
+            density and hexbin)
+
+    Returns:
+        The image artist for a colorbar, or None in scatter mode
+    """
+    initial_rates = np.asarray(initial_rates, dtype=float)
+    final_rates = np.asarray(final_rates, dtype=float)
+
+    if mode == "auto":
+        mode = "density" if len(initial_rates) > DENSITY_THRESHOLD else "scatter"
+    if ribbons is None:
+        ribbons = mode != "scatter"
+
+    artist = None
+    if mode == "scatter":
+        ax.scatter(initial_rates, final_rates, alpha=0.5, s=20)
+    elif mode == "density":
+        x_edges, y_edges, density = bifurcation_density(initial_rates, final_rates)
+        artist = ax.pcolormesh(x_edges, y_edges, density.T, cmap="Blues",
+                               vmin=0, rasterized=True)
+    elif mode == "hexbin":
+        artist = ax.hexbin(initial_rates, final_rates, gridsize=60, bins="log",
+                           mincnt=1, cmap="Blues", extent=(0, 1, 0, 1))
+    else:
+        raise ValueError(f"Unknown bifurcation plot mode: {mode}")
+
+    if ribbons and len(initial_rates):
+        x_edges = _rate_edges(initial_rates)
+        flat = [q for band in RIBBON_QUANTILES for q in band] + [0.5]
+        x_centers, values = bifurcation_quantiles(initial_rates, final_rates, x_edges,
+                                                  flat)
+        for i, (q_lo, q_hi) in enumerate(RIBBON_QUANTILES):
+            style = dict(color="tab:orange", linewidth=1,
+                         linestyle="--" if i == 0 else "-")
+            ax.plot(x_centers, values[2 * i], label=f"{q_lo:.0%}-{q_hi:.0%} of runs",
+                    **style)
+            ax.plot(x_centers, values[2 * i + 1], **style)
+        ax.plot(x_centers, values[-1], color="tab:orange", marker="o", markersize=3,
+                label="Median final rate")
+
+    return artist
+
+
+def plot_bifurcation(bifurc: dict, output_path: str = None, mode: str = "auto",
+                     ribbons: bool = None):
+    """
+    Final vs initial cooperation rate from run_bifurcation_analysis.
+
+    See draw_bifurcation_runs for mode and ribbons.
+    """
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    initial_rates = [r["initial_rate"] for r in bifurc["results"]]
+    final_rates = [r["final_rate"] for r in bifurc["results"]]
+
+    artist = draw_bifurcation_runs(ax, initial_rates, final_rates, mode, ribbons)
+    if artist is not None:
+        fig.colorbar(artist, ax=ax,
+                     label="Fraction of runs" if mode != "hexbin" else "Runs")
+    ax.plot([0, 1], [0, 1], 'k--', alpha=0.3, label="No change")
+
+    # Mark critical threshold
+    theta_crit = bifurc["theta_crit"]
+    ax.axvline(x=theta_crit, color='r', linestyle='--',
+               label=f"θ_crit = {theta_crit:.2f}")
+    ax.axhline(y=theta_crit, color='r', linestyle='--', alpha=0.5)
+
+    ax.set_xlabel("Initial Cooperation Rate", fontsize=12)
+    ax.set_ylabel("Final Cooperation Rate", fontsize=12)
+    ax.set_title("Bifurcation Analysis: Critical Mass Threshold", fontsize=14)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    _finish(fig, output_path)
+
+
+def plot_governance_comparison(comparison: dict, output_path: str = None):
+    """Bar chart of final corruption by system (compare_governance_systems output)."""
+    systems = [s for s in comparison if s != "paired_differences"]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    means = [comparison[s]['mean'] for s in systems]
+    stds = [comparison[s]['std'] for s in systems]
+
+    x = range(len(systems))
+    bars = ax.bar(x, means, yerr=stds, capsize=5, alpha=0.7, edgecolor='black')
+
+    # Color code
+    colors = ['#d62728', '#ff7f0e', '#2ca02c']
+    for bar, color in zip(bars, colors):
+        bar.set_facecolor(color)
+
+    ax.set_xticks(x)
+    ax.set_xticklabels(['Hierarchical\n(No Ostrom)',
+                        'Partial Ostrom\n(Peer Monitoring)',
+                        'Full Ostrom\n(All Principles)'])
+    ax.set_ylabel("Final Corruption Rate", fontsize=12)
+    ax.set_title("Corruption Outcomes by Governance System", fontsize=14)
+    ax.set_ylim(0, 1.1)
+    ax.axhline(1.0, color='gray', linestyle='--', alpha=0.5)
+    ax.grid(True, alpha=0.3, axis='y')
+
+    # Add value labels
+    for i, (mean, std) in enumerate(zip(means, stds)):
+        ax.text(i, mean + std + 0.05, f"{mean:.0%}", ha='center', fontsize=10)
+
+    _finish(fig, output_path)
+
+
+def plot_polycentric_dynamics(results: dict, output_path: str = None):
+    """Corruption rate and mean integrity of a polycentric_governance run."""
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+
+    ax = axes[0]
+    ax.plot(results['model_data']['Corruption_Rate'])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Corruption Rate")
+    ax.set_title("Corruption Rate Over Time (Polycentric)")
+    ax.set_ylim(0, 1)
+    ax.grid(True, alpha=0.3)
+
+    ax = axes[1]
+    ax.plot(results['model_data']['Mean_Integrity'])
+    ax.set_xlabel("Step")
+    ax.set_ylabel("Mean Integrity")
+    ax.set_title("Mean Integrity Over Time")
+    ax.grid(True, alpha=0.3)
+
+    _finish(fig, output_path)
+
+
+def draw_ensemble_band(ax, result, column: str, band: str = "quantile",
+                       n_std: float = 1.0, color: str = "tab:blue", label: str = None):
+    """
+    Draw an ensemble reporter as its mean with a band.
+
+    Args:
+        ax: Matplotlib axes
+        result: abm.ensemble.EnsembleResult
+        column: Reporter name
+        band: "quantile" (RIBBON_QUANTILES ribbons, where tracked) or
+            "std" (mean +/- n_std standard deviations)
+        n_std: Band half-width in standard deviations for band="std"
+        color: Line and band color
+        label: Legend label of the mean line (default: "Mean of R runs")
+    """
+    steps = np.arange(len(result.mean))
+    mean = result.mean[column].to_numpy()
+    if band == "std":
+        std = np.nan_to_num(result.std[column].to_numpy())
+        ax.fill_between(steps, mean - n_std * std, mean + n_std * std, color=color,
+                        alpha=0.25, linewidth=0, label=f"±{n_std:g} std")
+    elif band == "quantile":
+        for i, (q_lo, q_hi) in enumerate(RIBBON_QUANTILES):
+            if q_lo not in result.stats.quantiles or q_hi not in result.stats.quantiles:
+                continue
+            ax.fill_between(steps, result.quantile(q_lo)[column],
+                            result.quantile(q_hi)[column],
+                            color=color, alpha=0.15 * (i + 1), linewidth=0,
+                            label=f"{q_lo:.0%}-{q_hi:.0%} of runs")
+    else:
+        raise ValueError(f"Unknown ensemble band: {band}")
+    ax.plot(steps, mean, color=color,
+            label=label or f"Mean of {result.n_replicates} runs")
+
+
+def plot_ensemble(result, output_path: str = None, band: str = "quantile",
+                  columns: list = None, n_std: float = 1.0):
+    """
+    One panel per reporter of an abm.ensemble.EnsembleResult, mean with band.
+
+    Args:
+        result: Ensemble result
+        output_path: Figure path (default: show)
+        band: "quantile" or "std", see draw_ensemble_band
+        columns: Reporters to draw (default: all numeric non-constant ones)
+        n_std: Band half-width for band="std"
+    """
+    if columns is None:
+        spread = result.stats.variance
+        columns = [c for i, c in enumerate(result.columns)
+                   if np.ptp(result.stats.mean[:, i]) > 0
+                   or np.nanmax(spread[:, i], initial=0) > 0]
+    n_cols = min(2, len(columns))
+    n_rows = int(np.ceil(len(columns) / n_cols))
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(6 * n_cols, 4.5 * n_rows),
+                             squeeze=False)
+
+    for ax, column in zip(axes.flat, columns):
+        draw_ensemble_band(ax, result, column, band=band, n_std=n_std)
+        ax.set_xlabel("Step")
+        ax.set_ylabel(column.replace("_", " "))
+        ax.set_title(f"{column.replace('_', ' ')} ({result.model})")
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8)
+    for ax in list(axes.flat)[len(columns):]:
+        ax.axis("off")
+
+    _finish(fig, output_path)
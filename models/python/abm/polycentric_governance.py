@@ -5,6 +5,9 @@ DEPRECATION NOTICE: This Python implementation has been superseded by the Go
 implementation in models/go/ostrom/ which properly implements scale-dependent
 degradation effects. Use `make go-ostrom` or `make ostrom-scale` for production
 simulations. This file is retained for reference and basic testing only.
+For larger populations, `run_experiment(engine="array")` runs the same rules
+on the vectorized PolycentricArrayModel, and python/abm/ostrom_scale.py ports
+the Go model's scale-dependent degradation to Python.
 
 This model tests whether Ostrom's design principles for successful commons
 governance can break the corruption inevitability demonstrated in the
@@ -27,11 +30,17 @@ Ostrom's 8 Design Principles:
 8. Nested enterprises
 """
 
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
 import numpy as np
 from mesa import Agent, Model
 from mesa.datacollection import DataCollector
-from typing import Optional
-import yaml
+
+from .events import EventLog, EventType
+from .interventions import run_schedule
+from .profiling import StepProfiler, format_profile, write_profile
 
 
 class Participant(Agent):
@@ -48,9 +57,11 @@ class Participant(Agent):
         self,
         model: "PolycentricModel",
         integrity: float,
-        group_id: int
+        group_id: int,
+        index: int
     ):
         super().__init__(model)
+        self.index = index
         self.integrity = integrity
         self.base_integrity = integrity
         self.corrupt = False
@@ -116,9 +127,10 @@ class Participant(Agent):
         expected_cost = detection_prob * expected_penalty + integrity_cost + stake_cost
 
         # Corrupt if benefit exceeds cost (with some noise)
-        noise = np.random.normal(0, 0.1)
+        noise = self.model.decision_noise[self.index]
         if expected_benefit + noise > expected_cost:
             self.corrupt = True
+            self.model._record_transition(self, EventType.CORRUPTED)
 
     def _consider_reform(self):
         """
@@ -145,16 +157,17 @@ class Participant(Agent):
         reform_benefit = social_pressure + integrity_recovery
         reform_cost = continued_gain
 
-        if reform_benefit > reform_cost + np.random.normal(0, 0.1):
+        if reform_benefit > reform_cost + self.model.decision_noise[self.index]:
             self.corrupt = False
+            self.model._record_transition(self, EventType.REFORMED)
             self.sanctions_received = max(0, self.sanctions_received - 1)
 
     def _get_group_corruption_rate(self) -> float:
         """Get corruption rate in agent's group."""
-        group_members = [a for a in self.model.agents if a.group_id == self.group_id]
-        if not group_members:
+        group_size = self.model.group_sizes[self.group_id]
+        if group_size == 0:
             return 0.0
-        return sum(1 for a in group_members if a.corrupt) / len(group_members)
+        return self.model.group_corrupt[self.group_id] / group_size
 
     def _update_integrity(self):
         """Update integrity based on behavior and environment."""
@@ -189,6 +202,9 @@ class PolycentricModel(Model):
         seed: Random seed
     """
 
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("purge", "shock")
+
     def __init__(
         self,
         n_participants: int = 100,
@@ -232,6 +248,8 @@ class PolycentricModel(Model):
         self.corruption_gain = corruption_gain
         self.stake_factor = stake_factor
         self.integrity_weight = integrity_weight
+        self.integrity_mean = integrity_mean
+        self.integrity_std = integrity_std
         self.integrity_decay_rate = integrity_decay_rate
         self.integrity_recovery_rate = integrity_recovery_rate
 
@@ -239,12 +257,30 @@ class PolycentricModel(Model):
         for i in range(n_participants):
             integrity = max(0.1, np.random.normal(integrity_mean, integrity_std))
             group_id = i % n_groups  # Distribute across groups
-            Participant(self, integrity, group_id)
+            Participant(self, integrity, group_id, i)
+
+        # Decision noise is drawn once per step and indexed by participant, so
+        # every agent consumes exactly one draw per step regardless of which
+        # decision it faces. Runs sharing a seed therefore share noise per
+        # (step, participant), which keeps governance variants on common
+        # random numbers.
+        self.decision_noise = np.zeros(n_participants)
+
+        # Corruption/reform events. Running totals per group replace
+        # rescanning the group on every decision, and the reform rate is
+        # derived from the events of the last step.
+        self.events = EventLog()
+        self.group_sizes = [0] * n_groups
+        for a in self.agents:
+            self.group_sizes[a.group_id] += 1
+        self.group_corrupt = [0] * n_groups
+        self.n_corrupt = 0
+        self._corrupt_at_step_start = 0
 
         # Data collection
         self.datacollector = DataCollector(
             model_reporters={
-                "Corruption_Rate": lambda m: sum(1 for a in m.agents if a.corrupt) / len(m.agents),
+                "Corruption_Rate": lambda m: self._corruption_rate(),
                 "Mean_Integrity": lambda m: np.mean([a.integrity for a in m.agents]),
                 "Reform_Rate": lambda m: self._reform_rate(),
             },
@@ -256,21 +292,359 @@ class PolycentricModel(Model):
             }
         )
 
+    def set_params(self, **params) -> None:
+        """
+        Change parameters of a running model (e.g. at an intervention).
+
+        Ostrom principles and rates can change; the population and its
+        group structure cannot.
+        """
+        for name, value in params.items():
+            if (name in ("n_participants", "n_groups") or name.startswith("_")
+                    or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+
+    def purge(self, fraction: float = 1.0) -> None:
+        """
+        Replace a random fraction of the corrupt participants with new members.
+
+        Newcomers join the same group with an integrity drawn from the
+        initial distribution and a clean sanction record.
+        """
+        corrupt = [a for a in self.agents if a.corrupt]
+        for agent in self.random.sample(corrupt, round(fraction * len(corrupt))):
+            integrity = np.random.normal(self.integrity_mean, self.integrity_std)
+            agent.integrity = max(0.1, integrity)
+            agent.base_integrity = agent.integrity
+            agent.corrupt = False
+            agent.sanctions_received = 0
+            self.n_corrupt -= 1
+            self.group_corrupt[agent.group_id] -= 1
+            self.events.record(agent.index, EventType.PURGED)
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Multiply the integrity of a random fraction of participants by factor."""
+        for agent in self.random.sample(list(self.agents),
+                                        round(fraction * self.n_participants)):
+            agent.integrity *= factor
+
+    def _record_transition(self, agent: Participant, event_type: EventType) -> None:
+        """Log a corruption or reform and update the running corrupt counts."""
+        delta = 1 if event_type == EventType.CORRUPTED else -1
+        self.n_corrupt += delta
+        self.group_corrupt[agent.group_id] += delta
+        self.events.record(agent.index, event_type)
+
     def _reform_rate(self) -> float:
-        """Placeholder for tracking reforms - would need history."""
-        return 0.0  # TODO: track actual reforms
+        """Share of participants corrupt at the start of the last step who reformed."""
+        if self._corrupt_at_step_start == 0:
+            return 0.0
+        return self.events.step_count(EventType.REFORMED) / self._corrupt_at_step_start
 
     def step(self):
         """Advance model by one step."""
         self.datacollector.collect(self)
+        self.decision_noise = np.random.normal(0, 0.1, self.n_participants)
+        self._corrupt_at_step_start = self.n_corrupt
+        self.events.begin_step(self.steps)
         self.agents.shuffle_do("step")
 
+    def _corruption_rate(self) -> float:
+        """Proportion of participants currently corrupt."""
+        return self.n_corrupt / self.n_participants
+
+    def _mean_integrity(self) -> float:
+        """Average integrity across participants."""
+        return np.mean([a.integrity for a in self.agents])
+
+    def run(self, steps: int = 200) -> None:
+        """Run model for specified steps."""
+        for _ in range(steps):
+            self.step()
+
+
+class PolycentricArrayModel(Model):
+    """
+    Vectorized engine for the polycentric governance model.
+
+    Participant state is held in NumPy arrays instead of Participant agents,
+    and the corruption, reform, sanction and integrity rules of Participant
+    are applied as vector operations.
+
+    As in the agent engine, participants act one after another in a random
+    order and each sees the group corruption rates left by those before it.
+    The order is split into n_chunks consecutive chunks; participants in a
+    chunk decide together against the group counts at the chunk's start,
+    and the counts are updated between chunks. A participant's group rate is
+    then at most about 1/n_chunks out of date. Deciding all participants
+    against the rates at the start of the step instead (a synchronous
+    update) is not equivalent: the whole population overreacts to the same
+    rate and corruption oscillates with period 2 around a higher mean.
+    n_chunks >= n_participants is exactly the agent engine's update.
+
+    Initial integrity and per-step decision noise are drawn from the same
+    stream as PolycentricModel, so both engines start from identical
+    populations for a given seed; the activation order comes from the
+    model's NumPy generator (self.rng), not the agent engine's shuffle.
+
+    Takes the same parameters as PolycentricModel, plus:
+        n_chunks: Sequential chunks per step
+    """
+
+    # Agent-state events for intervention schedules (abm/interventions.py)
+    EVENTS = ("purge", "shock")
+
+    def __init__(
+        self,
+        n_participants: int = 100,
+        n_groups: int = 5,
+        # Ostrom principles
+        ostrom_monitoring: bool = True,
+        graduated_sanctions: bool = True,
+        collective_choice: bool = True,
+        # Monitoring parameters
+        base_detection_prob: float = 0.2,
+        vigilance_factor: float = 0.4,
+        # Sanction parameters
+        sanction_base: float = 0.5,
+        social_pressure_factor: float = 0.3,
+        # Stakes and incentives
+        corruption_gain: float = 2.0,
+        stake_factor: float = 0.2,
+        integrity_weight: float = 0.1,
+        # Integrity dynamics
+        integrity_mean: float = 5.0,
+        integrity_std: float = 1.0,
+        integrity_decay_rate: float = 0.05,
+        integrity_recovery_rate: float = 0.1,
+        n_chunks: int = 32,
+        seed: Optional[int] = None
+    ):
+        super().__init__(seed=seed)
+
+        if seed is not None:
+            np.random.seed(seed)
+
+        # Store parameters
+        self.n_participants = n_participants
+        self.n_groups = n_groups
+        self.ostrom_monitoring = ostrom_monitoring
+        self.graduated_sanctions = graduated_sanctions
+        self.collective_choice = collective_choice
+        self.base_detection_prob = base_detection_prob
+        self.vigilance_factor = vigilance_factor
+        self.sanction_base = sanction_base
+        self.social_pressure_factor = social_pressure_factor
+        self.corruption_gain = corruption_gain
+        self.stake_factor = stake_factor
+        self.integrity_weight = integrity_weight
+        self.integrity_mean = integrity_mean
+        self.integrity_std = integrity_std
+        self.integrity_decay_rate = integrity_decay_rate
+        self.integrity_recovery_rate = integrity_recovery_rate
+        self.n_chunks = n_chunks
+
+        # Participant state (same draws and group layout as PolycentricModel)
+        self.integrity = np.maximum(
+            0.1, np.random.normal(integrity_mean, integrity_std, n_participants)
+        )
+        self.base_integrity = self.integrity.copy()
+        self.corrupt = np.zeros(n_participants, dtype=bool)
+        self.group_id = np.arange(n_participants) % n_groups
+        self.sanctions_received = np.zeros(n_participants, dtype=np.int64)
+        self.group_sizes = np.bincount(self.group_id, minlength=n_groups)
+
+        self.decision_noise = np.zeros(n_participants)
+
+        self.events = EventLog()
+        self._corrupt_at_step_start = 0
+
+        # Data collection
+        self.datacollector = DataCollector(
+            model_reporters={
+                "Corruption_Rate": lambda m: self._corruption_rate(),
+                "Mean_Integrity": lambda m: self._mean_integrity(),
+                "Reform_Rate": lambda m: self._reform_rate(),
+            }
+        )
+
+    def _reform_rate(self) -> float:
+        """Share of participants corrupt at the start of the last step who reformed."""
+        if self._corrupt_at_step_start == 0:
+            return 0.0
+        return self.events.step_count(EventType.REFORMED) / self._corrupt_at_step_start
+
+    def set_params(self, **params) -> None:
+        """Change parameters of a running model (see PolycentricModel.set_params)."""
+        for name, value in params.items():
+            if (name in ("n_participants", "n_groups") or name.startswith("_")
+                    or not hasattr(self, name)):
+                raise ValueError(f"Cannot change parameter: {name}")
+            setattr(self, name, value)
+
+    def purge(self, fraction: float = 1.0) -> None:
+        """Vectorized PolycentricModel.purge."""
+        corrupt = np.flatnonzero(self.corrupt)
+        purged = np.random.choice(corrupt, round(fraction * len(corrupt)),
+                                  replace=False)
+        self.integrity[purged] = np.maximum(
+            0.1, np.random.normal(self.integrity_mean, self.integrity_std, len(purged))
+        )
+        self.base_integrity[purged] = self.integrity[purged]
+        self.corrupt[purged] = False
+        self.sanctions_received[purged] = 0
+        self.events.record_many(purged, EventType.PURGED)
+
+    def shock(self, factor: float, fraction: float = 1.0) -> None:
+        """Vectorized PolycentricModel.shock."""
+        hit = np.random.choice(self.n_participants,
+                               round(fraction * self.n_participants), replace=False)
+        self.integrity[hit] *= factor
+
+    def _group_counts(self, members: np.ndarray) -> np.ndarray:
+        """Number of the given participants in each group."""
+        return np.bincount(self.group_id[members], minlength=self.n_groups)
+
+    def _consider_corruption(self, honest: np.ndarray,
+                             group_corruption: np.ndarray) -> np.ndarray:
+        """
+        Vectorized Participant._consider_corruption.
+
+        Args:
+            honest: Indices of honest participants
+            group_corruption: Their groups' corruption rates
+
+        Returns:
+            Indices of those who became corrupt
+        """
+        if self.ostrom_monitoring:
+            # Peer monitoring: detection stays high or increases with corruption
+            detection_prob = np.minimum(
+                0.95,
+                self.base_detection_prob + self.vigilance_factor * group_corruption
+            )
+        else:
+            # Hierarchical monitoring: detection decreases with corruption
+            detection_prob = self.base_detection_prob * (1 - group_corruption)
+
+        if self.graduated_sanctions:
+            sanctions = self.sanctions_received[honest]
+            expected_penalty = self.sanction_base * (1 + sanctions)
+        else:
+            expected_penalty = self.sanction_base * 5
+
+        integrity_cost = self.integrity[honest] * self.integrity_weight
+
+        if self.collective_choice:
+            stake_cost = self.stake_factor * (1 - group_corruption)
+        else:
+            stake_cost = 0
+
+        expected_cost = detection_prob * expected_penalty + integrity_cost + stake_cost
+        gain = self.corruption_gain + self.decision_noise[honest]
+
+        corrupted = honest[gain > expected_cost]
+        self.corrupt[corrupted] = True
+        return corrupted
+
+    def _consider_reform(self, corrupt: np.ndarray,
+                         group_corruption: np.ndarray) -> np.ndarray:
+        """
+        Vectorized Participant._consider_reform.
+
+        Args:
+            corrupt: Indices of corrupt participants
+            group_corruption: Their groups' corruption rates
+
+        Returns:
+            Indices of those who reformed
+        """
+        if not self.graduated_sanctions:
+            return corrupt[:0]  # No path to recovery
+
+        social_pressure = self.social_pressure_factor * (1 - group_corruption)
+        sanctions = self.sanctions_received[corrupt]
+        continued_gain = self.corruption_gain * (0.9 ** sanctions)
+        integrity_recovery = self.base_integrity[corrupt] * 0.1
+
+        reform_benefit = social_pressure + integrity_recovery
+        reforms = reform_benefit > continued_gain + self.decision_noise[corrupt]
+
+        reformed = corrupt[reforms]
+        self.corrupt[reformed] = False
+        self.sanctions_received[reformed] = np.maximum(
+            0, self.sanctions_received[reformed] - 1
+        )
+        return reformed
+
+    def _update_integrity(self, members: np.ndarray):
+        """Vectorized Participant._update_integrity for the given participants."""
+        is_corrupt = self.corrupt[members]
+        corrupt, honest = members[is_corrupt], members[~is_corrupt]
+        self.integrity[corrupt] *= (1 - self.integrity_decay_rate)
+        self.sanctions_received[corrupt] += 1
+
+        if self.graduated_sanctions:
+            recovery = (
+                (self.base_integrity[honest] - self.integrity[honest])
+                * self.integrity_recovery_rate
+            )
+            self.integrity[honest] = np.minimum(
+                self.base_integrity[honest], self.integrity[honest] + recovery
+            )
+
+    def _corruption_rate(self) -> float:
+        """Proportion of participants currently corrupt."""
+        return np.count_nonzero(self.corrupt) / self.n_participants
+
+    def _mean_integrity(self) -> float:
+        """Average integrity across participants."""
+        return float(np.mean(self.integrity))
+
+    def step(self):
+        """Advance model by one step."""
+        self.datacollector.collect(self)
+        self.decision_noise = np.random.normal(0, 0.1, self.n_participants)
+        self._corrupt_at_step_start = np.count_nonzero(self.corrupt)
+        self.events.begin_step(self.steps)
+
+        # Random activation order, processed in chunks that each see the
+        # group counts left by the chunks before them
+        group_corrupt = self._group_counts(np.flatnonzero(self.corrupt))
+        group_sizes = np.maximum(self.group_sizes, 1)
+        order = self.rng.permutation(self.n_participants)
+        n_chunks = max(1, min(self.n_chunks, self.n_participants))
+        all_corrupted, all_reformed = [], []
+        for chunk in np.array_split(order, n_chunks):
+            group_corruption = (group_corrupt / group_sizes)[self.group_id[chunk]]
+            was_corrupt = self.corrupt[chunk]
+            corrupted = self._consider_corruption(chunk[~was_corrupt],
+                                                  group_corruption[~was_corrupt])
+            reformed = self._consider_reform(chunk[was_corrupt],
+                                             group_corruption[was_corrupt])
+            self._update_integrity(chunk)
+            group_corrupt += (self._group_counts(corrupted)
+                              - self._group_counts(reformed))
+            all_corrupted.append(corrupted)
+            all_reformed.append(reformed)
+
+        self.events.record_many(np.concatenate(all_corrupted), EventType.CORRUPTED)
+        self.events.record_many(np.concatenate(all_reformed), EventType.REFORMED)
+
     def run(self, steps: int = 200) -> None:
         """Run model for specified steps."""
         for _ in range(steps):
             self.step()
 
 
+# Simulation engines selectable from run_experiment
+ENGINES = {
+    "agent": PolycentricModel,
+    "array": PolycentricArrayModel,
+}
+
+
 def run_experiment(
     config_path: str = None,
     n_steps: int = 200,
@@ -279,106 +653,270 @@ def run_experiment(
     """
     Run a polycentric governance experiment.
 
+    The ``engine`` keyword selects the simulation engine: "agent" (default,
+    one Participant agent per participant) or "array" (vectorized
+    PolycentricArrayModel). ``profile=True`` adds a per-phase step profile
+    under "profile" (see abm/profiling.py). ``schedule`` lists mid-run
+    interventions (see abm/interventions.py).
+
     Returns dictionary with results.
     """
     if config_path:
+        import yaml  # only needed for config files
+
         with open(config_path) as f:
             config = yaml.safe_load(f)
         config.update(kwargs)
     else:
         config = kwargs
 
-    model = PolycentricModel(**config)
-    model.run(n_steps)
+    engine = config.pop("engine", "agent")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    profile = config.pop("profile", False)
+    schedule = config.pop("schedule", None)
+
+    model = ENGINES[engine](**config)
+    if profile:
+        profiler = StepProfiler()
+        with profiler.instrument(model):
+            run_schedule(model, n_steps, schedule)
+    else:
+        run_schedule(model, n_steps, schedule)
 
     model_data = model.datacollector.get_model_vars_dataframe()
 
-    return {
+    results = {
         "model_data": model_data,
-        "final_corruption_rate": sum(1 for a in model.agents if a.corrupt) / len(model.agents),
-        "final_mean_integrity": np.mean([a.integrity for a in model.agents]),
+        "final_corruption_rate": model._corruption_rate(),
+        "final_mean_integrity": model._mean_integrity(),
+        "engine": engine,
         "config": config,
     }
 
+    if profile:
+        results["profile"] = profiler.to_dict()
+
+    return results
+
+
+# Ostrom principle settings for each governance system under comparison
+GOVERNANCE_SYSTEMS = {
+    # Hierarchical (baseline - like original corruption model)
+    "hierarchical": {
+        "ostrom_monitoring": False,
+        "graduated_sanctions": False,
+        "collective_choice": False,
+        "n_groups": 1,  # Single hierarchy
+    },
+    # Partial Ostrom (just peer monitoring)
+    "partial_ostrom": {
+        "ostrom_monitoring": True,
+        "graduated_sanctions": False,
+        "collective_choice": False,
+        "n_groups": 5,
+    },
+    # Full Ostrom (all principles)
+    "full_ostrom": {
+        "ostrom_monitoring": True,
+        "graduated_sanctions": True,
+        "collective_choice": True,
+        "n_groups": 5,
+    },
+}
+
+
+def _run_single_governance(args: tuple) -> dict:
+    """
+    Worker function for parallel governance comparison.
+
+    Args:
+        args: Tuple of (system, rep, n_steps, common_params)
+
+    Returns:
+        Dictionary with single run results
+    """
+    system, rep, n_steps, common_params = args
+
+    params = {**common_params, **GOVERNANCE_SYSTEMS[system]}
+    results = run_experiment(seed=rep, n_steps=n_steps, **params)
+
+    return {
+        "system": system,
+        "replication": rep,
+        "final_corruption_rate": results["final_corruption_rate"],
+    }
+
+
+def paired_difference(
+    a: np.ndarray,
+    b: np.ndarray,
+    confidence: float = 0.95
+) -> dict:
+    """
+    Summarize paired differences a - b with a t-based confidence interval.
+
+    Replications are paired by seed, so each difference removes the noise
+    the two systems share.
+    """
+    diffs = np.asarray(a, dtype=float) - np.asarray(b, dtype=float)
+    n = len(diffs)
+    mean = np.mean(diffs)
+
+    if n > 1:
+        from scipy import stats
+
+        sem = np.std(diffs, ddof=1) / np.sqrt(n)
+        half_width = stats.t.ppf(0.5 + confidence / 2, n - 1) * sem
+    else:
+        sem = np.nan
+        half_width = np.nan
+
+    return {
+        "mean": mean,
+        "std": np.std(diffs, ddof=1) if n > 1 else 0.0,
+        "sem": sem,
+        "ci_low": mean - half_width,
+        "ci_high": mean + half_width,
+        "confidence": confidence,
+        "values": diffs.tolist(),
+    }
+
 
 def compare_governance_systems(
     n_replications: int = 10,
     n_steps: int = 200,
+    n_workers: int = None,
+    confidence: float = 0.95,
+    engine: str = "agent",
+    executor: Executor = None,
     **common_params
 ) -> dict:
     """
     Compare hierarchical vs polycentric governance outcomes.
 
-    Returns results for:
-    1. Hierarchical (no Ostrom principles)
-    2. Partial Ostrom (some principles)
-    3. Full Ostrom (all principles)
+    Every (system, replication) pair runs as an independent job on a process
+    pool. All systems in replication ``rep`` use seed ``rep``, so they share
+    the initial population and the per-step decision noise (common random
+    numbers) and their differences can be analyzed pairwise.
+
+    Args:
+        n_replications: Replications per governance system
+        n_steps: Steps per run
+        n_workers: Number of parallel workers (default: CPU count)
+        confidence: Confidence level for paired-difference intervals
+        engine: Simulation engine passed to run_experiment ("agent" or "array")
+        executor: Existing pool to run on (e.g. one shared across a batch);
+            n_workers is ignored when given
+        **common_params: Parameters shared by all systems
+
+    Returns:
+        Results for:
+        1. Hierarchical (no Ostrom principles)
+        2. Partial Ostrom (some principles)
+        3. Full Ostrom (all principles)
+        plus 'paired_differences' with confidence intervals for each
+        pair of systems.
     """
+    if n_workers is None:
+        n_workers = os.cpu_count() or 4
+
+    systems = list(GOVERNANCE_SYSTEMS)
+
+    # Create all job arguments
+    common_params = {**common_params, "engine": engine}
+    jobs = [
+        (system, rep, n_steps, common_params)
+        for rep in range(n_replications)
+        for system in systems
+    ]
+
+    # Run in parallel
+    if executor is not None:
+        runs = list(executor.map(_run_single_governance, jobs))
+    elif n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            runs = list(executor.map(_run_single_governance, jobs))
+    else:
+        # Sequential fallback
+        runs = [_run_single_governance(job) for job in jobs]
+
+    # Values are ordered by replication so they stay paired across systems
+    values = {system: np.zeros(n_replications) for system in systems}
+    for run in runs:
+        values[run["system"]][run["replication"]] = run["final_corruption_rate"]
+
     results = {
-        'hierarchical': [],
-        'partial_ostrom': [],
-        'full_ostrom': []
+        system: {
+            "mean": np.mean(values[system]),
+            "std": np.std(values[system]),
+            "values": values[system].tolist(),
+        }
+        for system in systems
     }
 
-    for rep in range(n_replications):
-        # Hierarchical (baseline - like original corruption model)
-        hierarchical = run_experiment(
-            ostrom_monitoring=False,
-            graduated_sanctions=False,
-            collective_choice=False,
-            n_groups=1,  # Single hierarchy
-            seed=rep,
-            n_steps=n_steps,
-            **common_params
-        )
-        results['hierarchical'].append(hierarchical['final_corruption_rate'])
+    results["paired_differences"] = {
+        f"{a} - {b}": paired_difference(values[a], values[b], confidence)
+        for a, b in [
+            ("partial_ostrom", "hierarchical"),
+            ("full_ostrom", "hierarchical"),
+            ("full_ostrom", "partial_ostrom"),
+        ]
+    }
 
-        # Partial Ostrom (just peer monitoring)
-        partial = run_experiment(
-            ostrom_monitoring=True,
-            graduated_sanctions=False,
-            collective_choice=False,
-            n_groups=5,
-            seed=rep,
-            n_steps=n_steps,
-            **common_params
-        )
-        results['partial_ostrom'].append(partial['final_corruption_rate'])
+    return results
 
-        # Full Ostrom (all principles)
-        full = run_experiment(
-            ostrom_monitoring=True,
-            graduated_sanctions=True,
-            collective_choice=True,
-            n_groups=5,
-            seed=rep,
-            n_steps=n_steps,
-            **common_params
-        )
-        results['full_ostrom'].append(full['final_corruption_rate'])
 
-    return {
-        'hierarchical': {
-            'mean': np.mean(results['hierarchical']),
-            'std': np.std(results['hierarchical']),
-            'values': results['hierarchical']
-        },
-        'partial_ostrom': {
-            'mean': np.mean(results['partial_ostrom']),
-            'std': np.std(results['partial_ostrom']),
-            'values': results['partial_ostrom']
-        },
-        'full_ostrom': {
-            'mean': np.mean(results['full_ostrom']),
-            'std': np.std(results['full_ostrom']),
-            'values': results['full_ostrom']
-        }
+def check_engine_agreement(
+    n_replications: int = 10,
+    n_steps: int = 200,
+    tolerance: float = 0.02,
+    n_workers: int = None,
+    executor: Executor = None,
+    **common_params
+) -> dict:
+    """
+    Check that the agent and array engines give the same governance outcomes.
+
+    Runs compare_governance_systems() on both engines with the same seeds
+    and compares the mean final corruption rate of each system.
+
+    Args:
+        n_replications: Replications per system and engine
+        n_steps: Steps per run
+        tolerance: Largest accepted difference between the engines' means
+        n_workers: Number of parallel workers (default: CPU count)
+        executor: Existing pool to run on
+        **common_params: Parameters shared by all systems
+
+    Returns:
+        Per system: agent and array mean and std, their difference and
+        whether it is within tolerance; plus 'agree' for all systems
+    """
+    comparisons = {
+        engine: compare_governance_systems(n_replications, n_steps, n_workers,
+                                           engine=engine, executor=executor,
+                                           **common_params)
+        for engine in ("agent", "array")
     }
+    results = {}
+    for system in GOVERNANCE_SYSTEMS:
+        agent, array = comparisons["agent"][system], comparisons["array"][system]
+        difference = array["mean"] - agent["mean"]
+        results[system] = {
+            "agent_mean": agent["mean"], "agent_std": agent["std"],
+            "array_mean": array["mean"], "array_std": array["std"],
+            "difference": difference,
+            "agree": bool(abs(difference) <= tolerance),
+        }
+    results["agree"] = all(results[s]["agree"] for s in GOVERNANCE_SYSTEMS)
+    return results
 
 
 if __name__ == "__main__":
     import argparse
-    import matplotlib.pyplot as plt
+    import sys
 
     parser = argparse.ArgumentParser(description="Run polycentric governance model")
     parser.add_argument("--steps", type=int, default=200, help="Number of steps")
@@ -386,58 +924,79 @@ if __name__ == "__main__":
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
     parser.add_argument("--output", type=str, help="Output directory")
     parser.add_argument("--compare", action="store_true", help="Compare governance systems")
+    parser.add_argument("--check-engines", action="store_true",
+                        help="Check that the agent and array engines agree "
+                             "(exit status 1 if not)")
+    parser.add_argument("--tolerance", type=float, default=0.02,
+                        help="Largest accepted engine difference in mean final "
+                             "corruption rate")
+    parser.add_argument("--reps", type=int, default=10,
+                        help="Replications per governance system")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers (default: CPU count)")
+    parser.add_argument("--engine", type=str, default="agent", choices=sorted(ENGINES),
+                        help="Simulation engine (agent or vectorized array)")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="Skip figures (no matplotlib import)")
+    parser.add_argument("--profile", type=str, default=None,
+                        help="Write a per-phase step profile (.json, or collapsed "
+                             "stacks for flame graphs)")
 
     args = parser.parse_args()
 
+    if args.check_engines:
+        check = check_engine_agreement(
+            n_replications=args.reps,
+            n_steps=args.steps,
+            tolerance=args.tolerance,
+            n_workers=args.workers,
+            n_participants=args.participants
+        )
+        print(f"{'system':>16} {'agent':>15} {'array':>15} {'diff':>8}")
+        for system in GOVERNANCE_SYSTEMS:
+            row = check[system]
+            print(f"{system:>16} {row['agent_mean']:7.3f} ± {row['agent_std']:.3f} "
+                  f"{row['array_mean']:7.3f} ± {row['array_std']:.3f} "
+                  f"{row['difference']:+8.3f} {'ok' if row['agree'] else 'MISMATCH'}")
+        sys.exit(0 if check["agree"] else 1)
+
     if args.compare:
         print("Comparing governance systems...")
         comparison = compare_governance_systems(
-            n_replications=10,
+            n_replications=args.reps,
             n_steps=args.steps,
+            n_workers=args.workers,
+            engine=args.engine,
             n_participants=args.participants
         )
 
+        systems = list(GOVERNANCE_SYSTEMS)
+
         print("\n=== Governance System Comparison ===\n")
-        for system, stats in comparison.items():
+        for system in systems:
+            summary = comparison[system]
             print(f"{system}:")
-            print(f"  Mean corruption rate: {stats['mean']:.2%}")
-            print(f"  Std deviation: {stats['std']:.2%}")
+            print(f"  Mean corruption rate: {summary['mean']:.2%}")
+            print(f"  Std deviation: {summary['std']:.2%}")
             print()
 
-        # Plot comparison
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        systems = list(comparison.keys())
-        means = [comparison[s]['mean'] for s in systems]
-        stds = [comparison[s]['std'] for s in systems]
-
-        x = range(len(systems))
-        bars = ax.bar(x, means, yerr=stds, capsize=5, alpha=0.7, edgecolor='black')
-
-        # Color code
-        colors = ['#d62728', '#ff7f0e', '#2ca02c']
-        for bar, color in zip(bars, colors):
-            bar.set_facecolor(color)
-
-        ax.set_xticks(x)
-        ax.set_xticklabels(['Hierarchical\n(No Ostrom)', 'Partial Ostrom\n(Peer Monitoring)', 'Full Ostrom\n(All Principles)'])
-        ax.set_ylabel("Final Corruption Rate", fontsize=12)
-        ax.set_title("Corruption Outcomes by Governance System", fontsize=14)
-        ax.set_ylim(0, 1.1)
-        ax.axhline(1.0, color='gray', linestyle='--', alpha=0.5)
-        ax.grid(True, alpha=0.3, axis='y')
+        print("=== Paired Differences (common random numbers) ===\n")
+        for pair, diff in comparison["paired_differences"].items():
+            print(f"{pair}:")
+            print(f"  Mean difference: {diff['mean']:+.2%}")
+            print(f"  {diff['confidence']:.0%} CI: "
+                  f"[{diff['ci_low']:+.2%}, {diff['ci_high']:+.2%}]")
+            print()
 
-        # Add value labels
-        for i, (mean, std) in enumerate(zip(means, stds)):
-            ax.text(i, mean + std + 0.05, f"{mean:.0%}", ha='center', fontsize=10)
+        # Plot comparison
+        if not args.no_plot:
+            from .plotting import plot_governance_comparison
 
-        plt.tight_layout()
-
-        if args.output:
-            plt.savefig(f"{args.output}/governance_comparison.png", dpi=150)
-            print(f"Figure saved to {args.output}/governance_comparison.png")
-        else:
-            plt.show()
+            output_path = (f"{args.output}/governance_comparison.png"
+                           if args.output else None)
+            plot_governance_comparison(comparison, output_path)
+            if output_path:
+                print(f"Figure saved to {output_path}")
 
     else:
         # Single run with full Ostrom
@@ -446,35 +1005,26 @@ if __name__ == "__main__":
             n_participants=args.participants,
             n_steps=args.steps,
             seed=args.seed,
+            engine=args.engine,
             ostrom_monitoring=True,
             graduated_sanctions=True,
-            collective_choice=True
+            collective_choice=True,
+            profile=args.profile is not None
         )
 
         print(f"\nFinal corruption rate: {results['final_corruption_rate']:.2%}")
         print(f"Final mean integrity: {results['final_mean_integrity']:.2f}")
 
+        if args.profile:
+            print(format_profile(results["profile"]))
+            write_profile(results["profile"], args.profile)
+            print(f"Profile saved to {args.profile}")
+
         # Plot time series
-        fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-
-        ax = axes[0]
-        ax.plot(results['model_data']['Corruption_Rate'])
-        ax.set_xlabel("Step")
-        ax.set_ylabel("Corruption Rate")
-        ax.set_title("Corruption Rate Over Time (Polycentric)")
-        ax.set_ylim(0, 1)
-        ax.grid(True, alpha=0.3)
-
-        ax = axes[1]
-        ax.plot(results['model_data']['Mean_Integrity'])
-        ax.set_xlabel("Step")
-        ax.set_ylabel("Mean Integrity")
-        ax.set_title("Mean Integrity Over Time")
-        ax.grid(True, alpha=0.3)
-
-        plt.tight_layout()
-
-        if args.output:
-            plt.savefig(f"{args.output}/polycentric_dynamics.png", dpi=150)
-        else:
-            plt.show()
+        if not args.no_plot:
+            from .plotting import plot_polycentric_dynamics
+
+            plot_polycentric_dynamics(
+                results,
+                f"{args.output}/polycentric_dynamics.png" if args.output else None
+            )
@@ -0,0 +1,220 @@
+"""
+Per-Phase Step Profiling for the ABMs
+
+Records cumulative wall time and call counts for the phases of a model step:
+
+- collect: DataCollector.collect
+- shuffle_do: agent activation (shuffling plus all agent steps)
+- decision: an agent's own step logic
+- random: random draws (np.random module functions and model.random)
+
+Phases nest, so every measurement is kept per call stack, e.g.
+"step;shuffle_do;decision;random". Each stack reports inclusive time and
+self time (inclusive minus nested phases), which is what flame graphs expect.
+
+Instrumentation is installed on a model instance only while profiling and
+removed afterwards; a model that is not profiled runs its normal, unwrapped
+code path, so disabled profiling costs nothing. Enabled profiling adds a
+timer call around every random draw, which inflates the fine-grained phases
+somewhat; compare profiles with each other rather than with unprofiled runs.
+
+Usage:
+    profiler = StepProfiler()
+    with profiler.instrument(model):
+        model.run(200)
+    write_profile(profiler.to_dict(), "profile.json")     # or .folded
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# np.random module functions the models draw from
+NUMPY_RANDOM_FUNCTIONS = (
+    "random", "rand", "randn", "randint", "normal", "uniform", "binomial",
+    "poisson", "exponential", "lognormal", "beta", "choice", "shuffle",
+    "permutation",
+)
+
+# random.Random methods used by the models and by Mesa's AgentSet
+PYTHON_RANDOM_METHODS = (
+    "random", "uniform", "gauss", "normalvariate", "randint", "choice",
+    "sample", "shuffle",
+)
+
+
+class StepProfiler:
+    """
+    Accumulates wall time and call counts per phase call stack.
+
+    Attributes:
+        stacks: Maps a stack tuple such as ("step", "collect") to
+            [calls, inclusive_seconds, child_seconds]
+        n_steps: Number of model steps recorded
+    """
+
+    def __init__(self):
+        self.stacks = {}
+        self.n_steps = 0
+        self._stack = []
+        self._child_time = []
+
+    def wrap(self, phase: str, fn):
+        """Return fn wrapped so each call is timed as the given phase."""
+        stacks = self.stacks
+        stack = self._stack
+        child_time = self._child_time
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            stack.append(phase)
+            child_time.append(0.0)
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                children = child_time.pop()
+                key = tuple(stack)
+                stack.pop()
+                entry = stacks.get(key)
+                if entry is None:
+                    stacks[key] = [1, elapsed, children]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+                    entry[2] += children
+                if child_time:
+                    child_time[-1] += elapsed
+
+        return timed
+
+    @contextmanager
+    def instrument(self, model):
+        """
+        Instrument a model for the duration of the block.
+
+        Wraps model.step, its DataCollector, agents.shuffle_do, every agent's
+        step, the model's random.Random and the np.random module functions.
+        All wrappers are removed on exit.
+        """
+        patches = []  # (target, name, had_instance_attr, original)
+
+        def patch(target, name, phase):
+            original = getattr(target, name, None)
+            if original is None:
+                return
+            own = name in getattr(target, "__dict__", {})
+            patches.append((target, name, own, original))
+            setattr(target, name, self.wrap(phase, original))
+
+        step = model.step
+        patches.append((model, "step", "step" in model.__dict__, step))
+
+        def counted_step(*args, **kwargs):
+            self.n_steps += 1
+            return step(*args, **kwargs)
+
+        model.step = self.wrap("step", counted_step)
+
+        if hasattr(model, "datacollector"):
+            patch(model.datacollector, "collect", "collect")
+
+        agents = getattr(model, "agents", None)
+        if agents is not None:
+            patch(agents, "shuffle_do", "shuffle_do")
+            for agent in agents:
+                patch(agent, "step", "decision")
+
+        for name in NUMPY_RANDOM_FUNCTIONS:
+            patch(np.random, name, "random")
+        for name in PYTHON_RANDOM_METHODS:
+            patch(model.random, name, "random")
+
+        try:
+            yield self
+        finally:
+            for target, name, own, original in reversed(patches):
+                if own:
+                    setattr(target, name, original)
+                else:
+                    delattr(target, name)
+
+    def to_dict(self) -> dict:
+        """
+        Profile as a JSON-serializable dict.
+
+        Returns:
+            Dict with per-phase totals ("phases", aggregated over stacks),
+            per-stack detail ("stacks") and the number of steps recorded
+        """
+        phases = {}
+        stacks = []
+        for key, (calls, total, children) in sorted(self.stacks.items()):
+            self_seconds = max(0.0, total - children)
+            stacks.append({
+                "stack": ";".join(key),
+                "calls": calls,
+                "total_seconds": total,
+                "self_seconds": self_seconds,
+            })
+            phase = phases.setdefault(key[-1], {
+                "calls": 0, "total_seconds": 0.0, "self_seconds": 0.0
+            })
+            phase["calls"] += calls
+            phase["self_seconds"] += self_seconds
+            # Inclusive time only counts outermost occurrences of a phase
+            if key[-1] not in key[:-1]:
+                phase["total_seconds"] += total
+
+        step_total = phases.get("step", {}).get("total_seconds", 0.0)
+        return {
+            "n_steps": self.n_steps,
+            "step_seconds": step_total,
+            "phases": phases,
+            "stacks": stacks,
+        }
+
+
+def to_collapsed(profile: dict) -> str:
+    """
+    Render a profile in collapsed-stack format ("a;b;c <microseconds>").
+
+    The output can be fed to flamegraph.pl, speedscope or inferno.
+    """
+    lines = []
+    for entry in profile["stacks"]:
+        micros = int(round(entry["self_seconds"] * 1e6))
+        if micros > 0:
+            lines.append(f"{entry['stack']} {micros}")
+    return "\n".join(lines) + "\n"
+
+
+def write_profile(profile: dict, path: str) -> None:
+    """Write a profile as JSON (.json) or collapsed stacks (any other extension)."""
+    with open(path, "w") as f:
+        if path.endswith(".json"):
+            json.dump(profile, f, indent=2)
+        else:
+            f.write(to_collapsed(profile))
+
+
+def format_profile(profile: dict) -> str:
+    """Human-readable per-phase summary table."""
+    step_total = profile["step_seconds"] or 1.0
+    lines = [
+        f"Profile over {profile['n_steps']} steps "
+        f"({profile['step_seconds']:.3f}s in step):",
+        f"  {'phase':<12} {'calls':>10} {'total s':>10} {'self s':>10} {'self %':>7}",
+    ]
+    phases = sorted(profile["phases"].items(),
+                    key=lambda item: item[1]["self_seconds"], reverse=True)
+    for name, phase in phases:
+        lines.append(
+            f"  {name:<12} {phase['calls']:>10} {phase['total_seconds']:>10.3f} "
+            f"{phase['self_seconds']:>10.3f} "
+            f"{100 * phase['self_seconds'] / step_total:>6.1f}%"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,404 @@
+"""
+Model Snapshots and Counterfactual Branching
+
+Intervention studies share a long burn-in between variants. A snapshot
+captures a running CorruptionModel, CooperationModel or PolycentricModel
+compactly: one array per agent attribute, the model's running counters,
+its event log, the collected model reporters, and the state of every
+random stream the model draws from (the np.random module state, the
+model's random.Random and its numpy Generator). restore() rebuilds an
+identical model, so a restored model continues exactly as the original
+would have.
+
+run_branches() continues many variants from one warm state. Each branch
+applies parameter overrides through the model's set_params() (e.g.
+switching oversight_structure or enabling integrity_reinforcement) and
+runs on. By default every branch continues the same random streams
+(common random numbers), so branch differences come from the
+intervention rather than from noise; branch_seeds reseeds them instead.
+
+Branches run in-process, in fork()ed workers that inherit the warm model
+copy-on-write (nothing is serialized or rebuilt), or on an existing
+executor, which receives the snapshot.
+
+Usage:
+    model = CorruptionModel(seed=1)
+    model.run(100)
+    branches = run_branches(model, [{}, {"oversight_structure": "flat"},
+                                     {"integrity_reinforcement": True}],
+                            n_steps=100, n_workers=3)
+"""
+
+import importlib
+import inspect
+import json
+import multiprocessing
+import sys
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from mesa import Model
+
+from .cooperation_threshold import CooperationModel
+from .corruption_dynamics import CorruptionModel
+from .networks import CSRGraph
+from .polycentric_governance import PolycentricModel
+
+
+@dataclass
+class SnapshotSpec:
+    """What a snapshot of one model class holds beyond the common state."""
+    agent_fields: List[str]
+    model_fields: List[str]
+    summary: callable
+
+
+def _corruption_summary(model: CorruptionModel) -> dict:
+    return {
+        "final_corruption_rate": model._corruption_rate(),
+        "final_mean_integrity": float(model._mean_integrity()),
+        "total_extractions": model._total_extractions(),
+    }
+
+
+def _cooperation_summary(model: CooperationModel) -> dict:
+    return {
+        "final_cooperation_rate": model._cooperation_rate(),
+        "final_mean_motivation": float(model._mean_motivation()),
+        "theta_crit": model.theta_crit,
+        "stable": model._cooperation_rate() > model.theta_crit,
+    }
+
+
+def _polycentric_summary(model: PolycentricModel) -> dict:
+    return {
+        "final_corruption_rate": model._corruption_rate(),
+        "final_mean_integrity": float(model._mean_integrity()),
+    }
+
+
+# EventLog state entries stored as arrays rather than in the JSON header
+EVENT_ARRAYS = ("steps", "agents", "types")
+
+# Snapshot layout per model class
+SNAPSHOT_SPECS = {
+    CorruptionModel: SnapshotSpec(
+        agent_fields=["integrity", "corrupted", "extraction_events", "oversight_level"],
+        model_fields=[],
+        summary=_corruption_summary,
+    ),
+    CooperationModel: SnapshotSpec(
+        agent_fields=["base_motivation", "motivation", "cooperating", "transformed"],
+        model_fields=["n_cooperating"],
+        summary=_cooperation_summary,
+    ),
+    PolycentricModel: SnapshotSpec(
+        agent_fields=["integrity", "base_integrity", "corrupt", "group_id",
+                      "sanctions_received"],
+        model_fields=["group_sizes", "group_corrupt", "n_corrupt",
+                      "_corrupt_at_step_start",
+                      "decision_noise"],
+        summary=_polycentric_summary,
+    ),
+}
+
+
+def _spec(cls) -> SnapshotSpec:
+    if cls not in SNAPSHOT_SPECS:
+        raise ValueError(f"Snapshots are not supported for {cls.__name__}")
+    return SNAPSHOT_SPECS[cls]
+
+
+def _jsonable(value):
+    """Model state values as plain Python (lists, floats, ints), copied."""
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+@dataclass
+class ModelSnapshot:
+    """
+    State of a running model.
+
+    Attributes:
+        model_class: Import path of the model class
+        params: Constructor parameters (the model's current values)
+        steps: Steps taken
+        agents: One array per agent attribute, in agent index order
+        state: Model-level counters
+        events: EventLog.get_state()
+        model_vars: Model reporters collected so far
+        rng: States of np.random, model.random and model.rng
+        graph: CSR arrays ("indptr", "indices") of an interaction network
+            given as a graph object rather than a topology name, which
+            restore() passes back as a CSRGraph
+    """
+    model_class: str
+    params: Dict
+    steps: int
+    agents: Dict[str, np.ndarray]
+    state: Dict
+    events: Dict
+    model_vars: Dict[str, list]
+    rng: Dict = field(repr=False)
+    graph: Optional[Dict[str, np.ndarray]] = field(default=None, repr=False)
+
+    def save(self, path: str) -> None:
+        """Write the snapshot as .npz (arrays plus a JSON header)."""
+        np_state = self.rng["numpy"]
+        meta = {
+            "model_class": self.model_class,
+            "params": self.params,
+            "steps": self.steps,
+            "state": self.state,
+            "events": {k: v for k, v in self.events.items() if k not in EVENT_ARRAYS},
+            "model_vars": self.model_vars,
+            "rng": {
+                "numpy": [np_state[0]] + [_jsonable(v) for v in np_state[2:]],
+                "random": [self.rng["random"][0], list(self.rng["random"][1]),
+                           self.rng["random"][2]],
+                "generator": self.rng["generator"],
+            },
+        }
+        arrays = {f"agent/{name}": values for name, values in self.agents.items()}
+        arrays.update({f"events/{name}": self.events[name] for name in EVENT_ARRAYS})
+        arrays["rng/numpy"] = np_state[1]
+        if self.graph is not None:
+            arrays.update({f"graph/{name}": values
+                           for name, values in self.graph.items()})
+        np.savez_compressed(path, meta=np.array(json.dumps(meta, default=_jsonable)),
+                            **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ModelSnapshot":
+        """Read a snapshot written by save()."""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            agents = {key.split("/", 1)[1]: data[key] for key in data.files
+                      if key.startswith("agent/")}
+            events = dict(meta["events"])
+            events.update({name: data[f"events/{name}"] for name in EVENT_ARRAYS})
+            np_key = data["rng/numpy"]
+            graph = {key.split("/", 1)[1]: data[key] for key in data.files
+                     if key.startswith("graph/")} or None
+        numpy_state = meta["rng"]["numpy"]
+        python_state = meta["rng"]["random"]
+        rng = {
+            "numpy": (numpy_state[0], np_key, *numpy_state[1:]),
+            "random": (python_state[0], tuple(python_state[1]), python_state[2]),
+            "generator": meta["rng"]["generator"],
+        }
+        return cls(meta["model_class"], meta["params"], meta["steps"], agents,
+                   meta["state"], events, meta["model_vars"], rng, graph)
+
+
+def take_snapshot(model: Model) -> ModelSnapshot:
+    """Capture a running model; the model itself is not changed."""
+    cls = type(model)
+    spec = _spec(cls)
+    signature = inspect.signature(cls.__init__)
+    params = {name: _jsonable(getattr(model, name)) for name in signature.parameters
+              if name not in ("self", "seed") and hasattr(model, name)}
+    # A network given as a graph object is kept as its CSR arrays; a topology
+    # name is rebuilt from network_params, which hold the graph seed
+    graph = None
+    network = params.get("network")
+    if network is not None and not isinstance(network, str):
+        graph = {"indptr": model.graph.indptr.copy(),
+                 "indices": model.graph.indices.copy()}
+        params["network"] = None
+    agents = sorted(model.agents, key=lambda a: a.index)
+    return ModelSnapshot(
+        model_class=f"{cls.__module__}.{cls.__qualname__}",
+        params=params,
+        steps=model.steps,
+        agents={name: np.array([getattr(a, name) for a in agents])
+                for name in spec.agent_fields},
+        state={name: _jsonable(getattr(model, name)) for name in spec.model_fields},
+        events=model.events.get_state(),
+        model_vars={name: [_jsonable(v) for v in values]
+                    for name, values in model.datacollector.model_vars.items()},
+        rng={
+            "numpy": np.random.get_state(),
+            "random": model.random.getstate(),
+            "generator": model.rng.bit_generator.state,
+        },
+        graph=graph,
+    )
+
+
+def _reseed(model: Model, seed: int) -> None:
+    """Replace every random stream of a model with fresh ones from seed."""
+    np.random.seed(seed)
+    model.random.seed(seed)
+    model.rng = np.random.default_rng(seed)
+
+
+def restore(snapshot: ModelSnapshot, seed: Optional[int] = None, **params) -> Model:
+    """
+    Rebuild a model from a snapshot.
+
+    Args:
+        snapshot: Snapshot to restore
+        seed: Reseed the random streams instead of continuing the snapshot's
+        **params: Parameter overrides applied with the model's set_params()
+
+    Returns:
+        The restored model
+    """
+    module_name, class_name = snapshot.model_class.rsplit(".", 1)
+    cls = getattr(importlib.import_module(module_name), class_name)
+    spec = _spec(cls)
+
+    init_params = dict(snapshot.params)
+    if snapshot.graph is not None:
+        init_params["network"] = CSRGraph(snapshot.graph["indptr"],
+                                          snapshot.graph["indices"])
+    model = cls(**init_params)
+    agents = sorted(model.agents, key=lambda a: a.index)
+    for name, values in snapshot.agents.items():
+        for agent, value in zip(agents, values.tolist()):
+            setattr(agent, name, value)
+    for name in spec.model_fields:
+        value = snapshot.state[name]
+        if isinstance(getattr(model, name), np.ndarray):
+            value = np.array(value)
+        elif isinstance(value, list):
+            value = list(value)
+        setattr(model, name, value)
+    model.events.set_state(snapshot.events)
+    model.datacollector.model_vars = {name: list(values) for name, values
+                                      in snapshot.model_vars.items()}
+    model.steps = snapshot.steps
+
+    np.random.set_state(snapshot.rng["numpy"])
+    model.random.setstate(snapshot.rng["random"])
+    model.rng.bit_generator.state = snapshot.rng["generator"]
+
+    if seed is not None:
+        _reseed(model, seed)
+    if params:
+        model.set_params(**params)
+    return model
+
+
+def _branch_result(model: Model, params: dict) -> dict:
+    """Reporters and final outputs of a finished branch."""
+    return {
+        "params": params,
+        "model_data": model.datacollector.get_model_vars_dataframe(),
+        **_spec(type(model)).summary(model),
+    }
+
+
+def _run_branch(args: tuple) -> dict:
+    """Worker: restore a snapshot, apply one branch's overrides and run it."""
+    snapshot, params, n_steps, seed = args
+    model = restore(snapshot, seed=seed, **params)
+    model.run(n_steps)
+    return _branch_result(model, params)
+
+
+def _fork_child(model: Model, params: dict, n_steps: int, seed, conn) -> None:
+    """Body of a fork()ed branch; the warm model is this process's copy-on-write."""
+    try:
+        if seed is not None:
+            _reseed(model, seed)
+        if params:
+            model.set_params(**params)
+        model.run(n_steps)
+        conn.send(_branch_result(model, params))
+    except BaseException as exc:
+        conn.send(exc)
+    finally:
+        conn.close()
+
+
+def _fork_branches(model: Model, jobs: list, n_workers: int) -> list:
+    """Run branches in fork()ed processes, at most n_workers at a time."""
+    ctx = multiprocessing.get_context("fork")
+    results = [None] * len(jobs)
+    pending = list(enumerate(jobs))
+    running = {}
+    while pending or running:
+        while pending and len(running) < n_workers:
+            i, (params, n_steps, seed) = pending.pop(0)
+            recv, send = ctx.Pipe(duplex=False)
+            process = ctx.Process(target=_fork_child,
+                                  args=(model, params, n_steps, seed, send))
+            process.start()
+            send.close()
+            running[recv] = (i, process)
+        for conn in wait(list(running)):
+            i, process = running.pop(conn)
+            try:
+                result = conn.recv()
+            except EOFError:
+                result = RuntimeError(f"Branch {i} exited without a result")
+            process.join()
+            if isinstance(result, BaseException):
+                raise result
+            results[i] = result
+    return results
+
+
+def run_branches(
+    source: Union[Model, ModelSnapshot],
+    branches: Sequence[dict],
+    n_steps: int = 100,
+    branch_seeds: Optional[Sequence[int]] = None,
+    n_workers: Optional[int] = None,
+    executor: Executor = None
+) -> List[dict]:
+    """
+    Continue several variants from one warm model state.
+
+    Args:
+        source: Warm model (left unchanged) or a snapshot of one
+        branches: Parameter overrides per branch ({} continues unchanged)
+        n_steps: Steps to run each branch
+        branch_seeds: Reseed each branch's random streams (default: all
+            branches continue the source's streams, i.e. common random numbers)
+        n_workers: Parallel fork()ed workers (POSIX); without fork, branches
+            run in-process
+        executor: Existing pool to run on (the snapshot is sent to it);
+            n_workers is ignored when given
+
+    Returns:
+        One dict per branch: "params", "model_data" (burn-in plus branch
+        steps) and the model's final outputs as in its run_experiment
+    """
+    if branch_seeds is not None and len(branch_seeds) != len(branches):
+        raise ValueError("branch_seeds must have one seed per branch")
+    seeds = list(branch_seeds) if branch_seeds is not None else [None] * len(branches)
+    branches = [dict(params) for params in branches]
+
+    use_fork = (executor is None and n_workers is not None and n_workers > 1
+                and len(branches) > 1
+                and "fork" in multiprocessing.get_all_start_methods()
+                and sys.platform != "win32")
+    if use_fork:
+        model = source if isinstance(source, Model) else restore(source)
+        return _fork_branches(model,
+                              list(zip(branches, [n_steps] * len(branches), seeds)),
+                              n_workers)
+
+    snapshot = source if isinstance(source, ModelSnapshot) else take_snapshot(source)
+    jobs = [(snapshot, params, n_steps, seed) for params, seed in zip(branches, seeds)]
+    if executor is not None:
+        return list(executor.map(_run_branch, jobs))
+    # In-process branches draw from the global np.random stream the source
+    # model also uses; put it back so the source continues unaffected
+    np_state = np.random.get_state()
+    try:
+        return [_run_branch(job) for job in jobs]
+    finally:
+        np.random.set_state(np_state)
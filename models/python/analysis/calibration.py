@@ -3,11 +3,49 @@ Parameter Calibration from Forecasting Data
 
 Uses AI timeline forecasts and historical coordination failures to calibrate
 Monte Carlo simulation parameters.
+
+abc_smc() fits the Monte Carlo parameters (p_ai, growth, cycle_duration,
+cycle_std) by approximate Bayesian computation with sequential Monte Carlo
+(ABC-SMC, Beaumont et al. 2009). For each candidate parameter vector the
+simulator produces:
+- p_AI at each forecast year, following the Go model's clock: cycle
+  lengths are drawn as normal(cycle_duration, cycle_std) floored at 1 year,
+  and p_ai grows by (1 + growth) at each completed cycle (capped at
+  P_AI_MAX); compared with P_AI_USAGE * P(AGI by year)
+- one synthetic duration per historical case, drawn the same way and
+  summarised by mean, std and quartiles, compared with the same summaries
+  of HISTORICAL_CASES
+
+The forecasts reach 15 years ahead, usually less than one cycle, so they
+mostly constrain p_ai; growth is only informed when short cycles are
+plausible and otherwise stays close to its prior.
+
+Candidates are evaluated as (batch x parameter) arrays, split across a
+process pool, so a generation of hundreds of thousands of simulator calls
+takes seconds. The weighted posterior samples convert directly to scenario
+dicts in the format of get_calibrated_scenarios().
+
+get_calibrated_scenarios(n_samples=N) instead draws N scenarios from the
+bootstrap distributions of parametric CDFs fitted to all forecast points
+and historical durations (see analysis/cdf_fitting.py).
 """
 
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
 import numpy as np
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.cdf_fitting import (
+    FORECAST_ORIGIN,
+    best_fit,
+    distribution_moments,
+    fit_calibration_data,
+)
 
 
 @dataclass
@@ -151,7 +189,12 @@ def estimate_cycle_duration(
     return mean_dur, std_dur
 
 
-def get_calibrated_scenarios() -> Dict[str, Dict]:
+def get_calibrated_scenarios(
+    n_samples: int = 0,
+    seed: int = 0,
+    current_year: int = 2025,
+    cache_dir: Optional[str] = None
+) -> Dict[str, Dict]:
     """
     Return calibrated parameter sets for pessimistic, baseline, optimistic scenarios.
 
@@ -159,7 +202,18 @@ def get_calibrated_scenarios() -> Dict[str, Dict]:
     - AI forecasts for p_AI
     - Historical cases for cycle duration
     - Reasonable uncertainty ranges
+
+    Args:
+        n_samples: If > 0, return this many scenarios sampled from the
+            bootstrap CDF fits instead of the three fixed ones
+        seed: Seed for the bootstrap and the sampling
+        current_year: Year the sampled scenarios start in
+        cache_dir: Directory for cached CDF fits
     """
+    if n_samples > 0:
+        return sample_calibrated_scenarios(n_samples, seed=seed,
+                                           current_year=current_year,
+                                           cache_dir=cache_dir)
 
     # Baseline from calibration
     base_p_ai, base_growth = estimate_p_ai_from_forecasts()
@@ -192,6 +246,417 @@ def get_calibrated_scenarios() -> Dict[str, Dict]:
     return scenarios
 
 
+def fit_calibration_cdfs(
+    forecasts: List[ForecastPoint] = None,
+    cases: List[HistoricalCase] = None,
+    n_bootstrap: int = 2000,
+    seed: int = 0,
+    cache_dir: Optional[str] = None
+) -> Dict:
+    """
+    Fit parametric CDFs with bootstrap to the forecasts and historical durations.
+
+    Returns:
+        {"forecasts": {family: CDFFit}, "durations": {family: CDFFit}}
+    """
+    forecasts = forecasts or AI_FORECASTS
+    cases = cases or HISTORICAL_CASES
+    return fit_calibration_data(
+        [f.year for f in forecasts], [f.probability for f in forecasts],
+        [c.duration for c in cases], n_bootstrap=n_bootstrap, seed=seed,
+        cache_dir=cache_dir)
+
+
+def sample_calibrated_scenarios(
+    n_samples: int,
+    seed: int = 0,
+    current_year: int = 2025,
+    forecasts: List[ForecastPoint] = None,
+    cases: List[HistoricalCase] = None,
+    n_bootstrap: int = 2000,
+    cache_dir: Optional[str] = None
+) -> Dict[str, Dict]:
+    """
+    Draw scenarios from the bootstrap distributions of the best-fitting CDFs.
+
+    Each scenario pairs one bootstrap forecast CDF F with one bootstrap
+    duration distribution:
+    - cycle_duration, cycle_std: mean and std of the duration distribution
+    - p_ai: P_AI_USAGE * F(current_year)
+    - growth: least-squares fit (in logs) of the Monte Carlo path
+      p_ai * (1 + growth)^k to P_AI_USAGE * F(current_year + k *
+      cycle_duration) at cycle boundaries k = 0..GROWTH_FIT_CYCLES, clipped
+      to the growth prior of PARAMETER_PRIORS
+
+    The forecasts all fall within the first cycle, where F rises from a small
+    value, so matching the first cycle alone (or the forecast horizons)
+    gives growth rates of 5 and more per cycle. Over three cycles F is near
+    its plateau and the fit agrees with the ABC-SMC posterior (median
+    growth about 1.3 against 1.1). Longer windows weight the plateau more
+    and give lower growth.
+
+    Returns:
+        {"sample_i": {p_ai, growth, cycle_duration, cycle_std, description}}
+    """
+    fits = fit_calibration_cdfs(forecasts, cases, n_bootstrap=n_bootstrap, seed=seed,
+                                cache_dir=cache_dir)
+    forecast_fit = best_fit(fits["forecasts"])
+    duration_fit = best_fit(fits["durations"])
+
+    rng = np.random.default_rng(seed)
+    f_params = forecast_fit.boot[rng.integers(0, len(forecast_fit.boot), n_samples)]
+    d_params = duration_fit.boot[rng.integers(0, len(duration_fit.boot), n_samples)]
+
+    cycle_mean, cycle_std = distribution_moments(duration_fit.family, d_params)
+    t0 = current_year - FORECAST_ORIGIN
+    p_ai = np.clip(P_AI_USAGE * forecast_fit.cdf(t0, f_params), 1e-4, P_AI_MAX)
+
+    # Slope of log p_AI against the cycle index, through log p_ai at k = 0
+    k = np.arange(1, GROWTH_FIT_CYCLES + 1)
+    path = np.stack([forecast_fit.cdf(t0 + i * cycle_mean, f_params) for i in k],
+                    axis=1)
+    log_ratio = np.log(np.clip(P_AI_USAGE * path, 1e-4, P_AI_MAX) / p_ai[:, None])
+    slope = log_ratio @ k / (k @ k)
+    growth = np.clip(np.expm1(slope), *PARAMETER_PRIORS["growth"])
+
+    description = (f"Bootstrap draw ({forecast_fit.family} forecast CDF, "
+                   f"{duration_fit.family} durations)")
+    return {
+        f"sample_{i}": {
+            'p_ai': float(p_ai[i]),
+            'growth': float(growth[i]),
+            'cycle_duration': float(cycle_mean[i]),
+            'cycle_std': float(cycle_std[i]),
+            'description': description,
+        }
+        for i in range(n_samples)
+    }
+
+
+# ============================================================================
+# ABC-SMC calibration
+# ============================================================================
+
+# Assumed P(AI used for TCS | AGI exists), as in estimate_p_ai_from_forecasts
+P_AI_USAGE = 0.8
+
+# Cap on p_AI, as in the Go model (p_ai_max)
+P_AI_MAX = 0.99
+
+# Cycles over which sample_calibrated_scenarios fits growth to the forecast CDF
+GROWTH_FIT_CYCLES = 3
+
+# Uniform prior bounds of the calibrated Monte Carlo parameters
+PARAMETER_PRIORS = {
+    "p_ai": (0.01, 0.30),
+    "growth": (0.0, 2.0),
+    "cycle_duration": (10.0, 100.0),
+    "cycle_std": (1.0, 50.0),
+}
+
+# Distance scale of a forecast probability error (5 percentage points)
+FORECAST_SCALE = 0.05
+
+# Cycles drawn per candidate for the p_AI clock (enough to pass any forecast year)
+CLOCK_CYCLES = 32
+
+# Particle differences held in memory at once by the importance weight step
+# (new particles x old particles x parameters)
+KERNEL_CHUNK_ELEMENTS = 1 << 22
+
+
+@dataclass
+class ABCResult:
+    """
+    Weighted posterior sample from abc_smc().
+
+    Attributes:
+        names: Parameter names (columns of samples)
+        samples: Accepted particles, shape (n_particles, n_params)
+        weights: Normalized importance weights
+        distances: Distance of each accepted particle
+        epsilons: Tolerance of each generation
+        acceptance_rates: Fraction of proposals accepted per generation
+        n_simulations: Total simulator calls
+    """
+    names: List[str]
+    samples: np.ndarray
+    weights: np.ndarray
+    distances: np.ndarray
+    epsilons: List[float] = field(default_factory=list)
+    acceptance_rates: List[float] = field(default_factory=list)
+    n_simulations: int = 0
+
+    def mean(self) -> Dict[str, float]:
+        """Posterior mean of each parameter."""
+        means = self.weights @ self.samples
+        return {name: float(v) for name, v in zip(self.names, means)}
+
+    def quantiles(self, q: List[float]) -> Dict[str, np.ndarray]:
+        """Weighted posterior quantiles of each parameter."""
+        out = {}
+        for i, name in enumerate(self.names):
+            order = np.argsort(self.samples[:, i])
+            cdf = np.cumsum(self.weights[order])
+            index = np.searchsorted(cdf, np.asarray(q) * cdf[-1])
+            out[name] = self.samples[order, i][index]
+        return out
+
+    def sample(self, n: int, seed: Optional[int] = None) -> np.ndarray:
+        """Draw n parameter vectors from the weighted posterior."""
+        rng = np.random.default_rng(seed)
+        return self.samples[rng.choice(len(self.samples), size=n, p=self.weights)]
+
+    def to_scenarios(self, n: int, seed: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Posterior draws as scenario dicts (same keys as get_calibrated_scenarios).
+
+        Each scenario maps onto the Go model's -p-ai, -growth, -cycle and
+        -cycle-std flags.
+        """
+        draws = self.sample(n, seed)
+        return {
+            f"posterior_{i}": {
+                **{name: float(value) for name, value in zip(self.names, row)},
+                "description": "ABC-SMC posterior draw",
+            }
+            for i, row in enumerate(draws)
+        }
+
+
+def observed_summaries(
+    forecasts: List[ForecastPoint] = None,
+    cases: List[HistoricalCase] = None,
+    current_year: int = 2025
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Observed data in the form the ABC simulator reproduces.
+
+    Returns:
+        (forecast horizons in years, target p_AI at each horizon,
+        duration summaries [mean, std, q25, q75])
+    """
+    forecasts = forecasts or AI_FORECASTS
+    cases = cases or HISTORICAL_CASES
+
+    horizons = np.array([f.year - current_year for f in forecasts], dtype=float)
+    targets = P_AI_USAGE * np.array([f.probability for f in forecasts])
+    durations = np.array([c.duration for c in cases], dtype=float)
+    return horizons, targets, _duration_summaries(durations[None, :])[0]
+
+
+def _duration_summaries(durations: np.ndarray) -> np.ndarray:
+    """Mean, std and quartiles of each row of durations."""
+    q25, q75 = np.quantile(durations, [0.25, 0.75], axis=1)
+    return np.column_stack([durations.mean(axis=1), durations.std(axis=1), q25, q75])
+
+
+def _abc_distances(args: tuple) -> np.ndarray:
+    """
+    Simulate a batch of parameter vectors and return their distances.
+
+    Module-level so that it can run in a process pool.
+
+    Args:
+        args: (theta, seed, horizons, targets, observed_durations, n_cases),
+            theta with columns ordered as PARAMETER_PRIORS
+    """
+    theta, seed, horizons, targets, observed_durations, n_cases = args
+    rng = np.random.default_rng(seed)
+    p_ai, growth, cycle, cycle_std = theta.T
+
+    # p_AI at each forecast horizon: grows once per completed cycle
+    clock = np.maximum(1.0, cycle[:, None] + cycle_std[:, None]
+                       * rng.standard_normal((len(theta), CLOCK_CYCLES))).cumsum(axis=1)
+    completed = (clock[:, :, None] <= horizons[None, None, :]).sum(axis=1)
+    path = np.minimum(P_AI_MAX, p_ai[:, None] * (1 + growth[:, None]) ** completed)
+    forecast_error = (path - targets) / FORECAST_SCALE
+
+    # Synthetic historical durations, drawn like the Go model's cycle lengths
+    durations = np.maximum(1.0, cycle[:, None] + cycle_std[:, None]
+                           * rng.standard_normal((len(theta), n_cases)))
+    duration_error = ((_duration_summaries(durations) - observed_durations)
+                      / observed_durations[1])
+
+    return np.sqrt((forecast_error ** 2).sum(axis=1)
+                   + (duration_error ** 2).sum(axis=1))
+
+
+def _evaluate(theta: np.ndarray, seed_seq: np.random.SeedSequence, problem: tuple,
+              n_workers: Optional[int], executor: Optional[Executor]) -> np.ndarray:
+    """Distances for theta, split into one chunk per worker and run on executor."""
+    chunks = np.array_split(theta, max(1, min(n_workers or 1, len(theta))))
+    seeds = seed_seq.spawn(len(chunks))
+    jobs = [(chunk, seed, *problem) for chunk, seed in zip(chunks, seeds)]
+
+    if executor is not None:
+        parts = list(executor.map(_abc_distances, jobs))
+    else:
+        parts = [_abc_distances(job) for job in jobs]
+    return np.concatenate(parts)
+
+
+def _log_kernel_mixture(points: np.ndarray, particles: np.ndarray,
+                        weights: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    """
+    Log density (up to a constant) of each point under the weighted mixture
+    of Gaussian kernels with covariance cov centred on the particles.
+
+    Points are processed in row chunks of KERNEL_CHUNK_ELEMENTS differences,
+    so memory does not grow with the square of the particle count.
+    """
+    inv = np.linalg.inv(cov)
+    log_weights = np.log(weights)[None, :]
+    n, d = particles.shape
+    chunk = max(1, KERNEL_CHUNK_ELEMENTS // max(n * d, 1))
+    log_den = np.empty(len(points))
+    for start in range(0, len(points), chunk):
+        diff = points[start:start + chunk, None, :] - particles[None, :, :]
+        log_kernel = -0.5 * np.einsum("ijk,kl,ijl->ij", diff, inv, diff)
+        log_den[start:start + chunk] = np.logaddexp.reduce(log_weights + log_kernel,
+                                                           axis=1)
+    return log_den
+
+
+def abc_smc(
+    n_particles: int = 1000,
+    n_generations: int = 10,
+    quantile: float = 0.5,
+    batch_size: int = 100_000,
+    min_acceptance: float = 0.001,
+    forecasts: List[ForecastPoint] = None,
+    cases: List[HistoricalCase] = None,
+    current_year: int = 2025,
+    priors: Dict[str, Tuple[float, float]] = None,
+    n_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    seed: Optional[int] = None,
+    verbose: bool = True
+) -> ABCResult:
+    """
+    Calibrate the Monte Carlo parameters to forecasts and historical cases.
+
+    Generation 0 keeps the n_particles closest of batch_size prior draws.
+    Each later generation sets its tolerance to the given quantile of the
+    previous distances, proposes batch_size candidates at a time by
+    perturbing resampled particles with a Gaussian kernel (twice the
+    weighted particle covariance), and accepts those within tolerance until
+    n_particles are collected. Weights are prior / kernel mixture density.
+    Stops early once the acceptance rate falls below min_acceptance.
+
+    Args:
+        n_particles: Posterior sample size
+        n_generations: Maximum number of SMC generations
+        quantile: Quantile of previous distances used as the next tolerance
+        batch_size: Candidates simulated per vectorized batch
+        min_acceptance: Stop when a generation accepts fewer proposals than this
+        forecasts: AGI forecasts (default: AI_FORECASTS)
+        cases: Historical cases (default: HISTORICAL_CASES)
+        current_year: Year the forecasts are measured from
+        priors: Uniform prior bounds per parameter (default: PARAMETER_PRIORS)
+        n_workers: Number of parallel workers, and of chunks per batch
+            (default: sequential); one pool serves the whole run
+        executor: Existing executor to evaluate the chunks on
+        seed: Random seed
+        verbose: Print progress per generation
+
+    Returns:
+        ABCResult with the final generation's weighted particles
+    """
+    if executor is None and n_workers is not None and n_workers > 1:
+        # One pool for every batch of every generation
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            return abc_smc(n_particles, n_generations, quantile, batch_size,
+                           min_acceptance, forecasts, cases, current_year, priors,
+                           n_workers, pool, seed, verbose)
+
+    priors = priors or PARAMETER_PRIORS
+    names = list(priors)
+    low = np.array([priors[n][0] for n in names])
+    high = np.array([priors[n][1] for n in names])
+
+    horizons, targets, observed_durations = observed_summaries(forecasts, cases,
+                                                               current_year)
+    problem = (horizons, targets, observed_durations, len(cases or HISTORICAL_CASES))
+
+    seed_seq = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(seed_seq.spawn(1)[0])
+
+    # Generation 0: best n_particles of a batch of prior draws
+    theta = low + (high - low) * rng.random((max(batch_size, n_particles), len(names)))
+    distances = _evaluate(theta, seed_seq.spawn(1)[0], problem, n_workers, executor)
+    keep = np.argsort(distances)[:n_particles]
+    particles, distances = theta[keep], distances[keep]
+    weights = np.full(n_particles, 1.0 / n_particles)
+
+    result = ABCResult(names, particles, weights, distances,
+                       epsilons=[float(distances.max())],
+                       acceptance_rates=[n_particles / len(theta)],
+                       n_simulations=len(theta))
+    if verbose:
+        print(f"  generation 0: eps={result.epsilons[-1]:.3f} "
+              f"({len(theta)} simulations)")
+
+    for generation in range(1, n_generations):
+        epsilon = float(np.quantile(distances, quantile))
+        cov = 2 * np.cov(particles, rowvar=False, aweights=weights)
+        chol = np.linalg.cholesky(cov + 1e-12 * np.eye(len(names)))
+
+        accepted_theta, accepted_dist = [], []
+        n_accepted = n_proposed = 0
+        while n_accepted < n_particles:
+            parents = particles[rng.choice(n_particles, size=batch_size, p=weights)]
+            steps = rng.standard_normal((batch_size, len(names))) @ chol.T
+            candidates = parents + steps
+            candidates = candidates[np.all((candidates >= low) & (candidates <= high),
+                                           axis=1)]
+            n_proposed += batch_size
+            if len(candidates) == 0:
+                continue
+
+            d = _evaluate(candidates, seed_seq.spawn(1)[0], problem, n_workers,
+                          executor)
+            result.n_simulations += len(candidates)
+            ok = d <= epsilon
+            accepted_theta.append(candidates[ok])
+            accepted_dist.append(d[ok])
+            n_accepted += int(ok.sum())
+
+            if (n_accepted / n_proposed < min_acceptance
+                    and n_proposed >= 10 * batch_size):
+                break
+
+        acceptance = n_accepted / n_proposed
+        if n_accepted < n_particles:
+            if verbose:
+                print(f"  generation {generation}: acceptance {acceptance:.4f} "
+                      f"below {min_acceptance}, stopping")
+            break
+
+        new_particles = np.vstack(accepted_theta)[:n_particles]
+        new_distances = np.concatenate(accepted_dist)[:n_particles]
+
+        # Importance weights: uniform prior over the perturbation kernel mixture
+        log_w = -_log_kernel_mixture(new_particles, particles, weights, cov)
+        weights = np.exp(log_w - log_w.max())
+        weights /= weights.sum()
+        particles, distances = new_particles, new_distances
+
+        result.samples, result.weights, result.distances = particles, weights, distances
+        result.epsilons.append(epsilon)
+        result.acceptance_rates.append(acceptance)
+        if verbose:
+            ess = 1.0 / np.sum(weights ** 2)
+            print(f"  generation {generation}: eps={epsilon:.3f} "
+                  f"acceptance={acceptance:.3f} ESS={ess:.0f} "
+                  f"({result.n_simulations} simulations)")
+
+        if acceptance < min_acceptance:
+            break
+
+    return result
+
+
 def print_calibration_summary():
     """Print summary of calibration data and estimates."""
 
@@ -215,6 +680,17 @@ def print_calibration_summary():
     print(f"\n  → Mean duration: {mean_dur:.0f} years")
     print(f"  → Std deviation: {std_dur:.0f} years")
 
+    print("\n### Parametric CDF Fits (SSE, bootstrap 90% interval) ###\n")
+    fits = fit_calibration_cdfs()
+    for kind, by_family in fits.items():
+        best = best_fit(by_family).family
+        for family, fit in by_family.items():
+            lo, hi = np.percentile(fit.boot, [5, 95], axis=0)
+            marker = " *" if family == best else ""
+            print(f"  {kind} {family}: ({fit.params[0]:.2f} [{lo[0]:.2f}-{hi[0]:.2f}], "
+                  f"{fit.params[1]:.2f} [{lo[1]:.2f}-{hi[1]:.2f}]) "
+                  f"SSE {fit.sse:.4f}{marker}")
+
     print("\n### Calibrated Scenarios ###\n")
     scenarios = get_calibrated_scenarios()
     for name, params in scenarios.items():
@@ -229,4 +705,62 @@ def print_calibration_summary():
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Parameter calibration summary and ABC-SMC fit")
+    parser.add_argument("--abc", action="store_true", help="Run ABC-SMC calibration")
+    parser.add_argument("--particles", type=int, default=1000,
+                        help="Posterior sample size")
+    parser.add_argument("--generations", type=int, default=10,
+                        help="Maximum SMC generations")
+    parser.add_argument("--batch", type=int, default=100_000,
+                        help="Candidates per vectorized batch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--scenarios", type=int, default=0,
+                        help="Print this many posterior draws as scenarios")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Save posterior samples and weights (.npz)")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="Print this many scenarios sampled from the bootstrap "
+                             "CDF fits")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Directory for cached CDF fits")
+
+    args = parser.parse_args()
+
     print_calibration_summary()
+
+    if args.samples:
+        print("\n### Sampled Scenarios ###\n")
+        samples = get_calibrated_scenarios(args.samples, seed=args.seed,
+                                           cache_dir=args.cache_dir)
+        for name, params in samples.items():
+            print(f"  {name}: p_ai={params['p_ai']:.3f} growth={params['growth']:.3f} "
+                  f"cycle={params['cycle_duration']:.1f}±{params['cycle_std']:.1f}")
+
+    if args.abc:
+        print("\n### ABC-SMC Calibration ###\n")
+        posterior = abc_smc(n_particles=args.particles, n_generations=args.generations,
+                            batch_size=args.batch, n_workers=args.workers,
+                            seed=args.seed)
+        q = posterior.quantiles([0.05, 0.5, 0.95])
+        print()
+        for name in posterior.names:
+            lo, mid, hi = q[name]
+            print(f"  {name}: {mid:.3f} (90% interval {lo:.3f}-{hi:.3f})")
+        print(f"  {posterior.n_simulations} simulator calls, "
+              f"final tolerance {posterior.epsilons[-1]:.3f}")
+
+        scenarios = posterior.to_scenarios(args.scenarios, seed=args.seed)
+        for name, params in scenarios.items():
+            print(f"  {name}: p_ai={params['p_ai']:.3f} growth={params['growth']:.3f} "
+                  f"cycle={params['cycle_duration']:.1f}±{params['cycle_std']:.1f}")
+
+        if args.output:
+            np.savez(args.output, names=np.array(posterior.names),
+                     samples=posterior.samples, weights=posterior.weights,
+                     distances=posterior.distances,
+                     epsilons=np.array(posterior.epsilons))
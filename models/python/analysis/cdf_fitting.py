@@ -0,0 +1,287 @@
+"""
+Parametric CDF Fitting with Bootstrap Uncertainty
+
+Fits logistic, Weibull and lognormal CDFs to the AGI forecast points and
+to the historical coordination durations, and bootstraps the fits.
+
+Every family is fitted by least squares on its linearizing transform:
+- logistic:  logit(F)         = (x - mu) / s
+- Weibull:   log(-log(1 - F)) = k log(x) - k log(lambda)
+- lognormal: probit(F)        = (log(x) - mu) / sigma
+
+so a fit is a weighted simple regression, and all bootstrap resamples are
+fitted at once as one batched NumPy operation. Forecasts are resampled as
+multinomial weights over the forecast points; durations are resampled,
+sorted and paired with median ranks (i - 0.3) / (n + 0.4).
+
+fit_calibration_data() caches its result on disk keyed by a hash of the
+input data and settings, so scenario sampling can run on every build.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+FAMILIES = ["logistic", "weibull", "lognormal"]
+
+# Forecast years are measured from this year (Weibull and lognormal need x > 0)
+FORECAST_ORIGIN = 2020
+
+# Probabilities are clipped into (0, 1) before transforming
+_EPS = 1e-6
+
+
+@dataclass
+class CDFFit:
+    """
+    Point fit and bootstrap distribution of one CDF family.
+
+    Attributes:
+        family: "logistic", "weibull" or "lognormal"
+        params: Point estimate (location/shape, scale) - (mu, s) for
+            logistic, (k, lambda) for Weibull, (mu, sigma) for lognormal
+        boot: Bootstrap parameter draws, shape (n_valid, 2)
+        sse: Sum of squared CDF errors of the point fit
+    """
+    family: str
+    params: np.ndarray
+    boot: np.ndarray
+    sse: float
+
+    def cdf(self, x, params: np.ndarray = None) -> np.ndarray:
+        """CDF at x under params (default: the point fit)."""
+        return cdf(self.family, self.params if params is None else params, x)
+
+
+def _transform(family: str, x: np.ndarray, probs: np.ndarray) -> tuple:
+    """Linearizing transform: (x_t, y_t) with y_t = slope * x_t + intercept."""
+    from scipy.special import ndtri
+
+    probs = np.clip(probs, _EPS, 1 - _EPS)
+    if family == "logistic":
+        return x, np.log(probs / (1 - probs))
+    if family == "weibull":
+        return np.log(x), np.log(-np.log1p(-probs))
+    if family == "lognormal":
+        return np.log(x), ndtri(probs)
+    raise ValueError(f"Unknown CDF family: {family} (choose from {FAMILIES})")
+
+
+def _params_from_line(family: str, slope: np.ndarray,
+                      intercept: np.ndarray) -> np.ndarray:
+    """Family parameters from the regression line(s), shape (..., 2)."""
+    if family == "logistic":
+        return np.stack([-intercept / slope, 1 / slope], axis=-1)
+    if family == "weibull":
+        return np.stack([slope, np.exp(-intercept / slope)], axis=-1)
+    return np.stack([-intercept / slope, 1 / slope], axis=-1)
+
+
+def cdf(family: str, params: np.ndarray, x) -> np.ndarray:
+    """
+    Evaluate a CDF family at x.
+
+    Args:
+        family: One of FAMILIES
+        params: Parameters, shape (..., 2); params[..., 0] and params[..., 1]
+            broadcast against x (add axes for an outer product)
+        x: Evaluation points
+
+    Returns:
+        CDF values with the broadcast shape
+    """
+    from scipy.special import ndtr
+
+    params = np.asarray(params, dtype=float)
+    x = np.asarray(x, dtype=float)
+    a, b = params[..., 0], params[..., 1]
+    if family == "logistic":
+        return 1 / (1 + np.exp(-(x - a) / b))
+    if family == "weibull":
+        return -np.expm1(-(np.maximum(x, 0) / b) ** a)
+    if family == "lognormal":
+        with np.errstate(divide="ignore"):
+            return ndtr((np.log(np.maximum(x, 0)) - a) / b)
+    raise ValueError(f"Unknown CDF family: {family} (choose from {FAMILIES})")
+
+
+def distribution_moments(family: str, params: np.ndarray) -> tuple:
+    """Mean and standard deviation of a fitted family, per parameter row."""
+    from scipy.special import gamma
+
+    a, b = params[..., 0], params[..., 1]
+    if family == "logistic":
+        return a, b * np.pi / np.sqrt(3)
+    if family == "weibull":
+        g1, g2 = gamma(1 + 1 / a), gamma(1 + 2 / a)
+        return b * g1, b * np.sqrt(np.maximum(g2 - g1 ** 2, 0))
+    if family == "lognormal":
+        mean = np.exp(a + b ** 2 / 2)
+        return mean, mean * np.sqrt(np.expm1(b ** 2))
+    raise ValueError(f"Unknown CDF family: {family} (choose from {FAMILIES})")
+
+
+def fit_cdf(family: str, x: np.ndarray, probs: np.ndarray,
+            weights: np.ndarray = None) -> np.ndarray:
+    """
+    Fit a CDF family to (x, probs) points by weighted least squares on its
+    linearizing transform, for any number of leading batch dimensions.
+
+    Args:
+        family: One of FAMILIES
+        x: Points, shape (..., n)
+        probs: CDF values at the points, broadcastable to x
+        weights: Point weights, broadcastable to x (default: equal)
+
+    Returns:
+        Parameters, shape (..., 2); NaN where the fit is degenerate or
+        not increasing
+    """
+    x_t, y_t = _transform(family, np.asarray(x, dtype=float),
+                          np.asarray(probs, dtype=float))
+    w = np.ones(1) if weights is None else np.asarray(weights, dtype=float)
+    x_t, y_t, w = np.broadcast_arrays(x_t, y_t, w)
+
+    total = w.sum(axis=-1, keepdims=True)
+    x_mean = (w * x_t).sum(axis=-1, keepdims=True) / total
+    y_mean = (w * y_t).sum(axis=-1, keepdims=True) / total
+    sxx = (w * (x_t - x_mean) ** 2).sum(axis=-1)
+    sxy = (w * (x_t - x_mean) * (y_t - y_mean)).sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        slope = sxy / sxx
+        intercept = y_mean[..., 0] - slope * x_mean[..., 0]
+        params = _params_from_line(family, slope, intercept)
+    params[~(slope > 0)] = np.nan
+    return params
+
+
+def _valid(params: np.ndarray) -> np.ndarray:
+    ok = np.all(np.isfinite(params), axis=-1) & np.all(params[..., 1:] > 0, axis=-1)
+    return params[ok]
+
+
+def fit_forecasts(years: np.ndarray, probabilities: np.ndarray, family: str,
+                  n_bootstrap: int, rng: np.random.Generator,
+                  origin: int = FORECAST_ORIGIN) -> CDFFit:
+    """Fit a family to forecast points and bootstrap by resampling the points."""
+    x = np.asarray(years, dtype=float) - origin
+    probs = np.asarray(probabilities, dtype=float)
+
+    params = fit_cdf(family, x, probs)
+    counts = rng.multinomial(len(x), np.full(len(x), 1 / len(x)), size=n_bootstrap)
+    boot = _valid(fit_cdf(family, x, probs, weights=counts))
+    sse = float(np.sum((cdf(family, params, x) - probs) ** 2))
+    return CDFFit(family, params, boot, sse)
+
+
+def fit_durations(durations: np.ndarray, family: str, n_bootstrap: int,
+                  rng: np.random.Generator) -> CDFFit:
+    """Fit a family to durations on median ranks and bootstrap by resampling them."""
+    d = np.sort(np.asarray(durations, dtype=float))
+    n = len(d)
+    ranks = (np.arange(1, n + 1) - 0.3) / (n + 0.4)
+
+    params = fit_cdf(family, d, ranks)
+    resamples = np.sort(d[rng.integers(0, n, size=(n_bootstrap, n))], axis=1)
+    boot = _valid(fit_cdf(family, resamples, ranks))
+    sse = float(np.sum((cdf(family, params, d) - ranks) ** 2))
+    return CDFFit(family, params, boot, sse)
+
+
+def _cache_key(years, probabilities, durations, families, n_bootstrap, seed,
+               origin) -> str:
+    spec = json.dumps({
+        "years": [float(y) for y in years],
+        "probabilities": [float(p) for p in probabilities],
+        "durations": [float(d) for d in durations],
+        "families": list(families),
+        "n_bootstrap": n_bootstrap,
+        "seed": seed,
+        "origin": origin,
+    }, sort_keys=True)
+    return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+
+def _save_fits(path: str, fits: Dict[str, Dict[str, CDFFit]]) -> None:
+    arrays = {}
+    for kind, by_family in fits.items():
+        for family, fit in by_family.items():
+            arrays[f"{kind}/{family}/params"] = fit.params
+            arrays[f"{kind}/{family}/boot"] = fit.boot
+            arrays[f"{kind}/{family}/sse"] = np.array(fit.sse)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def _load_fits(path: str) -> Dict[str, Dict[str, CDFFit]]:
+    fits = {}
+    with np.load(path) as data:
+        for key in data.files:
+            kind, family, name = key.split("/")
+            if name == "params":
+                fits.setdefault(kind, {})[family] = CDFFit(
+                    family, data[key], data[f"{kind}/{family}/boot"],
+                    float(data[f"{kind}/{family}/sse"]))
+    return fits
+
+
+def fit_calibration_data(
+    years: List[int],
+    probabilities: List[float],
+    durations: List[float],
+    families: List[str] = None,
+    n_bootstrap: int = 2000,
+    seed: int = 0,
+    origin: int = FORECAST_ORIGIN,
+    cache_dir: Optional[str] = None
+) -> Dict[str, Dict[str, CDFFit]]:
+    """
+    Fit every family to the forecasts and the durations, with bootstrap.
+
+    Args:
+        years: Forecast years
+        probabilities: P(AGI by year) for each forecast
+        durations: Historical coordination durations in years
+        families: CDF families to fit (default: FAMILIES)
+        n_bootstrap: Bootstrap resamples per fit
+        seed: Seed for the resampling
+        origin: Year forecast times are measured from
+        cache_dir: Directory for cached fits (keyed by a hash of all inputs)
+
+    Returns:
+        {"forecasts": {family: CDFFit}, "durations": {family: CDFFit}}
+    """
+    families = families or FAMILIES
+
+    cache_path = None
+    if cache_dir:
+        key = _cache_key(years, probabilities, durations, families, n_bootstrap, seed,
+                         origin)
+        cache_path = os.path.join(cache_dir, f"cdf_fits_{key}.npz")
+        if os.path.exists(cache_path):
+            return _load_fits(cache_path)
+
+    rng = np.random.default_rng(seed)
+    fits = {
+        "forecasts": {f: fit_forecasts(years, probabilities, f, n_bootstrap, rng,
+                                       origin)
+                      for f in families},
+        "durations": {f: fit_durations(durations, f, n_bootstrap, rng)
+                      for f in families},
+    }
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        _save_fits(cache_path, fits)
+    return fits
+
+
+def best_fit(fits: Dict[str, CDFFit]) -> CDFFit:
+    """The family with the smallest SSE."""
+    return min(fits.values(), key=lambda fit: fit.sse)
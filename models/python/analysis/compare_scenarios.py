@@ -4,17 +4,24 @@ Compare Monte Carlo Scenario Results
 Creates publication-quality comparison figures across pessimistic, baseline, and optimistic scenarios.
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import json
 import argparse
+import json
+import os
+import sys
 from pathlib import Path
 
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.visualize_montecarlo import load_montecarlo_csv
+
 
 def load_scenario(csv_path: str, json_path: str, name: str) -> dict:
     """Load a single scenario's results."""
-    df = pd.read_csv(csv_path)
+    df = load_montecarlo_csv(csv_path)
     with open(json_path) as f:
         stats = json.load(f)
     return {
@@ -138,37 +145,55 @@ def plot_scenario_comparison(scenarios: list, output_path: str = None):
 
 
 def plot_timeline_ranges(scenarios: list, output_path: str = None):
-    """Create a timeline visualization showing probability ranges."""
-    fig, ax = plt.subplots(figsize=(14, 6))
+    """
+    Create a timeline visualization showing probability ranges.
 
-    colors = {'Pessimistic': '#d62728', 'Baseline': '#1f77b4', 'Optimistic': '#2ca02c'}
+    Entries need 'name' and 'stats' (Go stats keys); an optional
+    stats['median_band'] = (low, high), as produced by
+    uncertainty.NestedResult.timeline_entries(), is drawn as an error bar
+    on the median.
+    """
+    fig, ax = plt.subplots(figsize=(14, 2 * len(scenarios)))
+
+    colors = {'Pessimistic': '#d62728', 'Baseline': '#1f77b4', 'Optimistic': '#2ca02c',
+              'Calibrated': '#9467bd'}
 
-    y_positions = [2, 1, 0]
+    y_positions = list(range(len(scenarios) - 1, -1, -1))
 
     for i, scenario in enumerate(scenarios):
         name = scenario['name']
         s = scenario['stats']
         y = y_positions[i]
+        color = colors.get(name, f"C{i}")
 
         # Plot range bar (5th to 95th percentile)
         ax.barh(y, s['p95_time'] - s['p5_time'], left=s['p5_time'],
-               height=0.6, color=colors[name], alpha=0.3,
+               height=0.6, color=color, alpha=0.3,
                label=f"{name} (90% CI)")
 
         # Plot IQR (25th to 75th percentile)
         ax.barh(y, s['p75_time'] - s['p25_time'], left=s['p25_time'],
-               height=0.6, color=colors[name], alpha=0.6)
+               height=0.6, color=color, alpha=0.6)
 
         # Plot median line
         ax.plot([s['median_time'], s['median_time']], [y - 0.3, y + 0.3],
                color='white', linewidth=3)
         ax.plot([s['median_time'], s['median_time']], [y - 0.3, y + 0.3],
-               color=colors[name], linewidth=2)
+               color=color, linewidth=2)
+
+        # Parameter uncertainty of the median
+        annotation = ""
+        if 'median_band' in s:
+            lo, hi = s['median_band']
+            ax.errorbar(s['median_time'], y + 0.4,
+                        xerr=[[s['median_time'] - lo], [hi - s['median_time']]],
+                        fmt='none', ecolor='black', capsize=4, linewidth=1.5)
+            annotation = f"\nMedian band: [{lo:.0f}, {hi:.0f}]"
 
         # Annotate
         ax.text(s['p95_time'] + 20, y,
                f"Median: {s['median_time']:.0f} yrs\n"
-               f"90% CI: [{s['p5_time']:.0f}, {s['p95_time']:.0f}]",
+               f"90% CI: [{s['p5_time']:.0f}, {s['p95_time']:.0f}]" + annotation,
                va='center', fontsize=9)
 
     ax.set_yticks(y_positions)
@@ -182,7 +207,8 @@ def plot_timeline_ranges(scenarios: list, output_path: str = None):
     for year in [100, 500, 1000, 1500, 2000]:
         if year < ax.get_xlim()[1]:
             ax.axvline(year, color='gray', linestyle=':', alpha=0.3)
-            ax.text(year, 2.5, f"{year}", ha='center', fontsize=8, color='gray')
+            ax.text(year, len(scenarios) - 0.5, f"{year}", ha='center', fontsize=8,
+                    color='gray')
 
     plt.tight_layout()
 
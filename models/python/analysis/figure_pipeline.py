@@ -0,0 +1,536 @@
+"""
+Figure Pipeline
+
+Dependency-aware runner for every figure in the paper. Each stage declares
+the source files, parameters and data files it reads and the files it
+writes; stages whose inputs are unchanged since their last successful run
+are skipped, and stages whose inputs are ready run concurrently. A full
+rebuild therefore takes about as long as the longest chain of stages
+(Go Monte Carlo -> scenario figures) rather than the sum of all of them.
+
+Stages:
+- Go data: the three Monte Carlo scenarios and the bifurcation sweep
+- ABM runs: corruption dynamics, cooperation threshold, governance comparison
+- Figures: bifurcation, Monte Carlo, scenario comparison and each diagram
+
+A stage's hash covers its command, the contents of its source files and
+the contents of its input data files, so a stage downstream of a Go run
+only reruns when the Go output actually changed. The sources of a Python
+stage also include every abm/analysis module its target imports, found
+by parsing the imports, so the declared lists cannot fall out of date.
+Hashes are stamped in data/simulations/.pipeline/ along with a log of each
+stage's output.
+
+Uses only the standard library so it can run on the host, where stages
+are launched through docker-compose (--runner docker, the default), or
+inside a development environment with Python and Go installed
+(--runner local).
+
+    python -m analysis.figure_pipeline --jobs 8
+    python -m analysis.figure_pipeline --only scenario_comparison --dry-run
+"""
+
+import ast
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+MODELS_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REPO_DIR = os.path.dirname(MODELS_DIR)
+DATA_DIR = os.path.join(REPO_DIR, "data", "simulations")
+FIGURES_DIR = os.path.join(REPO_DIR, "figures", "static")
+STAMP_DIR = os.path.join(DATA_DIR, ".pipeline")
+
+# Paths as seen by the stage commands, per runner. The abm and Go services
+# mount data/simulations at /app/output and figures/static at /app/figures.
+RUNNER_PATHS = {
+    "docker": {"data": "/app/output", "figures": "/app/figures"},
+    "local": {"data": DATA_DIR, "figures": FIGURES_DIR},
+}
+
+# docker-compose service for each Go binary
+GO_SERVICES = {"montecarlo": "montecarlo", "bifurcation": "bifurcation-go"}
+
+# Packages whose modules a Python stage's hash follows through imports
+PYTHON_PACKAGES = ("abm", "analysis")
+
+ABM_SOURCES = [
+    "python/abm/__init__.py",
+    "python/abm/events.py",
+    "python/abm/interventions.py",
+    "python/abm/plotting.py",
+    "python/abm/profiling.py",
+]
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline.
+
+    Args:
+        name: Stage name (used for --only, stamps and logs)
+        tool: "python" (target is a module) or "go" (target is a binary)
+        target: Module run with python -m, or Go binary name
+        args: Command-line arguments; {data} and {figures} are replaced
+            with the runner's data and figure directories
+        sources: Source files relative to models/ whose contents the
+            stage depends on
+        inputs: Data files the stage reads (same placeholders as args);
+            a stage depends on whichever stage produces them
+        outputs: Files the stage writes (same placeholders as args)
+    """
+    name: str
+    tool: str
+    target: str
+    args: list
+    sources: list
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+
+
+def _montecarlo_stage(name: str, csv_name: str, json_name: str, params: list) -> Stage:
+    return Stage(
+        name=name, tool="go", target="montecarlo",
+        args=params + ["-max-time", "1000",
+                       "-output", f"{{data}}/{csv_name}", "-json",
+                       f"{{data}}/{json_name}"],
+        sources=["go/go.mod", "go/montecarlo/main.go"],
+        outputs=[f"{{data}}/{csv_name}", f"{{data}}/{json_name}"],
+    )
+
+
+def _diagram_stage(flag: str, filename: str) -> Stage:
+    return Stage(
+        name=f"diagram_{flag.replace('-', '_')}", tool="python",
+        target="python.analysis.generate_diagrams",
+        args=[f"--{flag}", "--output", "{figures}"],
+        sources=["python/analysis/generate_diagrams.py"],
+        outputs=[f"{{figures}}/{filename}"],
+    )
+
+
+MONTECARLO_DATA = [
+    "{data}/montecarlo_pessimistic.csv", "{data}/montecarlo_pessimistic.json",
+    "{data}/montecarlo_results.csv", "{data}/montecarlo_stats.json",
+    "{data}/montecarlo_optimistic.csv", "{data}/montecarlo_optimistic.json",
+]
+
+STAGES = [
+    # Go data (same scenarios as `make montecarlo-scenarios`)
+    _montecarlo_stage("montecarlo_pessimistic", "montecarlo_pessimistic.csv",
+                      "montecarlo_pessimistic.json",
+                      ["-n", "100000", "-p-ai", "0.15", "-cycle", "35",
+                       "-cycle-std", "20", "-growth", "0.25"]),
+    _montecarlo_stage("montecarlo_baseline", "montecarlo_results.csv",
+                      "montecarlo_stats.json", ["-n", "100000"]),
+    _montecarlo_stage("montecarlo_optimistic", "montecarlo_optimistic.csv",
+                      "montecarlo_optimistic.json",
+                      ["-n", "100000", "-p-ai", "0.03", "-cycle", "60",
+                       "-cycle-std", "30", "-growth", "0.08"]),
+    Stage(
+        name="bifurcation_data", tool="go", target="bifurcation",
+        args=["-n", "1000", "-steps", "100", "-reps", "5", "-rates", "17",
+              "-output", "{data}/bifurcation_results.json"],
+        sources=["go/go.mod", "go/bifurcation/main.go"],
+        outputs=["{data}/bifurcation_results.json"],
+    ),
+
+    # ABM runs (the abm/* __main__ figures)
+    Stage(
+        name="corruption_dynamics", tool="python",
+        target="python.abm.corruption_dynamics",
+        args=["--steps", "200", "--enforcers", "100", "--seed", "42", "--output",
+              "{figures}"],
+        sources=ABM_SOURCES + ["python/abm/corruption_dynamics.py"],
+        outputs=["{figures}/corruption_dynamics.png"],
+    ),
+    Stage(
+        name="cooperation_threshold", tool="python",
+        target="python.abm.cooperation_threshold",
+        args=["--steps", "100", "--agents", "1000", "--seed", "42", "--output",
+              "{figures}"],
+        sources=ABM_SOURCES + ["python/abm/cooperation_threshold.py",
+                               "python/abm/networks.py"],
+        outputs=["{figures}/cooperation_threshold.png"],
+    ),
+    Stage(
+        name="governance_comparison", tool="python",
+        target="python.abm.polycentric_governance",
+        args=["--compare", "--steps", "200", "--participants", "100", "--output",
+              "{figures}"],
+        sources=ABM_SOURCES + ["python/abm/polycentric_governance.py"],
+        outputs=["{figures}/governance_comparison.png"],
+    ),
+
+    # Figures from Go data
+    Stage(
+        name="bifurcation_figure", tool="python",
+        target="python.analysis.visualize_bifurcation",
+        args=["--json", "{data}/bifurcation_results.json", "--output", "{figures}",
+              "--stats"],
+        sources=["python/analysis/visualize_bifurcation.py", "python/abm/plotting.py"],
+        inputs=["{data}/bifurcation_results.json"],
+        outputs=["{figures}/bifurcation_analysis.png"],
+    ),
+    Stage(
+        name="montecarlo_figures", tool="python",
+        target="python.analysis.visualize_montecarlo",
+        args=["--csv", "{data}/montecarlo_results.csv",
+              "--json", "{data}/montecarlo_stats.json", "--output", "{figures}"],
+        sources=["python/analysis/visualize_montecarlo.py",
+                 "python/analysis/montecarlo.py"],
+        inputs=["{data}/montecarlo_results.csv", "{data}/montecarlo_stats.json"],
+        outputs=["{figures}/montecarlo_time_dist.png",
+                 "{figures}/montecarlo_cycles_dist.png",
+                 "{figures}/montecarlo_dashboard.png"],
+    ),
+    Stage(
+        name="scenario_comparison", tool="python",
+        target="python.analysis.compare_scenarios",
+        args=["--data-dir", "{data}", "--output", "{figures}"],
+        sources=["python/analysis/compare_scenarios.py",
+                 "python/analysis/visualize_montecarlo.py",
+                 "python/analysis/montecarlo.py"],
+        inputs=MONTECARLO_DATA,
+        outputs=["{figures}/scenario_comparison.png", "{figures}/timeline_ranges.png"],
+    ),
+    Stage(
+        name="uncertainty_timeline", tool="python",
+        target="python.analysis.uncertainty",
+        args=["--outer", "200", "--inner", "10000", "--seed", "42",
+              "--json", "{data}/uncertainty_stats.json",
+              "--output", "{figures}/timeline_uncertainty.png"],
+        sources=["python/analysis/uncertainty.py", "python/analysis/montecarlo.py",
+                 "python/analysis/calibration.py", "python/analysis/cdf_fitting.py",
+                 "python/analysis/compare_scenarios.py",
+                 "python/analysis/visualize_montecarlo.py"],
+        outputs=["{data}/uncertainty_stats.json", "{figures}/timeline_uncertainty.png"],
+    ),
+
+    # Conceptual diagrams, one stage each
+    _diagram_stage("trilemma", "coordination_trilemma.png"),
+    _diagram_stage("state-machine", "default_trajectory_state_machine.png"),
+    _diagram_stage("degradation", "scale_degradation_curves.png"),
+    _diagram_stage("regress", "enforcement_regress.png"),
+    _diagram_stage("timeline", "detection_timeline.png"),
+    _diagram_stage("longevity", "longevity_scatter.png"),
+]
+
+
+def _expand(template: str, paths: dict) -> str:
+    return template.format(**paths)
+
+
+def build_graph(stages: list) -> dict:
+    """
+    Find each stage's upstream stages from its declared inputs.
+
+    Returns:
+        Dict mapping stage name -> set of stage names it depends on
+    """
+    producers = {}
+    for stage in stages:
+        for output in stage.outputs:
+            producers[output] = stage.name
+
+    graph = {}
+    for stage in stages:
+        graph[stage.name] = {producers[i] for i in stage.inputs if i in producers}
+    return graph
+
+
+def select_stages(stages: list, only: list = None) -> list:
+    """Stages named in only plus everything upstream of them (all if only is empty)."""
+    if not only:
+        return list(stages)
+
+    by_name = {s.name: s for s in stages}
+    unknown = sorted(set(only) - set(by_name))
+    if unknown:
+        raise ValueError(f"Unknown stages: {unknown} (choose from {list(by_name)})")
+
+    graph = build_graph(stages)
+    wanted = set()
+    todo = list(only)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo.extend(graph[name])
+    return [s for s in stages if s.name in wanted]
+
+
+def _hash_file(h, path: str) -> None:
+    h.update(path.encode())
+    if not os.path.exists(path):
+        h.update(b"<missing>")
+        return
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+
+
+def _module_path(module: str):
+    """Source file of an abm/analysis module relative to models/, or None."""
+    if module.split(".")[0] not in PYTHON_PACKAGES:
+        return None
+    base = os.path.join("python", *module.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.exists(os.path.join(MODELS_DIR, path)):
+            return path
+    return None
+
+
+def _imported_modules(path: str, module: str) -> set:
+    """Modules imported anywhere in a source file, with relative imports resolved."""
+    with open(os.path.join(MODELS_DIR, path)) as f:
+        tree = ast.parse(f.read(), filename=path)
+    package = module if path.endswith("__init__.py") else module.rpartition(".")[0]
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".")
+                base = ".".join(parts[:len(parts) - node.level + 1])
+                base = ".".join(filter(None, [base, node.module]))
+            else:
+                base = node.module
+            found.add(base)
+            # from package import module
+            found.update(f"{base}.{alias.name}" for alias in node.names)
+    return found
+
+
+def module_sources(target: str) -> list:
+    """
+    Source files of a module and of every abm/analysis module it imports,
+    directly or transitively, relative to models/.
+
+    Imports inside functions count too, since the stage's command may
+    reach them.
+    """
+    start = target.removeprefix("python.")
+    sources = {}
+    todo = [start]
+    while todo:
+        module = todo.pop()
+        path = _module_path(module)
+        if path is None or path in sources.values():
+            continue
+        sources[module] = path
+        todo.extend(_imported_modules(path, module))
+    return sorted(sources.values())
+
+
+def stage_hash(stage: Stage) -> str:
+    """
+    Content hash of everything a stage reads.
+
+    Covers the command (with placeholders unexpanded, so the hash does not
+    depend on the runner), the stage's source files, the modules a Python
+    stage imports and its input data files.
+    """
+    h = hashlib.sha256()
+    h.update(repr((stage.tool, stage.target, stage.args)).encode())
+    sources = set(stage.sources)
+    if stage.tool == "python":
+        sources.update(module_sources(stage.target))
+    for source in sorted(sources):
+        _hash_file(h, os.path.join(MODELS_DIR, source))
+    for data in stage.inputs:
+        _hash_file(h, _expand(data, RUNNER_PATHS["local"]))
+    return h.hexdigest()
+
+
+def _stamp_path(stage: Stage) -> str:
+    return os.path.join(STAMP_DIR, f"{stage.name}.sha256")
+
+
+def is_current(stage: Stage, digest: str) -> bool:
+    """True if the stage last succeeded with this hash and its outputs still exist."""
+    try:
+        with open(_stamp_path(stage)) as f:
+            stamped = f.read().strip()
+    except FileNotFoundError:
+        return False
+    outputs = [_expand(o, RUNNER_PATHS["local"]) for o in stage.outputs]
+    return stamped == digest and all(os.path.exists(o) for o in outputs)
+
+
+def stage_command(stage: Stage, runner: str) -> tuple:
+    """
+    Command line and working directory for a stage.
+
+    Returns:
+        (argv, cwd)
+    """
+    args = [_expand(a, RUNNER_PATHS[runner]) for a in stage.args]
+
+    if runner == "docker":
+        if stage.tool == "go":
+            user = f"{os.getuid()}:{os.getgid()}"
+            argv = ["docker-compose", "run", "--user", user, "--rm",
+                    GO_SERVICES[stage.target]] + args
+        else:
+            argv = ["docker-compose", "run", "--rm", "abm", "python", "-m",
+                    stage.target] + args
+        return argv, MODELS_DIR
+
+    if stage.tool == "go":
+        return ["go", "run", f"./{stage.target}"] + args, os.path.join(MODELS_DIR, "go")
+    return [sys.executable, "-m", stage.target] + args, MODELS_DIR
+
+
+def run_stage(stage: Stage, runner: str) -> tuple:
+    """
+    Run one stage, logging its output to the stamp directory.
+
+    Returns:
+        (return code, seconds)
+    """
+    argv, cwd = stage_command(stage, runner)
+    env = dict(os.environ, MPLBACKEND="Agg")
+
+    start = time.perf_counter()
+    with open(os.path.join(STAMP_DIR, f"{stage.name}.log"), "w") as log:
+        log.write(" ".join(argv) + "\n\n")
+        log.flush()
+        proc = subprocess.run(argv, cwd=cwd, env=env, stdout=log,
+                              stderr=subprocess.STDOUT)
+    return proc.returncode, time.perf_counter() - start
+
+
+def run_pipeline(stages: list = None, only: list = None, jobs: int = None,
+                 runner: str = "docker", force: bool = False,
+                 dry_run: bool = False) -> dict:
+    """
+    Run the pipeline, skipping stages whose inputs have not changed.
+
+    A stage is scheduled once all its upstream stages have finished; its
+    hash is taken at that point so it sees freshly written inputs. Stages
+    downstream of a failure are not run.
+
+    Args:
+        stages: Stage list (default: STAGES)
+        only: Run only these stages and their upstream stages
+        jobs: Maximum concurrent stages (default: CPU count)
+        runner: "docker" or "local"
+        force: Run every selected stage regardless of stamps
+        dry_run: Report what would run without running it
+
+    Returns:
+        Dict mapping stage name -> {"status": ran|skipped|failed|blocked|pending,
+        "seconds": float}
+    """
+    stages = select_stages(stages or STAGES, only)
+    graph = build_graph(stages)
+    by_name = {s.name: s for s in stages}
+    jobs = jobs or os.cpu_count() or 1
+
+    for directory in (STAMP_DIR, FIGURES_DIR):
+        os.makedirs(directory, exist_ok=True)
+
+    status = {}
+    waiting = [s.name for s in stages]
+    running = {}
+
+    def finished(name):
+        return status.get(name, {}).get("status") in ("ran", "skipped", "pending")
+
+    def stopped(name):
+        return status.get(name, {}).get("status") in ("failed", "blocked")
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while waiting or running:
+            for name in list(waiting):
+                deps = graph[name]
+                if any(stopped(d) for d in deps):
+                    status[name] = {"status": "blocked", "seconds": 0.0}
+                    waiting.remove(name)
+                    print(f"  blocked  {name}")
+                    continue
+                if not all(finished(d) for d in deps):
+                    continue
+
+                waiting.remove(name)
+                stage = by_name[name]
+                digest = stage_hash(stage)
+                upstream_pending = any(status[d]["status"] == "pending" for d in deps)
+
+                if not force and not upstream_pending and is_current(stage, digest):
+                    status[name] = {"status": "skipped", "seconds": 0.0}
+                    print(f"  skip     {name}")
+                elif dry_run:
+                    status[name] = {"status": "pending", "seconds": 0.0}
+                    print(f"  would run {name}")
+                else:
+                    print(f"  start    {name}")
+                    running[pool.submit(run_stage, stage, runner)] = (stage, digest)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, digest = running.pop(future)
+                returncode, seconds = future.result()
+                if returncode == 0:
+                    with open(_stamp_path(stage), "w") as f:
+                        f.write(digest + "\n")
+                    status[stage.name] = {"status": "ran", "seconds": seconds}
+                    print(f"  done     {stage.name} ({seconds:.1f}s)")
+                else:
+                    status[stage.name] = {"status": "failed", "seconds": seconds}
+                    log = os.path.join(os.path.relpath(STAMP_DIR, REPO_DIR),
+                                       f"{stage.name}.log")
+                    print(f"  FAILED   {stage.name} (exit {returncode}, see {log})")
+
+    return status
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dependency-aware figure pipeline")
+    parser.add_argument("--only", type=str, nargs="+", default=None, metavar="STAGE",
+                        help="Run only these stages (and what they depend on)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="Maximum concurrent stages (default: CPU count)")
+    parser.add_argument("--runner", type=str, default="docker",
+                        choices=sorted(RUNNER_PATHS),
+                        help="Run stages through docker-compose or with local "
+                             "Python/Go")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would run")
+    parser.add_argument("--list", action="store_true", help="List stages and exit")
+
+    args = parser.parse_args()
+
+    if args.list:
+        graph = build_graph(STAGES)
+        for stage in STAGES:
+            upstream = sorted(graph[stage.name])
+            deps = f" <- {', '.join(upstream)}" if upstream else ""
+            print(f"{stage.name}{deps}")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    status = run_pipeline(only=args.only, jobs=args.jobs, runner=args.runner,
+                          force=args.force, dry_run=args.dry_run)
+
+    counts = {}
+    for s in status.values():
+        counts[s["status"]] = counts.get(s["status"], 0) + 1
+    summary = ", ".join(f"{n} {k}" for k, n in sorted(counts.items()))
+    print(f"\nPipeline finished in {time.perf_counter() - start:.1f}s: {summary}")
+
+    if counts.get("failed") or counts.get("blocked"):
+        sys.exit(1)
@@ -5,14 +5,26 @@ This script creates:
 1. Coordination Trilemma 3D trade-off diagram
 2. Default Trajectory state machine
 3. Scale degradation curves (four mechanisms)
+4. Enforcement regress flowchart, detection timeline and longevity scatter
+
+render_diagrams() draws them in a process pool and skips any diagram whose
+function source and rendering parameters hash to the output already on disk
+(hashes are kept in .diagram_cache.json next to the figures).
 """
 
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import matplotlib
+import matplotlib.patches as mpatches
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.patches import FancyArrowPatch, FancyBboxPatch
 from mpl_toolkits.mplot3d import Axes3D
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
-import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 
 
 def create_trilemma_diagram(output_path: str = None):
@@ -542,12 +554,122 @@ def create_longevity_scatter(output_path: str = None):
     plt.close()
 
 
+# Diagram name -> (function, output filename)
+DIAGRAMS = {
+    "trilemma": (create_trilemma_diagram, "coordination_trilemma.png"),
+    "state_machine": (create_state_machine_diagram,
+                      "default_trajectory_state_machine.png"),
+    "degradation": (create_scale_degradation_curves, "scale_degradation_curves.png"),
+    "regress": (create_enforcement_regress_flowchart, "enforcement_regress.png"),
+    "timeline": (create_detection_timeline, "detection_timeline.png"),
+    "longevity": (create_longevity_scatter, "longevity_scatter.png"),
+}
+
+TIER1 = ["trilemma", "state_machine", "degradation"]
+TIER2 = ["regress", "timeline", "longevity"]
+
+CACHE_FILE = ".diagram_cache.json"
+
+
+def diagram_hash(name: str) -> str:
+    """
+    Hash of everything that determines a diagram's pixels.
+
+    Covers the drawing function's source (which fixes dpi and layout), the
+    output filename and the matplotlib version.
+    """
+    create, filename = DIAGRAMS[name]
+    h = hashlib.sha256()
+    h.update(inspect.getsource(create).encode())
+    h.update(filename.encode())
+    h.update(matplotlib.__version__.encode())
+    return h.hexdigest()
+
+
+def _load_cache(output_dir: str) -> dict:
+    try:
+        with open(os.path.join(output_dir, CACHE_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _render_single_diagram(args: tuple) -> str:
+    """Render one diagram (for parallel execution)."""
+    name, output_path = args
+    create, _ = DIAGRAMS[name]
+    create(output_path)
+    return name
+
+
+def render_diagrams(names: list = None, output_dir: str = None,
+                    n_workers: int = None, executor: Executor = None,
+                    force: bool = False) -> dict:
+    """
+    Render diagrams, skipping those whose cached hash matches.
+
+    Args:
+        names: Diagram names from DIAGRAMS (default: all)
+        output_dir: Directory for the PNGs; None shows each diagram
+            interactively (no cache, no pool)
+        n_workers: Number of parallel workers (default: CPU count)
+        executor: Existing executor to render on instead of a new pool
+        force: Render even if the cache says the output is current
+
+    Returns:
+        Dict mapping diagram name -> "rendered" or "cached"
+    """
+    names = list(names or DIAGRAMS)
+    unknown = sorted(set(names) - set(DIAGRAMS))
+    if unknown:
+        raise ValueError(f"Unknown diagrams: {unknown} (choose from {list(DIAGRAMS)})")
+
+    if output_dir is None:
+        for name in names:
+            _render_single_diagram((name, None))
+        return {name: "rendered" for name in names}
+
+    os.makedirs(output_dir, exist_ok=True)
+    cache = _load_cache(output_dir)
+    hashes = {name: diagram_hash(name) for name in names}
+
+    status = {}
+    jobs = []
+    for name in names:
+        path = os.path.join(output_dir, DIAGRAMS[name][1])
+        if not force and cache.get(name) == hashes[name] and os.path.exists(path):
+            status[name] = "cached"
+        else:
+            jobs.append((name, path))
+
+    if executor is not None:
+        rendered = list(executor.map(_render_single_diagram, jobs))
+    elif (n_workers is None or n_workers > 1) and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rendered = list(pool.map(_render_single_diagram, jobs))
+    else:
+        rendered = [_render_single_diagram(job) for job in jobs]
+
+    for name in rendered:
+        status[name] = "rendered"
+        cache[name] = hashes[name]
+
+    with open(os.path.join(output_dir, CACHE_FILE), "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+    return {name: status[name] for name in names}
+
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Generate conceptual diagrams")
     parser.add_argument("--output", type=str, default=None, help="Output directory")
     parser.add_argument("--all", action="store_true", help="Generate all diagrams")
+    parser.add_argument("--only", type=str, nargs="+", default=None,
+                        choices=list(DIAGRAMS),
+                        metavar="NAME",
+                        help=f"Generate only these diagrams ({', '.join(DIAGRAMS)})")
     parser.add_argument("--tier1", action="store_true", help="Generate Tier 1 diagrams")
     parser.add_argument("--tier2", action="store_true", help="Generate Tier 2 diagrams")
     parser.add_argument("--trilemma", action="store_true", help="Generate trilemma diagram")
@@ -556,45 +678,31 @@ if __name__ == "__main__":
     parser.add_argument("--regress", action="store_true", help="Generate enforcement regress")
     parser.add_argument("--timeline", action="store_true", help="Generate detection timeline")
     parser.add_argument("--longevity", action="store_true", help="Generate longevity scatter")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render even if cached")
 
     args = parser.parse_args()
 
-    # Set defaults
-    if args.all:
-        args.tier1 = args.tier2 = True
+    # Collect the requested diagrams; nothing specified (or --all) means all
+    selected = set(args.only or [])
     if args.tier1:
-        args.trilemma = args.state_machine = args.degradation = True
+        selected.update(TIER1)
     if args.tier2:
-        args.regress = args.timeline = args.longevity = True
-
-    # If nothing specified, do all
-    if not any([args.trilemma, args.state_machine, args.degradation,
-                args.regress, args.timeline, args.longevity]):
-        args.trilemma = args.state_machine = args.degradation = True
-        args.regress = args.timeline = args.longevity = True
-
-    if args.trilemma:
-        path = f"{args.output}/coordination_trilemma.png" if args.output else None
-        create_trilemma_diagram(path)
-
-    if args.state_machine:
-        path = f"{args.output}/default_trajectory_state_machine.png" if args.output else None
-        create_state_machine_diagram(path)
-
-    if args.degradation:
-        path = f"{args.output}/scale_degradation_curves.png" if args.output else None
-        create_scale_degradation_curves(path)
-
-    if args.regress:
-        path = f"{args.output}/enforcement_regress.png" if args.output else None
-        create_enforcement_regress_flowchart(path)
-
-    if args.timeline:
-        path = f"{args.output}/detection_timeline.png" if args.output else None
-        create_detection_timeline(path)
+        selected.update(TIER2)
+    for name in DIAGRAMS:
+        if getattr(args, name):
+            selected.add(name)
+    if args.all or not selected:
+        names = list(DIAGRAMS)
+    else:
+        names = [name for name in DIAGRAMS if name in selected]
 
-    if args.longevity:
-        path = f"{args.output}/longevity_scatter.png" if args.output else None
-        create_longevity_scatter(path)
+    status = render_diagrams(names, args.output, n_workers=args.workers,
+                             force=args.force)
 
+    n_cached = sum(1 for s in status.values() if s == "cached")
+    if n_cached:
+        print(f"Skipped {n_cached} unchanged diagram(s): "
+              f"{', '.join(n for n, s in status.items() if s == 'cached')}")
     print("Done generating diagrams!")
@@ -0,0 +1,257 @@
+"""
+Vectorized Monte Carlo of the Corruption-TCS Cycle
+
+NumPy port of Simulate() in models/go/montecarlo/main.go. A batch of
+trajectories advances one cycle per iteration:
+- Corruption: with probability p_tcs_transition (reduced by scale effects)
+  a TCS forms, AI-controlled with probability p_ai, else human-controlled;
+  otherwise the corruption phase restarts. The cycle's duration is added.
+- TCS_Human: controllers corrupt, back to Corruption; duration added.
+- TCS_AI: alignment succeeds with p_alignment * (1 - factor * p_ai) and
+  returns to Corruption (duration added), otherwise Extinction with no
+  time added.
+
+Cycle durations are normal(cycle_duration, cycle_duration_std) floored at
+1 year. p_ai and institutional scale grow once per cycle for every
+trajectory, so they are looked up from the cycle index rather than
+tracked per trajectory, and (state, time, cycles) is the full Markov
+state: a population can be paused at a time horizon and continued, which
+analysis/rare_events.py uses for splitting. Trajectories stop on
+extinction, at max_time or after max_cycles.
+
+Results use the Go CSV columns and compute_statistics() the Go stats keys,
+so they can stand in for the Go output in the analysis scripts.
+
+simulate_uniforms() runs the same dynamics from caller-supplied uniforms
+(three per cycle: duration, TCS/alignment test, AI-control test), which
+is what antithetic and quasi-random sampling in
+analysis/variance_reduction.py need.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+import numpy as np
+
+# Codes of the final_state column, in the Go State order
+STATE_NAMES = ["Corruption", "TCS_Human", "TCS_AI", "Extinction"]
+CORRUPTION, TCS_HUMAN, TCS_AI, EXTINCTION = range(4)
+
+
+@dataclass
+class SimParams:
+    """Simulation parameters; names and defaults follow the Go model's JSON/flags."""
+    p_ai: float = 0.08
+    cycle_duration: float = 45.0
+    cycle_duration_std: float = 26.0
+    p_tcs_transition: float = 0.8
+    p_ai_growth_rate: float = 0.15
+    p_ai_max: float = 0.99
+    max_time: float = 1000.0
+    max_cycles: int = 100
+    p_alignment: float = 0.0
+    scale_effects: bool = False
+    initial_scale: float = 1.0
+    scale_growth_rate: float = 0.05
+    scale_reform_decay: float = 0.3
+    alignment_capability_factor: float = 0.5
+
+    @classmethod
+    def from_scenario(cls, scenario: Dict, **overrides) -> "SimParams":
+        """Build parameters from a get_calibrated_scenarios() entry."""
+        return cls(
+            p_ai=scenario['p_ai'],
+            p_ai_growth_rate=scenario['growth'],
+            cycle_duration=scenario['cycle_duration'],
+            cycle_duration_std=scenario['cycle_std'],
+            **overrides
+        )
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def p_ai_schedule(params: SimParams, n_cycles: int) -> np.ndarray:
+    """p_ai in effect during cycles 1..n_cycles (index 0 is cycle 1)."""
+    p = np.empty(n_cycles + 1)
+    p[0] = params.p_ai
+    for k in range(n_cycles):
+        p[k + 1] = min(params.p_ai_max, p[k] * (1 + params.p_ai_growth_rate))
+    return p
+
+
+def expected_cycles(p_ai: float, growth: float, p_ai_max: float = 0.99) -> float:
+    """Analytic approximation E[cycles] ~ ln(p_ai_max / p_ai) / ln(1 + growth)."""
+    return float(np.log(p_ai_max / p_ai) / np.log(1 + growth))
+
+
+def mean_cycle_duration(params: SimParams) -> float:
+    """Exact mean of max(1, normal(cycle_duration, cycle_duration_std))."""
+    from scipy.special import ndtr
+
+    mu, sd = params.cycle_duration, params.cycle_duration_std
+    if sd <= 0:
+        return float(mu)
+    a = (1.0 - mu) / sd
+    return float(ndtr(a) + mu * (1 - ndtr(a))
+                 + sd * np.exp(-a * a / 2) / np.sqrt(2 * np.pi))
+
+
+def cycle_durations(params: SimParams, u: np.ndarray) -> np.ndarray:
+    """Cycle durations from uniforms by inverse transform."""
+    from scipy.special import ndtri
+
+    if params.cycle_duration_std <= 0:
+        return np.full(u.shape, params.cycle_duration)
+    return np.maximum(1.0, params.cycle_duration + params.cycle_duration_std * ndtri(u))
+
+
+def _run(params: SimParams, n: int, inputs, start: Dict[str, np.ndarray] = None,
+         stop_time: float = None) -> Dict[str, np.ndarray]:
+    """
+    Advance n trajectories cycle by cycle.
+
+    inputs(k, active) returns (duration, test, ai_u) for the active
+    trajectories, where k holds their 0-based cycle index: durations, the
+    uniform for the TCS (or alignment) test and the uniform for the
+    AI-control test.
+
+    start optionally gives the population to continue from (final_state,
+    time_to_extinction and num_cycles columns of an earlier result), and
+    stop_time an earlier horizon than max_time to pause at.
+    """
+    if start is None:
+        state = np.zeros(n, dtype=np.int8)
+        time = np.zeros(n)
+        cycles = np.zeros(n, dtype=np.int32)
+    else:
+        state = start['final_state'].astype(np.int8)
+        time = start['time_to_extinction'].astype(float)
+        cycles = start['num_cycles'].astype(np.int32)
+    horizon = params.max_time if stop_time is None else min(stop_time, params.max_time)
+    p_ai = p_ai_schedule(params, params.max_cycles)
+    scale = params.initial_scale if params.initial_scale > 0 else 1.0
+    scale_growth = params.scale_growth_rate if params.scale_effects else 0.0
+
+    active = np.flatnonzero((state != EXTINCTION) & (time < horizon)
+                            & (cycles < params.max_cycles))
+    while len(active):
+        k = cycles[active]
+        cycles[active] += 1
+        duration, test, ai_u = inputs(k, active)
+
+        # p_ai and institutional scale grow once per cycle, so both follow
+        # from the trajectory's cycle index
+        p_tcs = params.p_tcs_transition
+        if params.scale_effects and params.scale_reform_decay > 0:
+            excess = np.maximum(scale * (1 + max(scale_growth, 0.0)) ** k - 1.0, 0.0)
+            p_tcs = p_tcs * np.exp(-params.scale_reform_decay * excess)
+
+        p_align = params.p_alignment
+        if params.alignment_capability_factor > 0:
+            capability = params.alignment_capability_factor * p_ai[k]
+            p_align = np.maximum(0.0, p_align * (1.0 - capability))
+
+        s = state[active]
+        new_state = np.full(len(active), CORRUPTION, dtype=np.int8)
+        forms_tcs = (s == CORRUPTION) & (test < p_tcs)
+        ai_control = ai_u < p_ai[k]
+        new_state[forms_tcs] = np.where(ai_control[forms_tcs], TCS_AI, TCS_HUMAN)
+        new_state[(s == TCS_AI) & (test >= p_align)] = EXTINCTION
+
+        state[active] = new_state
+        time[active] += np.where(new_state == EXTINCTION, 0.0, duration)
+
+        still = ((new_state != EXTINCTION) & (time[active] < horizon)
+                 & (cycles[active] < params.max_cycles))
+        active = active[still]
+
+    return {
+        'reached_extinction': state == EXTINCTION,
+        'time_to_extinction': time,
+        'num_cycles': cycles,
+        'final_state': state,
+        'final_p_ai': p_ai[cycles],
+    }
+
+
+def simulate(params: SimParams, n: int, rng: np.random.Generator,
+             start: Dict[str, np.ndarray] = None,
+             stop_time: float = None) -> Dict[str, np.ndarray]:
+    """
+    Run n trajectories.
+
+    Args:
+        params: Simulation parameters
+        n: Number of trajectories
+        rng: Random generator
+        start: Population to continue from (a result of an earlier call;
+            n must match its length)
+        stop_time: Pause trajectories once their time reaches this
+
+    Returns:
+        Columns reached_extinction, time_to_extinction, num_cycles,
+        final_state (codes into STATE_NAMES) and final_p_ai
+    """
+    def inputs(k, active):
+        m = len(active)
+        if params.cycle_duration_std > 0:
+            duration = np.maximum(1.0,
+                                  rng.normal(params.cycle_duration,
+                                             params.cycle_duration_std, m))
+        else:
+            duration = np.full(m, params.cycle_duration)
+        return duration, rng.random(m), rng.random(m)
+
+    return _run(params, n, inputs, start=start, stop_time=stop_time)
+
+
+def simulate_uniforms(params: SimParams, u: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Run one trajectory per row of u.
+
+    Args:
+        params: Simulation parameters
+        u: Uniforms in (0, 1), shape (n, max_cycles, 3); cycle k uses
+            u[:, k, 0] for its duration, u[:, k, 1] for the TCS (or
+            alignment) test and u[:, k, 2] for the AI-control test
+
+    Returns:
+        Columns as in simulate()
+    """
+    def inputs(k, active):
+        uk = u[active, k]
+        return cycle_durations(params, uk[:, 0]), uk[:, 1], uk[:, 2]
+
+    return _run(params, len(u), inputs)
+
+
+def _percentile(sorted_values: np.ndarray, p: float) -> float:
+    """Go model's percentile: sorted[int((n - 1) * p)]."""
+    if len(sorted_values) == 0:
+        return 0.0
+    return float(sorted_values[int((len(sorted_values) - 1) * p)])
+
+
+def compute_statistics(results: Dict[str, np.ndarray]) -> Dict:
+    """Summary statistics with the keys of the Go model's stats JSON."""
+    n = len(results['reached_extinction'])
+    stats = {'n': n, 'extinction_rate': 0.0, 'mean_time': 0.0, 'std_time': 0.0,
+             'median_time': 0.0, 'p5_time': 0.0, 'p25_time': 0.0, 'p75_time': 0.0,
+             'p95_time': 0.0, 'mean_cycles': 0.0, 'median_cycles': 0.0}
+    if n == 0:
+        return stats
+
+    times = np.sort(results['time_to_extinction'][results['reached_extinction']])
+    stats['extinction_rate'] = len(times) / n
+    if len(times):
+        stats['mean_time'] = float(times.mean())
+        stats['std_time'] = float(times.std())
+        for key, p in [('median_time', 0.5), ('p5_time', 0.05), ('p25_time', 0.25),
+                       ('p75_time', 0.75), ('p95_time', 0.95)]:
+            stats[key] = _percentile(times, p)
+
+    cycles = np.sort(results['num_cycles'])
+    stats['mean_cycles'] = float(cycles.mean())
+    stats['median_cycles'] = _percentile(cycles, 0.5)
+    return stats
@@ -3,28 +3,75 @@ Parameter Sweep for Corruption Dynamics Model
 
 Performs sensitivity analysis to identify which parameters are
 load-bearing for the corruption inevitability result.
+
+The motivation foundations model (abm/motivation_foundations.py) can be
+swept as well with model="motivation"; its replications run as one batched
+simulation per parameter combination. model="cooperation" sweeps the
+cooperation threshold model (abm/cooperation_threshold.py).
+
+engine="meanfield" runs the corruption and cooperation sweeps on the
+mean-field ODE engines, which are deterministic and take a fraction of a
+second per run, so a whole parameter plane scans in seconds with one
+replication per point; agent runs are then reserved for spot checks.
+engine="histogram" runs the binned corruption engine, whose cost does not
+grow with n_enforcers, for sweeps over very large institutions.
+engine="array" runs the vectorized cooperation engine, which with
+fixed_params such as {"network": "watts_strogatz"} sweeps large networked
+populations. The motivation model has no Mesa version: its only engine is
+the batched NumPy port, listed as "array". Each model's first listed engine
+is its default.
+
+"schedule" (mid-run interventions, see abm/interventions.py) is a parameter
+like any other: hold one fixed, or sweep a list of schedules that differ in
+timing to compare when a policy is introduced.
+
+Models, the progress bar and the plotting stack are imported where they are
+used, so pool workers that only call single_run do not pay for matplotlib.
 """
 
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import product
+
 import numpy as np
 import pandas as pd
-from itertools import product
-from tqdm import tqdm
-import matplotlib.pyplot as plt
-import seaborn as sns
-from concurrent.futures import ProcessPoolExecutor
-import sys
-import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from abm.corruption_dynamics import run_experiment
+# Default outcome metric of each sweepable model
+SWEEP_METRICS = {
+    "corruption": "final_corruption_rate",
+    "motivation": "final_cooperation_rate",
+    "cooperation": "final_cooperation_rate",
+}
+
+# Engines each model can be swept on, default first; deterministic ones need a
+# single replication
+SWEEP_ENGINES = {
+    "corruption": ["agent", "meanfield", "histogram"],
+    "cooperation": ["agent", "meanfield", "array"],
+    "motivation": ["array"],
+}
+DETERMINISTIC_ENGINES = {"meanfield"}
+
+# Module of each sweepable model, whose code is part of the cache key
+SWEEP_MODULES = {
+    "corruption": "abm.corruption_dynamics",
+    "cooperation": "abm.cooperation_threshold",
+    "motivation": "abm.motivation_foundations",
+}
 
 
 def single_run(params: dict) -> dict:
     """Run a single experiment and return results."""
     # Remove internal tracking keys before passing to model
     run_params = {k: v for k, v in params.items() if not k.startswith("_")}
+    from abm.corruption_dynamics import run_experiment
+
     results = run_experiment(**run_params)
     return {
         "final_corruption_rate": results["final_corruption_rate"],
@@ -34,12 +81,84 @@ def single_run(params: dict) -> dict:
     }
 
 
+def cooperation_run(params: dict) -> dict:
+    """Run a single cooperation threshold experiment and return results."""
+    run_params = {k: v for k, v in params.items() if not k.startswith("_")}
+    from abm.cooperation_threshold import run_experiment
+
+    results = run_experiment(**run_params)
+    return {
+        "final_cooperation_rate": results["final_cooperation_rate"],
+        "final_mean_motivation": results["final_mean_motivation"],
+        "stable": results["stable"],
+        "theta_crit": results["theta_crit"],
+        **{k: v for k, v in params.items() if k != "n_steps" and not k.startswith("_")}
+    }
+
+
+def batched_motivation_run(params: dict) -> list:
+    """
+    Run all replications of one motivation parameter combination as a batch.
+
+    Returns:
+        List with one result row per replication
+    """
+    run_params = {k: v for k, v in params.items() if not k.startswith("_")}
+    n_replications = params["_n_replications"]
+    seed = run_params.pop("seed", None)
+
+    from abm import motivation_foundations
+
+    results = motivation_foundations.run_experiment(
+        n_replications=n_replications, seed=seed, **run_params
+    )
+
+    swept = {k: v for k, v in run_params.items() if k != "n_steps"}
+    return [
+        {
+            "final_cooperation_rate": float(results["final_cooperation_rate"][rep]),
+            "stable_cooperation": bool(results["stable_cooperation"][rep]),
+            "collapse_step": int(results["collapse_step"][rep]),
+            **swept,
+        }
+        for rep in range(n_replications)
+    ]
+
+
+def _model_code_hash(model: str) -> str:
+    """
+    Hash of the code behind a sweep's results: this module and the model's
+    module with every abm/analysis module it imports.
+    """
+    from analysis.figure_pipeline import MODELS_DIR, module_sources
+
+    h = hashlib.sha256()
+    sources = (module_sources(SWEEP_MODULES[model])
+               + ["python/analysis/parameter_sweep.py"])
+    for source in sources:
+        h.update(source.encode())
+        with open(os.path.join(MODELS_DIR, source), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _sweep_cache_path(cache_dir: str, model: str, spec: dict) -> str:
+    """Cache file for a sweep, keyed by a hash of its specification and model code."""
+    h = hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode())
+    h.update(_model_code_hash(model).encode())
+    return os.path.join(cache_dir, f"sweep_{model}_{h.hexdigest()[:16]}.pkl")
+
+
 def parameter_sweep(
     param_ranges: dict,
     fixed_params: dict = None,
     n_replications: int = 10,
     n_steps: int = 200,
-    n_workers: int = 4
+    n_workers: int = 4,
+    model: str = "corruption",
+    cache_dir: str = None,
+    executor: Executor = None,
+    engine: str = None
 ) -> pd.DataFrame:
     """
     Perform parameter sweep over specified ranges.
@@ -50,24 +169,69 @@ def parameter_sweep(
         n_replications: Number of replications per parameter combination
         n_steps: Number of model steps
         n_workers: Number of parallel workers
+        model: Model to sweep ("corruption", "cooperation" or "motivation")
+        cache_dir: If given, results are pickled there keyed by the sweep
+            specification and the model code, and reused on identical
+            sweeps (pickles keep the column dtypes a CSV would lose)
+        executor: Existing pool to run on (e.g. one shared across a batch);
+            n_workers is ignored when given
+        engine: Simulation engine (see SWEEP_ENGINES), by default the
+            model's first; deterministic engines run one replication per
+            combination
 
     Returns:
         DataFrame with results for all parameter combinations
     """
+    if model not in SWEEP_METRICS:
+        raise ValueError(f"Unknown sweep model: {model}")
+    default_engine = SWEEP_ENGINES[model][0]
+    if engine is None:
+        engine = default_engine
+    if engine not in SWEEP_ENGINES[model]:
+        raise ValueError(f"Unknown engine for {model}: {engine}")
+    if engine in DETERMINISTIC_ENGINES:
+        n_replications = 1
+
     if fixed_params is None:
         fixed_params = {}
 
+    cache_path = None
+    if cache_dir:
+        spec = {
+            "model": model,
+            "param_ranges": param_ranges,
+            "fixed_params": fixed_params,
+            "n_replications": n_replications,
+            "n_steps": n_steps,
+        }
+        if engine != default_engine:
+            spec["engine"] = engine
+        cache_path = _sweep_cache_path(cache_dir, model, spec)
+        if os.path.exists(cache_path):
+            print(f"Using cached sweep results from {cache_path}")
+            return pd.read_pickle(cache_path)
+
     # Generate all parameter combinations
     param_names = list(param_ranges.keys())
     param_values = list(param_ranges.values())
     combinations = list(product(*param_values))
 
-    # Create list of all runs (combinations x replications)
+    # Create list of all runs (combinations x replications). Batched models
+    # get one run per combination that simulates all replications at once.
     all_runs = []
-    for combo in combinations:
+    for i, combo in enumerate(combinations):
         params = dict(zip(param_names, combo))
         params.update(fixed_params)
         params["n_steps"] = n_steps
+        if engine != default_engine:
+            params["engine"] = engine
+
+        if model == "motivation":
+            run_params = params.copy()
+            run_params["seed"] = i  # Different seed per combination
+            run_params["_n_replications"] = n_replications
+            all_runs.append(run_params)
+            continue
 
         for rep in range(n_replications):
             run_params = params.copy()
@@ -75,54 +239,92 @@ def parameter_sweep(
             run_params["_replication"] = rep
             all_runs.append(run_params)
 
+    from tqdm import tqdm
+
+    run_fn = {
+        "corruption": single_run,
+        "cooperation": cooperation_run,
+        "motivation": batched_motivation_run,
+    }[model]
+
     # Run all experiments
     results = []
     print(f"Running {len(all_runs)} experiments...")
 
-    if n_workers > 1:
+    if executor is not None:
+        for result in tqdm(executor.map(run_fn, all_runs), total=len(all_runs)):
+            results.append(result)
+    elif n_workers > 1:
         with ProcessPoolExecutor(max_workers=n_workers) as executor:
-            for result in tqdm(executor.map(single_run, all_runs), total=len(all_runs)):
+            for result in tqdm(executor.map(run_fn, all_runs), total=len(all_runs)):
                 results.append(result)
     else:
         for params in tqdm(all_runs):
-            results.append(single_run(params))
+            results.append(run_fn(params))
 
-    return pd.DataFrame(results)
+    if model == "motivation":
+        results = [row for rows in results for row in rows]
 
+    results_df = pd.DataFrame(results)
 
-def analyze_sensitivity(results_df: pd.DataFrame, param_name: str) -> dict:
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        results_df.to_pickle(cache_path)
+
+    return results_df
+
+
+def analyze_sensitivity(
+    results_df: pd.DataFrame,
+    param_name: str,
+    metric: str = "final_corruption_rate"
+) -> dict:
     """
-    Analyze sensitivity of corruption rate to a parameter.
+    Analyze sensitivity of an outcome metric (default: corruption rate) to a parameter.
 
     Returns:
         Dict with sensitivity statistics
     """
-    grouped = results_df.groupby(param_name)["final_corruption_rate"]
+    grouped = results_df.groupby(param_name)[metric]
 
     return {
         "param": param_name,
         "mean_by_value": grouped.mean().to_dict(),
         "std_by_value": grouped.std().to_dict(),
         "range": grouped.mean().max() - grouped.mean().min(),
-        "correlation": results_df[[param_name, "final_corruption_rate"]].corr().iloc[0, 1]
+        "correlation": results_df[[param_name, metric]].corr().iloc[0, 1]
     }
 
 
-def plot_sensitivity(results_df: pd.DataFrame, param_name: str, output_path: str = None):
-    """Plot corruption rate vs parameter value."""
+def _metric_label(metric: str) -> str:
+    """Axis label for an outcome column, e.g. 'Final Corruption Rate'."""
+    return metric.replace("_", " ").title()
+
+
+def plot_sensitivity(
+    results_df: pd.DataFrame,
+    param_name: str,
+    output_path: str = None,
+    metric: str = "final_corruption_rate"
+):
+    """Plot outcome metric (default: corruption rate) vs parameter value."""
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots(figsize=(8, 6))
 
     # Calculate mean and confidence interval
-    grouped = results_df.groupby(param_name)["final_corruption_rate"]
+    grouped = results_df.groupby(param_name)[metric]
     means = grouped.mean()
     stds = grouped.std()
 
     ax.errorbar(means.index, means.values, yerr=1.96*stds.values,
                 marker='o', capsize=5, capthick=2)
 
+    label = _metric_label(metric)
     ax.set_xlabel(param_name, fontsize=12)
-    ax.set_ylabel("Final Corruption Rate", fontsize=12)
-    ax.set_title(f"Sensitivity: Corruption Rate vs {param_name}", fontsize=14)
+    ax.set_ylabel(label, fontsize=12)
+    ax.set_title(f"Sensitivity: {label.replace('Final ', '')} vs {param_name}",
+                 fontsize=14)
     ax.axhline(y=0.5, color='r', linestyle='--', alpha=0.5, label="50% threshold")
     ax.legend()
     ax.grid(True, alpha=0.3)
@@ -136,10 +338,19 @@ def plot_sensitivity(results_df: pd.DataFrame, param_name: str, output_path: str
         plt.show()
 
 
-def plot_heatmap(results_df: pd.DataFrame, param1: str, param2: str, output_path: str = None):
-    """Plot heatmap of corruption rate for two parameters."""
+def plot_heatmap(
+    results_df: pd.DataFrame,
+    param1: str,
+    param2: str,
+    output_path: str = None,
+    metric: str = "final_corruption_rate"
+):
+    """Plot heatmap of an outcome metric (default: corruption rate) over two params."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     pivot = results_df.pivot_table(
-        values="final_corruption_rate",
+        values=metric,
         index=param1,
         columns=param2,
         aggfunc="mean"
@@ -149,7 +360,8 @@ def plot_heatmap(results_df: pd.DataFrame, param1: str, param2: str, output_path
     sns.heatmap(pivot, annot=True, fmt=".2f", cmap="RdYlGn_r", ax=ax,
                 vmin=0, vmax=1)
 
-    ax.set_title(f"Corruption Rate: {param1} vs {param2}", fontsize=14)
+    label = _metric_label(metric).replace("Final ", "")
+    ax.set_title(f"{label}: {param1} vs {param2}", fontsize=14)
 
     plt.tight_layout()
 
@@ -168,53 +380,100 @@ if __name__ == "__main__":
                         help="Output directory for figures")
     parser.add_argument("--workers", type=int, default=4, help="Number of workers")
     parser.add_argument("--reps", type=int, default=10, help="Replications per combo")
+    parser.add_argument("--model", type=str, default="corruption",
+                        choices=list(SWEEP_METRICS), help="Model to sweep")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Directory for cached sweep results")
+    engines = sorted({e for model_engines in SWEEP_ENGINES.values()
+                      for e in model_engines})
+    parser.add_argument("--engine", type=str, default=None, choices=engines,
+                        help="Simulation engine (default: the model's first in "
+                             "SWEEP_ENGINES; meanfield: deterministic ODE "
+                             "surrogate)")
 
     args = parser.parse_args()
 
     # Ensure output directory exists
     os.makedirs(args.output, exist_ok=True)
 
-    # Define parameter ranges for sweep
-    param_ranges = {
-        "integrity_mean": [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
-        "base_detection_prob": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
-    }
+    metric = SWEEP_METRICS[args.model]
 
-    fixed_params = {
-        "n_enforcers": 100,
-        "oversight_structure": "hierarchical",
-        "integrity_decay": True,
-        "corruption_contagion": True,
-    }
+    # Define parameter ranges for sweep
+    if args.model == "motivation":
+        param_ranges = {
+            "soteriological_fraction": [0.0, 0.1, 0.2, 0.3, 0.4, 0.5],
+            "n_agents": [50, 150, 500, 1000],
+        }
+
+        fixed_params = {
+            "enable_scale_effects": True,
+            "cooperation_cost": 1.3,
+            "benefit_multiplier": 1.2,
+        }
+    elif args.model == "cooperation":
+        param_ranges = {
+            "cooperation_cost": [0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0],
+            "initial_cooperation": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
+        }
+
+        fixed_params = {
+            "n_agents": 500,
+            "benefit_multiplier": 1.2,
+        }
+    else:
+        param_ranges = {
+            "integrity_mean": [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+            "base_detection_prob": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7],
+        }
+
+        fixed_params = {
+            "n_enforcers": 100,
+            "oversight_structure": "hierarchical",
+            "integrity_decay": True,
+            "corruption_contagion": True,
+        }
 
     # Run sweep
     results = parameter_sweep(
         param_ranges,
         fixed_params=fixed_params,
         n_replications=args.reps,
-        n_workers=args.workers
+        n_workers=args.workers,
+        model=args.model,
+        cache_dir=args.cache_dir,
+        engine=args.engine
     )
 
+    prefix = "" if args.model == "corruption" else f"{args.model}_"
+    if args.engine not in (None, SWEEP_ENGINES[args.model][0]):
+        prefix += f"{args.engine}_"
+
     # Save results
-    results.to_csv(f"{args.output}/parameter_sweep_results.csv", index=False)
+    results.to_csv(f"{args.output}/{prefix}parameter_sweep_results.csv", index=False)
 
     # Analyze sensitivity
     print("\nSensitivity Analysis:")
     for param in param_ranges.keys():
-        sens = analyze_sensitivity(results, param)
+        sens = analyze_sensitivity(results, param, metric)
         print(f"\n{param}:")
         print(f"  Range of effect: {sens['range']:.3f}")
         print(f"  Correlation: {sens['correlation']:.3f}")
 
         # Plot individual sensitivity
-        plot_sensitivity(results, param, f"{args.output}/sensitivity_{param}.png")
+        plot_sensitivity(results, param,
+                         f"{args.output}/{prefix}sensitivity_{param}.png",
+                         metric=metric)
 
     # Plot heatmap
+    param1, param2 = param_ranges.keys()
     plot_heatmap(
         results,
-        "integrity_mean",
-        "base_detection_prob",
-        f"{args.output}/heatmap_integrity_detection.png"
+        param1,
+        param2,
+        f"{args.output}/{prefix}heatmap_{param1}_{param2}.png"
+        if prefix
+        else f"{args.output}/heatmap_integrity_detection.png",
+        metric=metric
     )
 
     print(f"\nFigures saved to {args.output}/")
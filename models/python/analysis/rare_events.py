@@ -0,0 +1,251 @@
+"""
+Multilevel Splitting for Rare Survival Outcomes
+
+Estimates P(survive): the probability that a trajectory of the Monte Carlo
+model avoids extinction until max_time (or until max_cycles). With small
+p_align or pessimistic parameters this is too rare for plain sampling.
+
+(state, time, cycles) is the full Markov state of a trajectory (see
+analysis/montecarlo.py), so a population can be paused at a time level
+and continued. Fixed-effort splitting with levels L_1 < ... < L_m = max_time:
+1. Run N trajectories until each goes extinct or reaches L_1.
+2. p_1 = fraction that reached L_1 alive.
+3. Resample N trajectories from the survivors (multinomial), continue to
+   L_2 with fresh randomness, and so on.
+
+The product p_1 * ... * p_j is an unbiased estimate of P(alive at L_j) for
+fixed levels, which gives the survival curve at every level. Levels are
+chosen by a pilot run that places each one where about a fraction p0 of
+the current population survives (adaptive splitting). The estimates then
+reuse them as fixed levels, so the adaptive choice adds no bias. Confidence
+intervals come from independent replicates, which run in parallel.
+"""
+
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.montecarlo import EXTINCTION, SimParams, simulate
+
+# Level cap for the pilot, in case survival stalls at a fixed probability
+MAX_LEVELS = 100
+
+
+@dataclass
+class SplittingResult:
+    """
+    Multilevel splitting estimate of survival.
+
+    Attributes:
+        levels: Time levels (years), ending at max_time
+        survival: Estimated P(alive at each level), averaged over replicates
+        ci_low, ci_high: Confidence interval per level
+        replicates: Per-replicate estimates, shape (n_replicates, n_levels)
+        n_particles: Trajectories per level and replicate
+        ci_level: Confidence level of the intervals
+    """
+    levels: np.ndarray
+    survival: np.ndarray
+    ci_low: np.ndarray
+    ci_high: np.ndarray
+    replicates: np.ndarray
+    n_particles: int
+    ci_level: float
+
+    @property
+    def probability(self) -> float:
+        """Estimated P(survive to max_time)."""
+        return float(self.survival[-1])
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the final estimate divided by the estimate."""
+        final = self.replicates[:, -1]
+        if final.mean() == 0:
+            return float("inf")
+        return float(final.std(ddof=1) / np.sqrt(len(final)) / final.mean())
+
+    def plain_mc_equivalent(self) -> float:
+        """Plain Monte Carlo trajectories needed for the same relative error."""
+        p = self.probability
+        if p <= 0 or not np.isfinite(self.relative_error) or self.relative_error == 0:
+            return float("inf")
+        return (1 - p) / (p * self.relative_error ** 2)
+
+
+def _alive_at(results: Dict[str, np.ndarray], level: float,
+              params: SimParams) -> np.ndarray:
+    """Alive and at or past the level; stopping at max_cycles counts as survival."""
+    alive = results['final_state'] != EXTINCTION
+    return alive & ((results['time_to_extinction'] >= level)
+                    | (results['num_cycles'] >= params.max_cycles))
+
+
+def _resample(results: Dict[str, np.ndarray], survivors: np.ndarray, n: int,
+              rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    idx = rng.choice(np.flatnonzero(survivors), size=n)
+    return {key: values[idx] for key, values in results.items()}
+
+
+def choose_levels(params: SimParams, n_particles: int = 10_000, p0: float = 0.1,
+                  seed: int = 0) -> np.ndarray:
+    """
+    Pilot run placing levels where about p0 of the population survives.
+
+    Returns:
+        Increasing levels ending at params.max_time
+    """
+    rng = np.random.default_rng(seed)
+    population = None
+    levels = []
+    while len(levels) < MAX_LEVELS:
+        results = simulate(params, n_particles, rng, start=population)
+        if np.mean(_alive_at(results, params.max_time, params)) >= p0:
+            break
+        times = np.where(results['final_state'] == EXTINCTION,
+                         results['time_to_extinction'], params.max_time)
+        level = float(np.quantile(times, 1 - p0))
+        if level >= params.max_time or (levels and level <= levels[-1]):
+            break
+        levels.append(level)
+
+        paused = simulate(params, n_particles, rng, start=population, stop_time=level)
+        survivors = _alive_at(paused, level, params)
+        if not survivors.any():
+            break
+        population = _resample(paused, survivors, n_particles, rng)
+
+    return np.array(levels + [params.max_time])
+
+
+def _run_replicate(args: tuple) -> np.ndarray:
+    """Worker: one splitting run; returns the survival estimate at each level."""
+    params, levels, n_particles, seed = args
+    rng = np.random.default_rng(seed)
+    estimates = np.zeros(len(levels))
+    population = None
+    probability = 1.0
+    for j, level in enumerate(levels):
+        results = simulate(params, n_particles, rng, start=population, stop_time=level)
+        survivors = _alive_at(results, level, params)
+        probability *= survivors.mean()
+        estimates[j] = probability
+        if not survivors.any():
+            break
+        population = _resample(results, survivors, n_particles, rng)
+    return estimates
+
+
+def multilevel_splitting(
+    params: SimParams,
+    n_particles: int = 10_000,
+    n_replicates: int = 20,
+    levels: Optional[np.ndarray] = None,
+    p0: float = 0.1,
+    ci: float = 0.95,
+    seed: int = 0,
+    n_workers: Optional[int] = None,
+    executor: Executor = None
+) -> SplittingResult:
+    """
+    Estimate the survival probability and curve by multilevel splitting.
+
+    Args:
+        params: Simulation parameters
+        n_particles: Trajectories per level and replicate
+        n_replicates: Independent replicates (for the confidence interval)
+        levels: Fixed time levels ending at max_time (default: chosen by
+            a pilot run with choose_levels())
+        p0: Target survival fraction per level for the pilot
+        ci: Confidence level
+        seed: Random seed
+        n_workers: Number of parallel workers
+        executor: Optional shared executor; overrides n_workers
+
+    Returns:
+        SplittingResult
+    """
+    from scipy import stats
+
+    seed_seq = np.random.SeedSequence(seed)
+    pilot_seed, *replicate_seeds = seed_seq.spawn(n_replicates + 1)
+    if levels is None:
+        levels = choose_levels(params, n_particles, p0, seed=pilot_seed)
+    levels = np.asarray(levels, dtype=float)
+
+    jobs = [(params, levels, n_particles, s) for s in replicate_seeds]
+    if executor is not None:
+        replicates = list(executor.map(_run_replicate, jobs))
+    elif n_workers is not None and n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            replicates = list(pool.map(_run_replicate, jobs))
+    else:
+        replicates = [_run_replicate(job) for job in jobs]
+    replicates = np.array(replicates)
+
+    mean = replicates.mean(axis=0)
+    if n_replicates > 1:
+        half = stats.t.ppf((1 + ci) / 2, n_replicates - 1) * \
+            replicates.std(axis=0, ddof=1) / np.sqrt(n_replicates)
+    else:
+        half = np.full(len(levels), np.nan)
+
+    return SplittingResult(levels=levels, survival=mean,
+                           ci_low=np.maximum(mean - half, 0.0),
+                           ci_high=np.minimum(mean + half, 1.0),
+                           replicates=replicates, n_particles=n_particles, ci_level=ci)
+
+
+def print_splitting_summary(result: SplittingResult) -> None:
+    """Print the survival curve and the final estimate."""
+    pct = f"{result.ci_level:.0%}"
+    print(f"{'level (yrs)':>12} {'P(alive)':>12} {pct + ' CI':>27}")
+    for level, p, lo, hi in zip(result.levels, result.survival, result.ci_low,
+                                result.ci_high):
+        print(f"{level:>12.0f} {p:>12.3e}   [{lo:.3e}, {hi:.3e}]")
+    print(f"\nP(survive) = {result.probability:.3e}, "
+          f"relative error {result.relative_error:.1%}")
+    cost = result.n_particles * len(result.levels) * len(result.replicates)
+    print(f"{cost} trajectory segments; plain Monte Carlo needs about "
+          f"{result.plain_mc_equivalent():.2e} trajectories for the same "
+          f"relative error")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Multilevel splitting for rare survival")
+    parser.add_argument("--scenario", type=str, default="baseline",
+                        choices=["pessimistic", "baseline", "optimistic"],
+                        help="Calibrated scenario to start from")
+    parser.add_argument("--p-align", type=float, default=0.0,
+                        help="Alignment probability")
+    parser.add_argument("--max-time", type=float, default=1000.0,
+                        help="Survival horizon (years)")
+    parser.add_argument("--particles", type=int, default=10_000,
+                        help="Trajectories per level")
+    parser.add_argument("--replicates", type=int, default=20,
+                        help="Independent replicates")
+    parser.add_argument("--p0", type=float, default=0.1,
+                        help="Target survival per level")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    args = parser.parse_args()
+
+    from analysis.calibration import get_calibrated_scenarios
+
+    scenario = get_calibrated_scenarios()[args.scenario]
+    params = SimParams.from_scenario(scenario, p_alignment=args.p_align,
+                                     max_time=args.max_time)
+    result = multilevel_splitting(params, args.particles, args.replicates, p0=args.p0,
+                                  seed=args.seed, n_workers=args.workers)
+    print_splitting_summary(result)
@@ -0,0 +1,299 @@
+"""
+Nested Uncertainty Propagation for the Monte Carlo Model
+
+Two-level Monte Carlo: the outer loop draws parameter vectors (p_ai,
+growth, cycle_duration, cycle_std) from a calibration distribution, and
+the inner loop runs a batch of trajectories for each draw with the
+vectorized engine in analysis/montecarlo.py.
+
+Outer draws come from either
+- "cdf": bootstrap CDF fits (calibration.get_calibrated_scenarios(n_samples=N))
+- "abc": the ABC-SMC posterior (calibration.abc_smc().to_scenarios(N))
+
+Draws are split into chunks across a process pool. Each chunk returns only
+per-draw summary statistics and a histogram of extinction times, and the
+parent folds chunks into running totals as they arrive, so memory does not
+depend on n_outer * n_inner. The result gives
+- pooled statistics over all trajectories (parameter and stochastic
+  uncertainty together), with the Go stats keys
+- bands: quantiles across draws of each per-draw statistic (parameter
+  uncertainty alone)
+and timeline_entries() feeds both to compare_scenarios.plot_timeline_ranges().
+"""
+
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.montecarlo import SimParams, compute_statistics, simulate
+
+PARAMETERS = ["p_ai", "growth", "cycle_duration", "cycle_std"]
+DRAW_STATS = ["extinction_rate", "mean_time", "median_time", "p5_time", "p25_time",
+              "p75_time", "p95_time", "mean_cycles"]
+
+# Width of the pooled extinction-time histogram bins (years)
+HISTOGRAM_BIN = 1.0
+
+
+@dataclass
+class NestedResult:
+    """
+    Streamed aggregate of a nested Monte Carlo run.
+
+    Attributes:
+        draws: Outer parameter draws, shape (n_outer, 4), columns PARAMETERS
+        draw_stats: Per-draw statistic arrays, keys DRAW_STATS
+        edges: Extinction-time histogram bin edges
+        counts: Pooled extinction-time histogram (last bin holds overflow)
+        n_inner: Trajectories per draw
+        n_extinct: Pooled number of extinctions
+        time_sum, time_sumsq: Pooled sums of extinction times
+        cycles_sum: Pooled sum of cycle counts
+    """
+    draws: np.ndarray
+    draw_stats: Dict[str, np.ndarray]
+    edges: np.ndarray
+    counts: np.ndarray
+    n_inner: int
+    n_extinct: int = 0
+    time_sum: float = 0.0
+    time_sumsq: float = 0.0
+    cycles_sum: float = 0.0
+
+    @property
+    def n_trajectories(self) -> int:
+        return len(self.draws) * self.n_inner
+
+    def _quantile(self, p: float) -> float:
+        cumulative = np.cumsum(self.counts)
+        if cumulative[-1] == 0:
+            return 0.0
+        idx = np.searchsorted(cumulative, int((cumulative[-1] - 1) * p) + 1)
+        return float(self.edges[idx])
+
+    def stats(self) -> Dict:
+        """Pooled statistics with the Go stats keys (quantiles to HISTOGRAM_BIN)."""
+        n = self.n_trajectories
+        stats = {'n': n, 'extinction_rate': self.n_extinct / n if n else 0.0,
+                 'mean_cycles': self.cycles_sum / n if n else 0.0}
+        if self.n_extinct:
+            mean = self.time_sum / self.n_extinct
+            stats['mean_time'] = mean
+            variance = self.time_sumsq / self.n_extinct - mean ** 2
+            stats['std_time'] = float(np.sqrt(max(variance, 0)))
+        else:
+            stats['mean_time'] = stats['std_time'] = 0.0
+        for key, p in [('median_time', 0.5), ('p5_time', 0.05), ('p25_time', 0.25),
+                       ('p75_time', 0.75), ('p95_time', 0.95)]:
+            stats[key] = self._quantile(p)
+        return stats
+
+    def bands(self,
+              quantiles: List[float] = (0.05, 0.5, 0.95)) -> Dict[str, np.ndarray]:
+        """Quantiles across outer draws of each per-draw statistic."""
+        return {key: np.quantile(values, quantiles)
+                for key, values in self.draw_stats.items()}
+
+    def timeline_entries(self, name: str = "Calibrated") -> List[Dict]:
+        """
+        Entries for compare_scenarios.plot_timeline_ranges(): the pooled
+        distribution, with the 90% band of the per-draw median as median_band.
+        """
+        stats = self.stats()
+        lo, _, hi = self.bands()['median_time']
+        stats['median_band'] = (float(lo), float(hi))
+        params = dict(zip(PARAMETERS, np.median(self.draws, axis=0)))
+        return [{'name': name, 'stats': stats, 'params': params}]
+
+
+def _run_outer_chunk(args: tuple) -> tuple:
+    """Worker: run the inner batches for a chunk of draws and summarise them."""
+    draws, seeds, n_inner, base, edges = args
+    draw_stats = {key: np.empty(len(draws)) for key in DRAW_STATS}
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    n_extinct, time_sum, time_sumsq, cycles_sum = 0, 0.0, 0.0, 0.0
+
+    for i, (theta, seed) in enumerate(zip(draws, seeds)):
+        params = SimParams.from_scenario(dict(zip(PARAMETERS, theta)), **base)
+        results = simulate(params, n_inner, np.random.default_rng(seed))
+        stats = compute_statistics(results)
+        for key in DRAW_STATS:
+            draw_stats[key][i] = stats[key]
+
+        times = results['time_to_extinction'][results['reached_extinction']]
+        bins = (times / (edges[1] - edges[0])).astype(np.int64)
+        counts += np.bincount(np.minimum(bins, len(counts) - 1), minlength=len(counts))
+        n_extinct += len(times)
+        time_sum += float(times.sum())
+        time_sumsq += float(np.square(times).sum())
+        cycles_sum += float(results['num_cycles'].sum())
+
+    return draw_stats, counts, n_extinct, time_sum, time_sumsq, cycles_sum
+
+
+def _fold(result: NestedResult, chunks) -> None:
+    """Add chunk summaries into result as they arrive."""
+    for draw_stats, counts, n_extinct, time_sum, time_sumsq, cycles_sum in chunks:
+        for key in DRAW_STATS:
+            result.draw_stats[key].append(draw_stats[key])
+        result.counts += counts
+        result.n_extinct += n_extinct
+        result.time_sum += time_sum
+        result.time_sumsq += time_sumsq
+        result.cycles_sum += cycles_sum
+
+
+def draw_parameters(n_outer: int, source: str = "cdf", seed: int = 0,
+                    cache_dir: Optional[str] = None, n_workers: Optional[int] = None,
+                    executor: Executor = None) -> np.ndarray:
+    """
+    Draw outer parameter vectors from a calibration distribution.
+
+    Args:
+        n_outer: Number of draws
+        source: "cdf" (bootstrap CDF fits) or "abc" (ABC-SMC posterior)
+        seed: Random seed
+        cache_dir: Directory for cached CDF fits ("cdf" only)
+        n_workers: Workers for the ABC-SMC fit ("abc" only)
+        executor: Optional shared executor for the ABC-SMC fit
+
+    Returns:
+        Array of shape (n_outer, 4), columns PARAMETERS
+    """
+    from analysis.calibration import abc_smc, get_calibrated_scenarios
+
+    if source == "cdf":
+        scenarios = get_calibrated_scenarios(n_outer, seed=seed, cache_dir=cache_dir)
+    elif source == "abc":
+        posterior = abc_smc(n_workers=n_workers, executor=executor, seed=seed,
+                            verbose=False)
+        scenarios = posterior.to_scenarios(n_outer, seed=seed)
+    else:
+        raise ValueError(f"Unknown parameter source: {source} (choose 'cdf' or 'abc')")
+    return np.array([[s[name] for name in PARAMETERS] for s in scenarios.values()])
+
+
+def nested_monte_carlo(
+    draws: np.ndarray,
+    n_inner: int = 10_000,
+    seed: int = 0,
+    base: Dict = None,
+    n_workers: Optional[int] = None,
+    executor: Executor = None
+) -> NestedResult:
+    """
+    Run n_inner trajectories for each parameter draw and aggregate.
+
+    Args:
+        draws: Parameter draws, shape (n_outer, 4), columns PARAMETERS
+        n_inner: Trajectories per draw
+        seed: Random seed (each draw gets its own child seed, so results do
+            not depend on the chunking)
+        base: Further SimParams fields shared by all draws (e.g. p_alignment)
+        n_workers: Number of parallel workers
+        executor: Optional shared executor; overrides n_workers
+
+    Returns:
+        NestedResult
+    """
+    draws = np.asarray(draws, dtype=float)
+    base = base or {}
+    max_time = base.get('max_time', SimParams.max_time)
+    edges = np.arange(0.0, 2 * max_time + HISTOGRAM_BIN, HISTOGRAM_BIN)
+    seeds = np.random.SeedSequence(seed).spawn(len(draws))
+
+    n_chunks = max(1, min(len(draws), 4 * (n_workers or os.cpu_count() or 1)))
+    bounds = np.linspace(0, len(draws), n_chunks + 1).astype(int)
+    jobs = [(draws[a:b], seeds[a:b], n_inner, base, edges)
+            for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    result = NestedResult(draws=draws, draw_stats={key: [] for key in DRAW_STATS},
+                          edges=edges, counts=np.zeros(len(edges) - 1, dtype=np.int64),
+                          n_inner=n_inner)
+    if executor is not None:
+        _fold(result, executor.map(_run_outer_chunk, jobs))
+    elif n_workers is not None and n_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            _fold(result, pool.map(_run_outer_chunk, jobs))
+    else:
+        _fold(result, map(_run_outer_chunk, jobs))
+
+    result.draw_stats = {key: np.concatenate(parts)
+                         for key, parts in result.draw_stats.items()}
+    return result
+
+
+def print_nested_summary(result: NestedResult) -> None:
+    """Print pooled statistics and per-draw bands."""
+    stats = result.stats()
+    print(f"{len(result.draws)} parameter draws x {result.n_inner} trajectories")
+    print(f"Pooled extinction rate: {stats['extinction_rate']:.2%}")
+    print(f"Pooled time to extinction: median {stats['median_time']:.0f} yrs, "
+          f"90% [{stats['p5_time']:.0f}, {stats['p95_time']:.0f}]")
+    print("Across parameter draws (5% / 50% / 95%):")
+    for key, (lo, mid, hi) in result.bands().items():
+        print(f"  {key:<16} {lo:10.3f} {mid:10.3f} {hi:10.3f}")
+
+
+def plot_uncertainty_timeline(result: NestedResult, output_path: str = None,
+                              seed: int = 0) -> None:
+    """Timeline of the three fixed scenarios next to the calibrated band."""
+    from analysis.calibration import get_calibrated_scenarios
+    from analysis.compare_scenarios import plot_timeline_ranges
+
+    rng = np.random.default_rng(seed)
+    entries = [
+        {'name': name.capitalize(),
+         'stats': compute_statistics(simulate(SimParams.from_scenario(s),
+                                              result.n_inner, rng))}
+        for name, s in get_calibrated_scenarios().items()
+    ]
+    plot_timeline_ranges(entries + result.timeline_entries(), output_path)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Nested uncertainty Monte Carlo")
+    parser.add_argument("--source", type=str, default="cdf", choices=["cdf", "abc"],
+                        help="Calibration distribution for the outer draws")
+    parser.add_argument("--outer", type=int, default=200, help="Parameter draws")
+    parser.add_argument("--inner", type=int, default=10_000,
+                        help="Trajectories per draw")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of parallel workers")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Directory for cached CDF fits")
+    parser.add_argument("--json", type=str, default=None,
+                        help="Write pooled stats and bands here")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Timeline figure comparing the fixed scenarios with "
+                             "the band")
+
+    args = parser.parse_args()
+
+    draws = draw_parameters(args.outer, args.source, seed=args.seed,
+                            cache_dir=args.cache_dir,
+                            n_workers=args.workers)
+    result = nested_monte_carlo(draws, args.inner, seed=args.seed,
+                                n_workers=args.workers)
+    print_nested_summary(result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'stats': result.stats(),
+                       'bands': {k: v.tolist() for k, v in result.bands().items()},
+                       'n_outer': len(draws), 'n_inner': args.inner,
+                       'source': args.source}, f, indent=2)
+
+    if args.output:
+        plot_uncertainty_timeline(result, args.output, seed=args.seed)
+        print(f"Timeline saved to {args.output}")
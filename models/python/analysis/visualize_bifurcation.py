@@ -6,38 +6,180 @@ Generates the bifurcation diagram figure from JSON output
 
 This allows the pipeline:
   Go (fast simulation) -> JSON -> Python (visualization) -> PNG
+
+Results are loaded into typed NumPy columns (initial_rate, final_rate,
+replication). Besides the indented JSON the Go tool writes by default,
+newline-delimited JSON (`-format ndjson`) is parsed incrementally in
+fixed-size chunks and .npz files hold the columns in binary, so large
+outputs no longer need several times their size in RAM to load.
 """
 
 import argparse
 import json
+import os
+import sys
+from itertools import islice
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
-from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abm.plotting import draw_bifurcation_runs
+
+# Per-run columns and their dtypes
+RESULT_COLUMNS = {
+    "initial_rate": np.float64,
+    "final_rate": np.float64,
+    "replication": np.int32,
+}
+
+# Lines parsed per chunk when streaming NDJSON
+NDJSON_CHUNK_ROWS = 1 << 13
+
+
+def _columns_from_runs(runs: list, theta_crit: float) -> dict:
+    """Typed columns from a list of per-run dicts."""
+    results = {"theta_crit": theta_crit}
+    for name, dtype in RESULT_COLUMNS.items():
+        results[name] = np.fromiter((r.get(name, 0) for r in runs), dtype=dtype,
+                                    count=len(runs))
+    return results
+
+
+def _result_columns(results: dict) -> tuple:
+    """Initial and final rate of every run as float arrays."""
+    if "initial_rate" in results:
+        return (np.asarray(results["initial_rate"], dtype=float),
+                np.asarray(results["final_rate"], dtype=float))
+    runs = results["results"]
+    initial = np.fromiter((r["initial_rate"] for r in runs), dtype=float,
+                          count=len(runs))
+    final = np.fromiter((r["final_rate"] for r in runs), dtype=float, count=len(runs))
+    return initial, final
+
+
+def _load_ndjson(path: str, chunk_rows: int = NDJSON_CHUNK_ROWS) -> dict:
+    """
+    Stream newline-delimited results into typed columns.
+
+    An optional first line without "initial_rate" is a header carrying
+    theta_crit (and the Go parameters); otherwise theta_crit is read from
+    the runs. Lines are parsed chunk_rows at a time, so only one chunk of
+    Python objects is alive at once.
+    """
+    chunks = []
+    header = {}
+
+    with open(path) as f:
+        first = f.readline()
+        if first.strip():
+            record = json.loads(first)
+            if "initial_rate" in record:
+                chunks.append(_columns_from_runs([record], record.get("theta_crit")))
+            else:
+                header = record
+
+        while True:
+            lines = [line for line in islice(f, chunk_rows) if line.strip()]
+            if not lines:
+                break
+            runs = json.loads("[" + ",".join(lines) + "]")
+            chunks.append(_columns_from_runs(runs, runs[0].get("theta_crit")))
+
+    results = {name: np.concatenate([c[name] for c in chunks]) if chunks
+               else np.empty(0, dtype=dtype) for name, dtype in RESULT_COLUMNS.items()}
+    results["theta_crit"] = header.get("theta_crit",
+                                       chunks[0]["theta_crit"] if chunks else None)
+    if "params" in header:
+        results["params"] = header["params"]
+    return results
 
 
 def load_results(json_path: str) -> dict:
-    """Load bifurcation results from JSON file."""
+    """
+    Load bifurcation results into typed columns.
+
+    Reads .ndjson/.jsonl (streamed), .npz (binary columns) or the Go
+    indented .json format.
+
+    Returns:
+        Dict with theta_crit and one NumPy array per RESULT_COLUMNS entry
+    """
+    suffix = Path(json_path).suffix
+    if suffix in (".ndjson", ".jsonl"):
+        return _load_ndjson(json_path)
+
+    if suffix == ".npz":
+        with np.load(json_path) as data:
+            results = {name: data[name].astype(dtype, copy=False)
+                       for name, dtype in RESULT_COLUMNS.items()}
+            results["theta_crit"] = float(data["theta_crit"])
+        return results
+
     with open(json_path) as f:
-        return json.load(f)
+        raw = json.load(f)
+    return _columns_from_runs(raw["results"], raw["theta_crit"])
+
 
+def save_results(results: dict, path: str) -> None:
+    """
+    Save bifurcation results (columns or a 'results' list of runs).
+
+    The format follows the extension: .npz (binary columns),
+    .ndjson/.jsonl (header line plus one run per line) or .json.
+    """
+    initial, final = _result_columns(results)
+    replication = (results["replication"] if "replication" in results
+                   else [r.get("replication", 0) for r in results.get("results", [])])
+    replication = np.asarray(replication, dtype=np.int32)
+    theta_crit = float(results["theta_crit"])
+    suffix = Path(path).suffix
+
+    if suffix == ".npz":
+        np.savez(path, initial_rate=initial, final_rate=final,
+                 replication=replication, theta_crit=theta_crit)
+        return
+
+    runs = ({"initial_rate": float(a), "final_rate": float(b),
+             "theta_crit": theta_crit, "replication": int(r)}
+            for a, b, r in zip(initial, final, replication))
+    with open(path, "w") as f:
+        if suffix in (".ndjson", ".jsonl"):
+            header = {"theta_crit": theta_crit, "n_results": len(initial)}
+            f.write(json.dumps(header) + "\n")
+            for run in runs:
+                f.write(json.dumps(run) + "\n")
+        else:
+            json.dump({"results": list(runs), "theta_crit": theta_crit}, f)
 
-def plot_bifurcation(results: dict, output_path: str = None):
+
+def plot_bifurcation(results: dict, output_path: str = None, mode: str = "auto",
+                     ribbons: bool = None):
     """
     Generate bifurcation diagram from results.
 
     Args:
-        results: Dictionary with 'results' list and 'theta_crit'
+        results: Columns from load_results, or a dictionary with a
+            'results' list and 'theta_crit'
         output_path: Path to save figure (if None, displays)
+        mode: "scatter", "density", "hexbin" or "auto" (density for
+            large result sets; see abm.plotting.draw_bifurcation_runs)
+        ribbons: Draw median and quantile ribbons (default: on unless scatter)
     """
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Extract data
-    initial_rates = [r["initial_rate"] for r in results["results"]]
-    final_rates = [r["final_rate"] for r in results["results"]]
+    initial_rates, final_rates = _result_columns(results)
     theta_crit = results["theta_crit"]
 
-    # Plot scatter of all runs
-    ax.scatter(initial_rates, final_rates, alpha=0.5, s=20)
+    # Plot all runs (binned into a density image for large result sets)
+    artist = draw_bifurcation_runs(ax, initial_rates, final_rates, mode, ribbons)
+    if artist is not None:
+        fig.colorbar(artist, ax=ax,
+                     label="Fraction of runs" if mode != "hexbin" else "Runs")
 
     # Reference line (no change)
     ax.plot([0, 1], [0, 1], 'k--', alpha=0.3, label="No change")
@@ -66,59 +208,218 @@ def plot_bifurcation(results: dict, output_path: str = None):
     plt.close()
 
 
-def compute_statistics(results: dict) -> dict:
-    """Compute summary statistics from bifurcation results."""
-    theta_crit = results["theta_crit"]
+# Final cooperation rates below / above these count as defection / cooperation
+DEFECTION_CUTOFF = 0.2
+COOPERATION_CUTOFF = 0.8
 
-    # Group by initial rate
-    by_rate = {}
-    for r in results["results"]:
-        rate = r["initial_rate"]
-        if rate not in by_rate:
-            by_rate[rate] = []
-        by_rate[rate].append(r["final_rate"])
+# Bootstrap draws held in memory at once (resamples x runs, or resamples x
+# distinct values when value counts are resampled)
+BOOTSTRAP_BATCH_ELEMENTS = 1 << 24
 
-    # Compute stats
-    stats = {
-        "theta_crit": theta_crit,
-        "n_rates": len(by_rate),
-        "n_reps": len(results["results"]) // len(by_rate) if by_rate else 0,
-        "rates": {}
-    }
+# Final rates are k / n_agents, so they take few distinct values; up to this
+# many, the bootstrap resamples value counts instead of individual runs
+BOOTSTRAP_MAX_DISTINCT = 4096
 
-    for rate, finals in sorted(by_rate.items()):
-        mean_final = np.mean(finals)
-        std_final = np.std(finals)
 
-        # Classify outcome
-        if mean_final > 0.8:
-            outcome = "cooperation"
-        elif mean_final < 0.2:
-            outcome = "defection"
-        else:
-            outcome = "mixed"
+def _classify(means: np.ndarray) -> np.ndarray:
+    """Outcome label for each mean final rate."""
+    return np.where(means > COOPERATION_CUTOFF, "cooperation",
+                    np.where(means < DEFECTION_CUTOFF, "defection", "mixed"))
 
-        stats["rates"][rate] = {
-            "mean": mean_final,
-            "std": std_final,
-            "outcome": outcome
-        }
 
-    # Find empirical threshold (where outcome switches)
-    sorted_rates = sorted(stats["rates"].keys())
+def _empirical_thresholds(rates: np.ndarray, means: np.ndarray) -> np.ndarray:
+    """
+    Midpoint between the last defecting rate and the next rate, per row of means.
+
+    The threshold is where the mean outcome first switches from defection
+    to mixed or cooperation; rows without such a switch give NaN.
+    """
+    defect = means < DEFECTION_CUTOFF
+    switch = defect[..., :-1] & ~defect[..., 1:]
+    first = switch.argmax(axis=-1)
+    midpoints = (rates[:-1] + rates[1:]) / 2
+    return np.where(switch.any(axis=-1), midpoints[first], np.nan)
+
+
+def _bootstrap(final_sorted: np.ndarray, counts: np.ndarray, n_bootstrap: int,
+               rng: np.random.Generator) -> tuple:
+    """
+    Stratified bootstrap of per-rate means and basin fractions.
+
+    Runs are resampled with replacement within each initial rate. When the
+    final rates take at most BOOTSTRAP_MAX_DISTINCT distinct values (always
+    the case for k / n_agents), a resample of a rate is a multinomial draw
+    of value counts, which is exact and independent of the number of runs;
+    each rate's counts are drawn in batches of (resamples x values).
+    Otherwise resamples are drawn in batches of (resamples x runs) indices
+    and reduced per rate with np.add.reduceat. Either way memory stays
+    bounded by BOOTSTRAP_BATCH_ELEMENTS.
+
+    Returns:
+        (means, p_cooperation, p_defection), each (n_bootstrap, n_rates)
+    """
+    n_runs = len(final_sorted)
+    starts = np.cumsum(counts) - counts
+    values, value_index = np.unique(final_sorted, return_inverse=True)
+
+    if len(values) <= BOOTSTRAP_MAX_DISTINCT:
+        group = np.repeat(np.arange(len(counts)), counts)
+        hist = np.bincount(group * len(values) + value_index,
+                           minlength=len(counts) * len(values)).reshape(len(counts), -1)
+        coop, defect = values > COOPERATION_CUTOFF, values < DEFECTION_CUTOFF
+        batch = max(1, min(n_bootstrap, BOOTSTRAP_BATCH_ELEMENTS // len(values)))
+        shape = (n_bootstrap, len(counts))
+        means, p_coop, p_defect = np.empty(shape), np.empty(shape), np.empty(shape)
+        for r, (n, h) in enumerate(zip(counts, hist)):
+            for done in range(0, n_bootstrap, batch):
+                rows = slice(done, min(done + batch, n_bootstrap))
+                draws = rng.multinomial(n, h / n, size=rows.stop - rows.start)
+                means[rows, r] = draws @ values / n
+                p_coop[rows, r] = draws[:, coop].sum(axis=-1) / n
+                p_defect[rows, r] = draws[:, defect].sum(axis=-1) / n
+        return means, p_coop, p_defect
+
+    run_group_start = np.repeat(starts, counts)
+    run_group_count = np.repeat(counts, counts)
+    batch = max(1, min(n_bootstrap, BOOTSTRAP_BATCH_ELEMENTS // max(n_runs, 1)))
+
+    means, p_coop, p_defect = [], [], []
+    for done in range(0, n_bootstrap, batch):
+        b = min(batch, n_bootstrap - done)
+        offsets = (rng.random((b, n_runs)) * run_group_count).astype(np.int64)
+        draws = final_sorted[run_group_start + offsets]
+        means.append(np.add.reduceat(draws, starts, axis=1) / counts)
+        p_coop.append(np.add.reduceat(draws > COOPERATION_CUTOFF, starts, axis=1)
+                      / counts)
+        p_defect.append(np.add.reduceat(draws < DEFECTION_CUTOFF, starts, axis=1)
+                        / counts)
+
+    return np.vstack(means), np.vstack(p_coop), np.vstack(p_defect)
+
+
+def compute_statistics(results: dict, n_bootstrap: int = 1000, ci: float = 0.95,
+                       seed: int = 0) -> dict:
+    """
+    Compute summary statistics from bifurcation results.
+
+    Per initial rate: mean and std of the final rate with a bootstrap CI on
+    the mean, the outcome of the mean (cooperation above 0.8, defection
+    below 0.2, otherwise mixed), and basin-of-attraction probabilities (the
+    fraction of runs ending in each basin) with bootstrap CIs. The empirical
+    threshold also gets a bootstrap CI and the fraction of resamples in
+    which a defection -> cooperation switch was found at all.
+
+    Args:
+        results: Columns from load_results, or a dictionary with a
+            'results' list and 'theta_crit'
+        n_bootstrap: Number of bootstrap resamples (0 to skip CIs)
+        ci: Confidence level of the intervals
+        seed: Seed for the bootstrap resampling
+
+    Returns:
+        Dictionary with theta_crit, n_rates, n_reps, per-rate stats in
+        'rates', empirical_threshold and its CI
+    """
+    initial, final = _result_columns(results)
+
+    rates, group, counts = np.unique(initial, return_inverse=True, return_counts=True)
+    order = np.argsort(group, kind="stable")
+    final_sorted = final[order]
+    starts = np.cumsum(counts) - counts
+
+    if len(rates):
+        means = np.add.reduceat(final_sorted, starts) / counts
+        sq_dev = (final_sorted - np.repeat(means, counts)) ** 2
+        stds = np.sqrt(np.add.reduceat(sq_dev, starts) / counts)
+    else:
+        means = stds = np.array([])
+    p_coop = np.bincount(group, weights=final > COOPERATION_CUTOFF,
+                         minlength=len(rates)) / counts
+    p_defect = np.bincount(group, weights=final < DEFECTION_CUTOFF,
+                           minlength=len(rates)) / counts
+    outcomes = _classify(means)
+
     empirical_threshold = None
-    for i in range(len(sorted_rates) - 1):
-        r1, r2 = sorted_rates[i], sorted_rates[i+1]
-        o1, o2 = stats["rates"][r1]["outcome"], stats["rates"][r2]["outcome"]
-        if o1 == "defection" and o2 in ["mixed", "cooperation"]:
-            empirical_threshold = (r1 + r2) / 2
-            break
+    if len(rates) > 1:
+        threshold = _empirical_thresholds(rates, means)
+        empirical_threshold = None if np.isnan(threshold) else float(threshold)
+
+    stats = {
+        "theta_crit": results["theta_crit"],
+        "n_rates": len(rates),
+        "n_reps": len(final) // len(rates) if len(rates) else 0,
+        "rates": {},
+        "empirical_threshold": empirical_threshold,
+        "empirical_threshold_ci": None,
+        "threshold_found_fraction": None,
+        "ci_level": ci,
+    }
 
-    stats["empirical_threshold"] = empirical_threshold
+    tails = [(1 - ci) / 2 * 100, (1 + ci) / 2 * 100]
+    boot = None
+    if n_bootstrap > 0 and len(rates):
+        rng = np.random.default_rng(seed)
+        boot = _bootstrap(final_sorted, counts, n_bootstrap, rng)
+        mean_ci, coop_ci, defect_ci = (np.percentile(b, tails, axis=0) for b in boot)
+
+        if len(rates) > 1:
+            boot_thresholds = _empirical_thresholds(rates, boot[0])
+            found = ~np.isnan(boot_thresholds)
+            stats["threshold_found_fraction"] = float(found.mean())
+            if found.any():
+                lo, hi = np.percentile(boot_thresholds[found], tails)
+                stats["empirical_threshold_ci"] = (float(lo), float(hi))
+
+    for i, rate in enumerate(rates):
+        entry = {
+            "mean": float(means[i]),
+            "std": float(stds[i]),
+            "outcome": str(outcomes[i]),
+            "n": int(counts[i]),
+            "basin": {
+                "cooperation": float(p_coop[i]),
+                "defection": float(p_defect[i]),
+                "mixed": float(1 - p_coop[i] - p_defect[i]),
+            },
+        }
+        if boot is not None:
+            entry["mean_ci"] = (float(mean_ci[0, i]), float(mean_ci[1, i]))
+            entry["basin_ci"] = {
+                "cooperation": (float(coop_ci[0, i]), float(coop_ci[1, i])),
+                "defection": (float(defect_ci[0, i]), float(defect_ci[1, i])),
+            }
+        stats["rates"][float(rate)] = entry
 
     return stats
 
 
+def format_statistics(stats: dict) -> str:
+    """Human-readable summary of compute_statistics output."""
+    level = f"{stats['ci_level']:.0%}"
+    lines = ["Bifurcation Analysis Statistics:",
+             f"  Theoretical θ_crit: {stats['theta_crit']:.3f}"]
+    if stats["empirical_threshold"] is not None:
+        line = f"  Empirical threshold: {stats['empirical_threshold']:.3f}"
+        if stats["empirical_threshold_ci"]:
+            lo, hi = stats["empirical_threshold_ci"]
+            line += (f" ({level} CI {lo:.3f}-{hi:.3f}, found in "
+                     f"{stats['threshold_found_fraction']:.0%} of resamples)")
+        lines.append(line)
+    lines.append(f"  Rates tested: {stats['n_rates']}")
+    lines.append(f"  Replications: {stats['n_reps']}")
+    lines.append("")
+    lines.append(f"  {'rate':>6} {'mean':>7} {level + ' CI':>17} {'P(coop)':>8} "
+                 f"{'P(defect)':>9}  outcome")
+    for rate, r in stats["rates"].items():
+        ci_text = (f"{r['mean_ci'][0]:.3f}-{r['mean_ci'][1]:.3f}"
+                   if "mean_ci" in r else "-")
+        basin = r["basin"]
+        lines.append(f"  {rate:6.3f} {r['mean']:7.3f} {ci_text:>17} "
+                     f"{basin['cooperation']:8.2f} {basin['defection']:9.2f}  "
+                     f"{r['outcome']}")
+    return "\n".join(lines)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Visualize bifurcation analysis results from JSON"
@@ -127,13 +428,25 @@ def main():
         "--json", "-j",
         type=str,
         required=True,
-        help="Path to JSON results file"
+        help="Path to results file (.json, .ndjson/.jsonl or .npz)"
     )
     parser.add_argument(
         "--output", "-o",
         type=str,
         help="Output directory for figure"
     )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="auto",
+        choices=["auto", "scatter", "density", "hexbin"],
+        help="How to draw runs (auto: density image above 5000 runs)"
+    )
+    parser.add_argument(
+        "--no-ribbons",
+        action="store_true",
+        help="Omit median and quantile ribbons"
+    )
     parser.add_argument(
         "--stats",
         action="store_true",
@@ -148,12 +461,8 @@ def main():
     # Print stats if requested
     if args.stats:
         stats = compute_statistics(results)
-        print(f"\nBifurcation Analysis Statistics:")
-        print(f"  Theoretical θ_crit: {stats['theta_crit']:.3f}")
-        if stats['empirical_threshold']:
-            print(f"  Empirical threshold: {stats['empirical_threshold']:.3f}")
-        print(f"  Rates tested: {stats['n_rates']}")
-        print(f"  Replications: {stats['n_reps']}")
+        print()
+        print(format_statistics(stats))
         print()
 
     # Generate figure
@@ -162,7 +471,8 @@ def main():
     else:
         output_path = None
 
-    plot_bifurcation(results, output_path)
+    plot_bifurcation(results, output_path, mode=args.mode,
+                     ribbons=False if args.no_ribbons else None)
 
     print(f"Critical threshold θ_crit = {results['theta_crit']:.3f}")
 
@@ -0,0 +1 @@
+# Performance benchmarks for Coordination Trilemma models
@@ -0,0 +1,122 @@
+"""
+Import-Time Budget
+
+Measures how long a fresh interpreter takes to import each simulation module
+and checks it against a budget. Pool workers and the simulation CLIs pay this
+on every start, which is a visible share of short sweeps on many cores.
+
+Two checks per module:
+- seconds: median import time over a few fresh interpreters
+- forbidden modules: plotting and config libraries that simulation imports
+  must not pull in (this check does not depend on machine speed)
+
+    python -m benchmarks.import_time --check
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget in seconds per module. The Mesa models are dominated by importing
+# mesa itself (~0.7s on a typical laptop); the NumPy-only models should stay
+# well below that.
+IMPORT_BUDGETS = {
+    "abm.corruption_dynamics": 1.5,
+    "abm.cooperation_threshold": 1.5,
+    "abm.polycentric_governance": 1.5,
+    "abm.motivation_foundations": 0.5,
+    "abm.ostrom_scale": 0.5,
+    "analysis.parameter_sweep": 1.0,
+}
+
+# Modules that only plotting or config loading should import
+FORBIDDEN_MODULES = ["matplotlib", "seaborn", "yaml", "scipy.stats"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+"""
+
+
+def measure_import(module: str, repeats: int = 3) -> dict:
+    """
+    Import a module in fresh interpreters and time it.
+
+    Returns:
+        Dict with median seconds over the repeats and any forbidden
+        modules the import loaded
+    """
+    seconds = []
+    loaded = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c",
+             _PROBE.format(module=module, forbidden=FORBIDDEN_MODULES)],
+            cwd=PYTHON_DIR, capture_output=True, text=True, check=True,
+        )
+        probe = json.loads(out.stdout.strip().splitlines()[-1])
+        seconds.append(probe["seconds"])
+        loaded = probe["loaded"]
+    return {"seconds": float(np.median(seconds)), "forbidden_loaded": loaded}
+
+
+def run_import_benchmarks(budgets: dict = None, repeats: int = 3,
+                          verbose: bool = True) -> list[dict]:
+    """
+    Measure every module in the budget table.
+
+    Returns:
+        Result rows (kind "import") with seconds, budget and pass/fail
+    """
+    budgets = budgets or IMPORT_BUDGETS
+    results = []
+    for module, budget in budgets.items():
+        measured = measure_import(module, repeats)
+        within = measured["seconds"] <= budget and not measured["forbidden_loaded"]
+        row = {
+            "benchmark": module,
+            "kind": "import",
+            "status": "ok" if within else "over_budget",
+            "seconds": measured["seconds"],
+            "budget_seconds": budget,
+            "forbidden_loaded": measured["forbidden_loaded"],
+        }
+        results.append(row)
+        if verbose:
+            loaded = row["forbidden_loaded"]
+            extra = f" loads {', '.join(loaded)}" if loaded else ""
+            print(f"{module:>28} {'import':>15} {row['seconds']:8.3f}s "
+                  f"(budget {budget:.1f}s) {row['status']}{extra}")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="Fresh interpreters per module")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write results JSON here")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit with status 1 if any module is over budget")
+
+    args = parser.parse_args()
+
+    results = run_import_benchmarks(repeats=args.repeats)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+
+    if args.check and any(r["status"] != "ok" for r in results):
+        sys.exit(1)
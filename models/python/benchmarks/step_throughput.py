@@ -0,0 +1,407 @@
+"""
+Step Throughput Benchmarks
+
+Times a single model step and a full run_experiment for each ABM at a range of
+population sizes, plus parameter_sweep end-to-end on a fixed small grid.
+
+For every case the suite records steps/sec, agent-steps/sec and peak traced
+memory, and writes everything (with the git commit and library versions) to a
+JSON file so results can be compared across commits. The report also
+includes the import-time budget check from benchmarks/import_time.py:
+
+    python -m benchmarks.step_throughput --output new.json --compare old.json
+
+The Mesa agent models keep running counts instead of scanning the population
+inside each agent step, so a step is O(N) and agent-steps/sec should stay
+roughly flat across sizes. Step time is extrapolated from the measured sizes,
+and sizes whose predicted step time exceeds the time budget are recorded as
+skipped (with the predicted time) rather than run.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abm import cooperation_threshold, corruption_dynamics, polycentric_governance
+from benchmarks.import_time import run_import_benchmarks
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+
+# Fixed grid for the end-to-end parameter_sweep benchmark. Keep it unchanged so
+# results stay comparable across commits.
+SWEEP_GRIDS = {
+    "corruption": {
+        "param_ranges": {
+            "integrity_mean": [3.0, 6.0],
+            "base_detection_prob": [0.2, 0.5],
+        },
+        "fixed_params": {"n_enforcers": 50},
+        "n_agents": 50,
+    },
+    "motivation": {
+        "param_ranges": {
+            "soteriological_fraction": [0.0, 0.2],
+            "n_agents": [100, 1000],
+        },
+        "fixed_params": {"enable_scale_effects": True},
+        "n_agents": 550,
+    },
+}
+SWEEP_REPLICATIONS = 4
+SWEEP_STEPS = 50
+
+
+@dataclass
+class BenchmarkCase:
+    """How to build a model and run a full experiment at population size n."""
+    name: str
+    build: Callable[[int, int], object]
+    run: Callable[[int, int, int], dict]
+
+
+BENCHMARKS = {
+    "corruption": BenchmarkCase(
+        "corruption",
+        lambda n, seed: corruption_dynamics.CorruptionModel(n_enforcers=n, seed=seed),
+        lambda n, steps, seed: corruption_dynamics.run_experiment(
+            n_enforcers=n, n_steps=steps, seed=seed
+        ),
+    ),
+    "cooperation": BenchmarkCase(
+        "cooperation",
+        lambda n, seed: cooperation_threshold.CooperationModel(n_agents=n, seed=seed),
+        lambda n, steps, seed: cooperation_threshold.run_experiment(
+            n_agents=n, n_steps=steps, seed=seed
+        ),
+    ),
+    "polycentric": BenchmarkCase(
+        "polycentric",
+        lambda n, seed: polycentric_governance.PolycentricModel(
+            n_participants=n, seed=seed
+        ),
+        lambda n, steps, seed: polycentric_governance.run_experiment(
+            n_participants=n, n_steps=steps, seed=seed
+        ),
+    ),
+    "polycentric_array": BenchmarkCase(
+        "polycentric_array",
+        lambda n, seed: polycentric_governance.PolycentricArrayModel(
+            n_participants=n, seed=seed
+        ),
+        lambda n, steps, seed: polycentric_governance.run_experiment(
+            n_participants=n, n_steps=steps, seed=seed, engine="array"
+        ),
+    ),
+}
+
+
+def _record(benchmark: str, kind: str, n_agents: int, **fields) -> dict:
+    """Result row with derived throughput figures."""
+    row = {
+        "benchmark": benchmark,
+        "kind": kind,
+        "n_agents": n_agents,
+        "status": "ok",
+        "steps": None,
+        "seconds": None,
+        "steps_per_sec": None,
+        "agent_steps_per_sec": None,
+        "peak_memory_mb": None,
+    }
+    row.update(fields)
+    if row["status"] == "ok" and row["seconds"]:
+        row["steps_per_sec"] = row["steps"] / row["seconds"]
+        row["agent_steps_per_sec"] = row["steps"] * n_agents / row["seconds"]
+    return row
+
+
+def _predict_step_seconds(history: list[tuple[int, float]], n: int) -> Optional[float]:
+    """
+    Extrapolate step time to size n from previously measured sizes.
+
+    Uses the empirical scaling exponent of the last two sizes, at least 1
+    (linear, the cost of an O(N) step, when only one size has been measured).
+    """
+    if not history:
+        return None
+    n_last, t_last = history[-1]
+    exponent = 1.0
+    if len(history) >= 2:
+        n_prev, t_prev = history[-2]
+        if t_prev > 0 and n_last != n_prev:
+            exponent = max(1.0, np.log(t_last / t_prev) / np.log(n_last / n_prev))
+    return t_last * (n / n_last) ** exponent
+
+
+def bench_step(case: BenchmarkCase, n: int, n_steps: int, time_budget: float,
+               seed: int = 0) -> dict:
+    """
+    Time model.step() at population size n.
+
+    Peak memory covers model construction and one warm-up step (traced
+    separately so tracemalloc overhead does not distort the timings).
+    Timing stops early once the time budget is used up.
+    """
+    tracemalloc.start()
+    model = case.build(n, seed)
+    model.step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    steps = 0
+    start = time.perf_counter()
+    while steps < n_steps:
+        model.step()
+        steps += 1
+        if time.perf_counter() - start > time_budget:
+            break
+    elapsed = time.perf_counter() - start
+
+    return _record(case.name, "step", n, steps=steps, seconds=elapsed,
+                   peak_memory_mb=peak / 1e6)
+
+
+def bench_run_experiment(case: BenchmarkCase, n: int, n_steps: int,
+                         trace_memory: bool = True, seed: int = 0) -> dict:
+    """Time a full run_experiment (including data collection) at size n."""
+    start = time.perf_counter()
+    case.run(n, n_steps, seed)
+    elapsed = time.perf_counter() - start
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        case.run(n, n_steps, seed)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 1e6
+
+    return _record(case.name, "run_experiment", n, steps=n_steps, seconds=elapsed,
+                   peak_memory_mb=peak_mb)
+
+
+def bench_parameter_sweep(model: str = "corruption", n_workers: int = 1) -> dict:
+    """Time parameter_sweep end-to-end on the fixed grid in SWEEP_GRIDS."""
+    from analysis.parameter_sweep import parameter_sweep
+
+    grid = SWEEP_GRIDS[model]
+    n_combos = int(np.prod([len(v) for v in grid["param_ranges"].values()]))
+    n_runs = n_combos * SWEEP_REPLICATIONS
+
+    start = time.perf_counter()
+    parameter_sweep(
+        grid["param_ranges"],
+        fixed_params=grid["fixed_params"],
+        n_replications=SWEEP_REPLICATIONS,
+        n_steps=SWEEP_STEPS,
+        n_workers=n_workers,
+        model=model,
+    )
+    elapsed = time.perf_counter() - start
+
+    row = _record(f"parameter_sweep_{model}", "parameter_sweep", grid["n_agents"],
+                  steps=n_runs * SWEEP_STEPS, seconds=elapsed)
+    row["runs"] = n_runs
+    row["runs_per_sec"] = n_runs / elapsed
+    row["n_workers"] = n_workers
+    return row
+
+
+def run_benchmarks(
+    benchmarks: list[str] = None,
+    sizes: list[int] = None,
+    n_steps: int = 20,
+    run_steps: int = 50,
+    time_budget: float = 30.0,
+    sweep_workers: int = 1,
+    include_sweep: bool = True,
+    verbose: bool = True
+) -> list[dict]:
+    """
+    Run the benchmark suite.
+
+    Args:
+        benchmarks: Names from BENCHMARKS (default: all)
+        sizes: Population sizes, measured in increasing order
+        n_steps: Timed steps for the step benchmark
+        run_steps: n_steps passed to run_experiment
+        time_budget: Seconds allowed per case; larger sizes predicted to
+            exceed it are skipped
+        sweep_workers: Workers for the parameter_sweep benchmark
+        include_sweep: Also benchmark parameter_sweep
+        verbose: Print each result as it completes
+
+    Returns:
+        List of result rows
+    """
+    benchmarks = benchmarks or list(BENCHMARKS)
+    sizes = sorted(sizes or DEFAULT_SIZES)
+    results = []
+
+    def emit(row):
+        results.append(row)
+        if verbose:
+            label = f"{row['benchmark']:>28} {row['kind']:>15} N={row['n_agents']:<7}"
+            if row["status"] == "ok":
+                mem = row["peak_memory_mb"]
+                mem_text = f"{mem:9.1f} MB" if mem is not None else "        -   "
+                print(f"{label} {row['steps_per_sec']:10.2f} steps/s "
+                      f"{row['agent_steps_per_sec']:12.0f} agent-steps/s {mem_text}")
+            else:
+                predicted = row["predicted_step_seconds"]
+                print(f"{label} skipped (predicted {predicted:.1f}s/step)")
+
+    for name in benchmarks:
+        case = BENCHMARKS[name]
+        history = []
+        for n in sizes:
+            predicted = _predict_step_seconds(history, n)
+            if predicted is not None and predicted > time_budget:
+                for kind in ("step", "run_experiment"):
+                    emit(_record(name, kind, n, status="skipped",
+                                 predicted_step_seconds=predicted))
+                continue
+
+            row = bench_step(case, n, n_steps, time_budget)
+            emit(row)
+            step_seconds = row["seconds"] / row["steps"]
+            history.append((n, step_seconds))
+
+            if step_seconds * run_steps > time_budget:
+                emit(_record(name, "run_experiment", n, status="skipped",
+                             predicted_step_seconds=step_seconds))
+                continue
+            emit(bench_run_experiment(
+                case, n, run_steps,
+                trace_memory=2 * step_seconds * run_steps <= time_budget,
+            ))
+
+    if include_sweep:
+        for model in SWEEP_GRIDS:
+            emit(bench_parameter_sweep(model, sweep_workers))
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the source tree, if available."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_metadata() -> dict:
+    """Machine and library details stored alongside the results."""
+    import mesa
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "mesa": mesa.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> list[dict]:
+    """
+    Compare two result files by steps/sec.
+
+    Returns:
+        Rows with baseline and current throughput and their ratio
+        (ratio > 1 means the current commit is faster)
+    """
+    def key(row):
+        return (row["benchmark"], row["kind"], row["n_agents"])
+
+    old = {key(r): r for r in baseline["results"] if r["status"] == "ok"}
+    rows = []
+    for r in current["results"]:
+        if r["status"] != "ok" or key(r) not in old:
+            continue
+        before = old[key(r)]["steps_per_sec"]
+        rows.append({
+            "benchmark": r["benchmark"],
+            "kind": r["kind"],
+            "n_agents": r["n_agents"],
+            "baseline_steps_per_sec": before,
+            "steps_per_sec": r["steps_per_sec"],
+            "speedup": r["steps_per_sec"] / before,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Step throughput benchmarks")
+    parser.add_argument("--benchmarks", type=str, nargs="+", default=None,
+                        choices=list(BENCHMARKS),
+                        help="Models to benchmark (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Population sizes")
+    parser.add_argument("--steps", type=int, default=20, help="Timed steps per size")
+    parser.add_argument("--run-steps", type=int, default=50,
+                        help="n_steps for the run_experiment benchmark")
+    parser.add_argument("--time-budget", type=float, default=30.0,
+                        help="Seconds allowed per case before larger sizes are skipped")
+    parser.add_argument("--sweep-workers", type=int, default=1,
+                        help="Workers for the parameter_sweep benchmark")
+    parser.add_argument("--no-sweep", action="store_true",
+                        help="Skip the parameter_sweep benchmark")
+    parser.add_argument("--no-imports", action="store_true",
+                        help="Skip the import-time budget check")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write results JSON here")
+    parser.add_argument("--compare", type=str, default=None,
+                        help="Baseline results JSON to compare against")
+
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        benchmarks=args.benchmarks,
+        sizes=args.sizes,
+        n_steps=args.steps,
+        run_steps=args.run_steps,
+        time_budget=args.time_budget,
+        sweep_workers=args.sweep_workers,
+        include_sweep=not args.no_sweep,
+    )
+    report = {"metadata": environment_metadata(), "results": results}
+    if not args.no_imports:
+        report["imports"] = run_import_benchmarks()
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nComparison against {baseline['metadata'].get('git_commit')}:")
+        for row in compare_results(baseline, report):
+            print(f"  {row['benchmark']:>28} {row['kind']:>15} N={row['n_agents']:<7} "
+                  f"{row['speedup']:6.2f}x")
@@ -0,0 +1,558 @@
+"""
+Coordination Trilemma Command-Line Interface
+
+One entry point for the models and figures:
+
+    coordination-trilemma run corruption --steps 200 --output figures/
+    coordination-trilemma sweep --model motivation \
+        --param soteriological_fraction=0,0.1,0.2
+    coordination-trilemma sweep --engine meanfield \
+        --param integrity_mean=2,4,6,8 base_detection_prob=0.1,0.3,0.5
+    coordination-trilemma ensemble corruption --reps 100 --output figures/
+    coordination-trilemma run corruption --schedule configs/purge_schedule.yaml
+    coordination-trilemma bifurcate --agents 500 --reps 5 --json bifurcation.json
+    coordination-trilemma compare governance --reps 10
+    coordination-trilemma compare scenarios --data-dir data/ --output figures/
+    coordination-trilemma montecarlo --csv results.csv --json stats.json
+    coordination-trilemma uncertainty --source cdf --outer 200 --inner 10000
+    coordination-trilemma figures --only trilemma state_machine
+    coordination-trilemma batch configs/nightly_figures.yaml --workers 8
+
+`batch` runs the subcommands listed in a manifest in one interpreter and
+shares one process pool between them, so interpreter, import and pool
+startup are paid once per batch rather than once per figure. Without the
+installed script, use `python -m cli` (from models/python) or
+`python -m python.cli` (from models/).
+
+Model and plotting modules are imported by the subcommand that needs them.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shlex
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+# Make abm/ and analysis/ importable however the CLI is launched
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Models runnable with `run`: module, plotting function and figure filename
+RUN_MODELS = {
+    "corruption": ("abm.corruption_dynamics", "plot_corruption_dynamics",
+                   "corruption_dynamics.png"),
+    "cooperation": ("abm.cooperation_threshold", "plot_cooperation_dynamics",
+                    "cooperation_threshold.png"),
+    "polycentric": ("abm.polycentric_governance", "plot_polycentric_dynamics",
+                    "polycentric_dynamics.png"),
+    "motivation": ("abm.motivation_foundations", None, None),
+}
+
+# Models whose run_experiment takes profile=True (the motivation model has no
+# per-step agent phases to profile)
+PROFILE_MODELS = ["corruption", "cooperation", "polycentric"]
+
+# Modules imported once per pool worker so jobs do not pay for them
+WORKER_MODULES = [
+    "abm.corruption_dynamics",
+    "abm.cooperation_threshold",
+    "abm.polycentric_governance",
+    "abm.motivation_foundations",
+]
+
+
+def _parse_value(text: str):
+    """Parse a command-line value as JSON (numbers, booleans, lists), else string."""
+    lowered = text.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _parse_assignments(items: list) -> dict:
+    """Parse ["key=value", ...] into a dict of parsed values."""
+    params = {}
+    for item in items or []:
+        if "=" not in item:
+            raise argparse.ArgumentTypeError(f"Expected key=value, got: {item}")
+        key, value = item.split("=", 1)
+        params[key] = _parse_value(value)
+    return params
+
+
+def _load_schedule(path: str) -> list:
+    """
+    Intervention schedule from a YAML file: a list of entries or a mapping
+    with "schedule".
+    """
+    import yaml  # only needed for schedule files
+
+    with open(path) as f:
+        schedule = yaml.safe_load(f)
+    if isinstance(schedule, dict):
+        schedule = schedule["schedule"]
+    return schedule
+
+
+def _output_path(args, filename: str):
+    """Figure path in args.output, or None to show the figure interactively."""
+    if not args.output:
+        return None
+    os.makedirs(args.output, exist_ok=True)
+    return os.path.join(args.output, filename)
+
+
+def _print_summary(results: dict) -> None:
+    """Print the scalar final_* outputs of a run_experiment result."""
+    for key, value in results.items():
+        if not key.startswith("final_"):
+            continue
+        if hasattr(value, "__len__"):
+            print(f"{key}: mean {sum(value) / max(len(value), 1):.4f} "
+                  f"over {len(value)} replications")
+        else:
+            print(f"{key}: {value:.4f}")
+
+
+def cmd_run(args, executor: Executor = None) -> None:
+    """Run a single experiment and plot it."""
+    module_name, plot_name, figure = RUN_MODELS[args.model]
+    module = importlib.import_module(module_name)
+
+    params = _parse_assignments(args.set)
+    if args.steps is not None:
+        params["n_steps"] = args.steps
+    if args.seed is not None:
+        params["seed"] = args.seed
+    if args.profile:
+        params["profile"] = True
+    if args.schedule:
+        params["schedule"] = _load_schedule(args.schedule)
+
+    results = module.run_experiment(config_path=args.config, **params)
+    _print_summary(results)
+
+    if args.model == "motivation":
+        print(json.dumps(module.compute_statistics(results), indent=2))
+
+    if args.profile:
+        from abm.profiling import format_profile, write_profile
+
+        print(format_profile(results["profile"]))
+        write_profile(results["profile"], args.profile)
+
+    if plot_name and not args.no_plot:
+        from abm import plotting
+
+        getattr(plotting, plot_name)(results, _output_path(args, figure))
+
+
+def cmd_sweep(args, executor: Executor = None) -> None:
+    """Run a parameter sweep, save the results CSV and sensitivity figures."""
+    from analysis import parameter_sweep as ps
+
+    param_ranges = {}
+    for item in args.param:
+        key, values = item.split("=", 1)
+        param_ranges[key] = [_parse_value(v) for v in values.split(",")]
+    fixed_params = _parse_assignments(args.fixed)
+
+    results = ps.parameter_sweep(
+        param_ranges,
+        fixed_params=fixed_params,
+        n_replications=args.reps,
+        n_steps=args.steps,
+        n_workers=args.workers,
+        model=args.model,
+        cache_dir=args.cache_dir,
+        executor=executor,
+        engine=args.engine,
+    )
+
+    metric = ps.SWEEP_METRICS[args.model]
+    for param in param_ranges:
+        sens = ps.analyze_sensitivity(results, param, metric)
+        print(f"{param}: range {sens['range']:.3f}, "
+              f"correlation {sens['correlation']:.3f}")
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        results.to_csv(os.path.join(args.output, f"{args.model}_sweep_results.csv"),
+                       index=False)
+
+    if not args.no_plot:
+        for param in param_ranges:
+            path = _output_path(args, f"{args.model}_sensitivity_{param}.png")
+            ps.plot_sensitivity(results, param, path, metric=metric)
+        if len(param_ranges) == 2:
+            param1, param2 = param_ranges
+            path = _output_path(args, f"{args.model}_heatmap_{param1}_{param2}.png")
+            ps.plot_heatmap(results, param1, param2, path, metric=metric)
+
+
+def cmd_ensemble(args, executor: Executor = None) -> None:
+    """Run a replicate ensemble and plot mean trajectories with bands."""
+    from abm.ensemble import run_ensemble
+
+    config = _parse_assignments(args.set)
+    if args.steps is not None:
+        config["n_steps"] = args.steps
+    if args.schedule:
+        config["schedule"] = _load_schedule(args.schedule)
+
+    result = run_ensemble(args.model, n_replicates=args.reps, seed=args.seed,
+                          n_workers=args.workers, executor=executor, **config)
+    for key, summary in result.final_summary().items():
+        print(f"{key}: {summary['mean']:.4f} ± {summary['std']:.4f} "
+              f"over {result.n_replicates} replicates")
+
+    if not args.no_plot:
+        from abm.plotting import plot_ensemble
+
+        plot_ensemble(result, _output_path(args, f"{args.model}_ensemble.png"),
+                      band=args.band)
+
+
+def cmd_bifurcate(args, executor: Executor = None) -> None:
+    """Run (or load) a cooperation bifurcation analysis and plot it."""
+    if args.input:
+        from analysis.visualize_bifurcation import load_results
+
+        bifurc = load_results(args.input)
+    else:
+        from abm.cooperation_threshold import run_bifurcation_analysis
+
+        kwargs = {}
+        if args.rates:
+            kwargs["initial_rates"] = args.rates
+        bifurc = run_bifurcation_analysis(
+            n_agents=args.agents,
+            n_steps=args.steps,
+            n_replications=args.reps,
+            n_workers=args.workers,
+            executor=executor,
+            **kwargs,
+        )
+
+    if args.json:
+        from analysis.visualize_bifurcation import save_results
+
+        save_results(bifurc, args.json)
+
+    if args.stats:
+        from analysis.visualize_bifurcation import compute_statistics, format_statistics
+
+        print(format_statistics(compute_statistics(bifurc)))
+
+    print(f"Critical threshold θ_crit = {bifurc['theta_crit']:.3f}")
+
+    if not args.no_plot:
+        from analysis.visualize_bifurcation import plot_bifurcation
+
+        plot_bifurcation(bifurc, _output_path(args, "bifurcation_analysis.png"))
+
+
+def cmd_compare(args, executor: Executor = None) -> None:
+    """Compare governance systems or Monte Carlo scenarios."""
+    if args.what == "governance":
+        from abm.polycentric_governance import compare_governance_systems
+
+        comparison = compare_governance_systems(
+            n_replications=args.reps,
+            n_steps=args.steps,
+            n_workers=args.workers,
+            engine=args.engine,
+            executor=executor,
+            n_participants=args.participants,
+        )
+        for system, summary in comparison.items():
+            if system != "paired_differences":
+                print(f"{system}: mean {summary['mean']:.2%} "
+                      f"(std {summary['std']:.2%})")
+        for pair, diff in comparison["paired_differences"].items():
+            print(f"{pair}: {diff['mean']:+.2%} "
+                  f"[{diff['ci_low']:+.2%}, {diff['ci_high']:+.2%}]")
+
+        if not args.no_plot:
+            from abm.plotting import plot_governance_comparison
+
+            plot_governance_comparison(comparison,
+                                       _output_path(args, "governance_comparison.png"))
+        return
+
+    from analysis.compare_scenarios import (
+        load_scenario,
+        plot_scenario_comparison,
+        plot_timeline_ranges,
+    )
+
+    data_dir = args.data_dir
+    scenarios = [
+        load_scenario(os.path.join(data_dir, csv), os.path.join(data_dir, js), name)
+        for csv, js, name in [
+            ("montecarlo_pessimistic.csv", "montecarlo_pessimistic.json",
+             "Pessimistic"),
+            ("montecarlo_results.csv", "montecarlo_stats.json", "Baseline"),
+            ("montecarlo_optimistic.csv", "montecarlo_optimistic.json", "Optimistic"),
+        ]
+    ]
+    plot_scenario_comparison(scenarios, _output_path(args, "scenario_comparison.png"))
+    plot_timeline_ranges(scenarios, _output_path(args, "timeline_ranges.png"))
+
+
+def cmd_montecarlo(args, executor: Executor = None) -> None:
+    """Plot Monte Carlo cycle simulation results."""
+    from analysis import visualize_montecarlo as vm
+
+    df, stats = vm.load_results(args.csv, args.json)
+    print(f"Loaded {len(df)} simulations")
+
+    vm.plot_time_distribution(df, stats, _output_path(args, "montecarlo_time_dist.png"))
+    vm.plot_cycles_distribution(df, stats,
+                                _output_path(args, "montecarlo_cycles_dist.png"))
+    vm.plot_summary_dashboard(df, stats, _output_path(args, "montecarlo_dashboard.png"))
+
+
+def cmd_uncertainty(args, executor: Executor = None) -> None:
+    """Propagate calibration uncertainty through the Monte Carlo model."""
+    from analysis import uncertainty as unc
+
+    draws = unc.draw_parameters(args.outer, args.source, seed=args.seed,
+                                cache_dir=args.cache_dir, n_workers=args.workers,
+                                executor=executor)
+    result = unc.nested_monte_carlo(draws, args.inner, seed=args.seed,
+                                    n_workers=args.workers, executor=executor)
+    unc.print_nested_summary(result)
+
+    if not args.no_plot:
+        unc.plot_uncertainty_timeline(result,
+                                      _output_path(args, "timeline_uncertainty.png"),
+                                      seed=args.seed)
+
+
+def cmd_figures(args, executor: Executor = None) -> None:
+    """Render the conceptual diagrams (unchanged ones are skipped)."""
+    from analysis import generate_diagrams as gd
+
+    status = gd.render_diagrams(args.only, args.output, n_workers=args.workers,
+                                executor=executor, force=args.force)
+    for name, state in status.items():
+        print(f"  {name}: {state}")
+
+
+def cmd_batch(args, executor: Executor = None) -> None:
+    """Run the subcommands listed in a manifest on one shared process pool."""
+    jobs = load_manifest(args.manifest)
+    parser = build_parser()
+
+    with ProcessPoolExecutor(max_workers=args.workers,
+                             initializer=_warm_worker) as pool:
+        for i, job in enumerate(jobs, 1):
+            argv = shlex.split(job) if isinstance(job, str) else [str(a) for a in job]
+            job_args = parse_args(parser, argv)
+            if job_args.command == "batch":
+                raise ValueError("Manifests cannot contain nested batch jobs")
+
+            print(f"[{i}/{len(jobs)}] {' '.join(argv)}")
+            start = time.perf_counter()
+            job_args.func(job_args, pool)
+            print(f"[{i}/{len(jobs)}] done in {time.perf_counter() - start:.1f}s")
+
+
+def load_manifest(path: str) -> list:
+    """
+    Load a batch manifest.
+
+    The manifest is YAML or JSON: either a list of jobs or a dict with a
+    "jobs" list. Each job is a command line string ("run corruption --steps
+    200") or a list of arguments.
+    """
+    with open(path) as f:
+        if path.endswith(".json"):
+            manifest = json.load(f)
+        else:
+            import yaml
+
+            manifest = yaml.safe_load(f)
+
+    if isinstance(manifest, dict):
+        manifest = manifest.get("jobs", [])
+    return list(manifest)
+
+
+def _warm_worker() -> None:
+    """Pool initializer: import the model modules once per worker."""
+    for name in WORKER_MODULES:
+        importlib.import_module(name)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser with one subparser per subcommand."""
+    parser = argparse.ArgumentParser(
+        prog="coordination-trilemma",
+        description="Coordination Trilemma models and figures",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def plotting_args(p):
+        p.add_argument("--output", type=str, default=None,
+                       help="Output directory for figures (default: show)")
+        p.add_argument("--no-plot", action="store_true", help="Skip figures")
+
+    p = sub.add_parser("run", help="Run a single experiment")
+    p.add_argument("model", choices=list(RUN_MODELS))
+    p.add_argument("--config", type=str, default=None, help="Path to YAML config file")
+    p.add_argument("--steps", type=int, default=None, help="Number of steps")
+    p.add_argument("--seed", type=int, default=42, help="Random seed")
+    p.add_argument("--set", type=str, nargs="*", default=[], metavar="KEY=VALUE",
+                   help="Model parameters, e.g. --set n_enforcers=500 integrity_mean=4")
+    p.add_argument("--schedule", type=str, default=None,
+                   help="YAML file of mid-run interventions (see abm/interventions.py)")
+    p.add_argument("--profile", type=str, default=None,
+                   help="Write a per-phase step profile (.json or collapsed stacks; "
+                        f"{', '.join(PROFILE_MODELS)})")
+    plotting_args(p)
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("sweep", help="Parameter sensitivity sweep")
+    p.add_argument("--model", type=str, default="corruption",
+                   choices=["corruption", "cooperation", "motivation"])
+    p.add_argument("--engine", type=str, default=None,
+                   choices=["agent", "meanfield", "histogram", "array"],
+                   help="Simulation engine (default: agent, or array for motivation; "
+                        "meanfield: deterministic ODE surrogate; "
+                        "histogram: binned corruption engine for huge populations; "
+                        "array: vectorized cooperation or motivation engine)")
+    p.add_argument("--param", type=str, nargs="+", required=True,
+                   metavar="NAME=V1,V2,...",
+                   help="Swept parameter and its values")
+    p.add_argument("--fixed", type=str, nargs="*", default=[], metavar="KEY=VALUE",
+                   help="Parameters held constant")
+    p.add_argument("--reps", type=int, default=10, help="Replications per combination")
+    p.add_argument("--steps", type=int, default=200, help="Steps per run")
+    p.add_argument("--workers", type=int, default=4, help="Number of workers")
+    p.add_argument("--cache-dir", type=str, default=None,
+                   help="Directory for cached results")
+    plotting_args(p)
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("ensemble",
+                       help="Replicate ensemble with mean trajectories and bands")
+    p.add_argument("model",
+                   choices=["corruption", "cooperation", "polycentric", "motivation"])
+    p.add_argument("--reps", type=int, default=50, help="Number of replicates")
+    p.add_argument("--steps", type=int, default=None, help="Number of steps")
+    p.add_argument("--seed", type=int, default=0, help="Base random seed")
+    p.add_argument("--workers", type=int, default=None, help="Number of workers")
+    p.add_argument("--set", type=str, nargs="*", default=[], metavar="KEY=VALUE",
+                   help="Model parameters, e.g. --set n_enforcers=500 engine=histogram")
+    p.add_argument("--schedule", type=str, default=None,
+                   help="YAML file of mid-run interventions applied to every replicate")
+    p.add_argument("--band", type=str, default="quantile", choices=["quantile", "std"],
+                   help="Band drawn around the mean")
+    plotting_args(p)
+    p.set_defaults(func=cmd_ensemble)
+
+    p = sub.add_parser("bifurcate", help="Cooperation threshold bifurcation analysis")
+    p.add_argument("--agents", type=int, default=500, help="Number of agents")
+    p.add_argument("--steps", type=int, default=100, help="Steps per run")
+    p.add_argument("--reps", type=int, default=5, help="Replications per initial rate")
+    p.add_argument("--rates", type=float, nargs="*", default=None,
+                   help="Initial cooperation rates")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Number of workers (default: CPU count)")
+    p.add_argument("--input", type=str, default=None,
+                   help="Plot existing results (.json, .ndjson or .npz, e.g. from the "
+                        "Go model) instead of simulating")
+    p.add_argument("--json", type=str, default=None,
+                   help="Write results here (.json, .ndjson or .npz)")
+    p.add_argument("--stats", action="store_true", help="Print summary statistics")
+    plotting_args(p)
+    p.set_defaults(func=cmd_bifurcate)
+
+    p = sub.add_parser("compare",
+                       help="Compare governance systems or Monte Carlo scenarios")
+    p.add_argument("what", choices=["governance", "scenarios"])
+    p.add_argument("--reps", type=int, default=10,
+                   help="Replications per governance system")
+    p.add_argument("--steps", type=int, default=200, help="Steps per run")
+    p.add_argument("--participants", type=int, default=100, help="Participants per run")
+    p.add_argument("--engine", type=str, default="agent", choices=["agent", "array"])
+    p.add_argument("--workers", type=int, default=None,
+                   help="Number of workers (default: CPU count)")
+    p.add_argument("--data-dir", type=str, default=".",
+                   help="Directory with scenario results")
+    plotting_args(p)
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("montecarlo", help="Plot Monte Carlo cycle simulation results")
+    p.add_argument("--csv", type=str, required=True, help="Path to results CSV")
+    p.add_argument("--json", type=str, default=None, help="Path to stats JSON")
+    p.add_argument("--output", type=str, default=None,
+                   help="Output directory for figures")
+    p.set_defaults(func=cmd_montecarlo)
+
+    p = sub.add_parser("uncertainty",
+                       help="Nested Monte Carlo over calibration uncertainty")
+    p.add_argument("--source", type=str, default="cdf", choices=["cdf", "abc"],
+                   help="Calibration distribution for the parameter draws")
+    p.add_argument("--outer", type=int, default=200, help="Parameter draws")
+    p.add_argument("--inner", type=int, default=10_000, help="Trajectories per draw")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Number of workers (default: CPU count)")
+    p.add_argument("--seed", type=int, default=42, help="Random seed")
+    p.add_argument("--cache-dir", type=str, default=None,
+                   help="Directory for cached CDF fits")
+    plotting_args(p)
+    p.set_defaults(func=cmd_uncertainty)
+
+    p = sub.add_parser("figures", help="Render conceptual diagrams")
+    p.add_argument("--only", type=str, nargs="*", default=None,
+                   help="Diagram names (default: all)")
+    p.add_argument("--output", type=str, default=None,
+                   help="Output directory for figures")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Parallel workers (default: CPU count)")
+    p.add_argument("--force", action="store_true", help="Re-render even if cached")
+    p.set_defaults(func=cmd_figures)
+
+    p = sub.add_parser("batch",
+                       help="Run the subcommands in a manifest on a shared pool")
+    p.add_argument("manifest", type=str, help="YAML or JSON manifest of subcommands")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Pool size (default: CPU count)")
+    p.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def parse_args(parser: argparse.ArgumentParser, argv: list = None):
+    """Parse a command line, rejecting options the chosen model does not support."""
+    args = parser.parse_args(argv)
+    if (args.command == "run" and args.profile
+            and args.model not in PROFILE_MODELS):
+        parser.error(f"--profile is not supported for {args.model} "
+                     f"(choose from {', '.join(PROFILE_MODELS)})")
+    if args.command == "sweep" and args.engine is not None:
+        from analysis.parameter_sweep import SWEEP_ENGINES
+
+        if args.engine not in SWEEP_ENGINES[args.model]:
+            parser.error(f"--engine {args.engine} is not supported for {args.model} "
+                         f"(choose from {', '.join(SWEEP_ENGINES[args.model])})")
+    return args
+
+
+def main(argv: list = None) -> None:
+    """Console entry point."""
+    args = parse_args(build_parser(), argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()